@@ -0,0 +1,3 @@
+"""
+Pacote de benchmarks de desempenho do otimizador de dieta
+"""
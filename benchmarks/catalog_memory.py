@@ -0,0 +1,112 @@
+"""
+Benchmark de memória do catálogo de alimentos
+
+Para executar:
+    python -m benchmarks.catalog_memory --foods 100000 --output memoria.json
+
+Cada cenário roda em um interpretador novo e informa o pico de memória
+residente (RSS). A base sintética é gerada em colunas nos três cenários; o
+cenário 'baseline' só a gera, e os demais montam a FoodTable e a lista de
+get_food_data com um dicionário somente leitura por alimento ('dicts', o
+formato anterior) ou com registros compactos ('compact', FoodRecord). O
+relatório traz o pico de cada cenário acima da linha de base e a redução
+obtida; o processo termina com código 1 se a redução ficar abaixo de
+--min-ratio.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.run_benchmarks import git_revision
+
+_SETUP = (
+    "from benchmarks.synthetic_data import generate_columns\n"
+    "from data.food_table import FoodTable\n"
+    "colunas = generate_columns({n})\n"
+)
+
+# Cenário -> código executado após gerar as colunas. Os dois catálogos têm a
+# tabela colunar com o índice de nomes e a lista devolvida por get_food_data
+SCENARIOS = {
+    'baseline': "",
+    'dicts': (
+        "from types import MappingProxyType\n"
+        "tabela = FoodTable.from_columns(colunas)\n"
+        "numericas = [tabela[coluna].tolist() for coluna in FoodTable.NUMERIC_COLUMNS]\n"
+        "valores = [tabela[coluna] for coluna in FoodTable.TEXT_COLUMNS] + numericas\n"
+        "registros = tuple(MappingProxyType(dict(zip(FoodTable.COLUMNS, linha))) for linha in zip(*valores))\n"
+        "del numericas, valores\n"
+        "alimentos = list(registros)\n"
+        "total = sum(alimento['preco'] for alimento in alimentos)\n"
+    ),
+    'compact': (
+        "tabela = FoodTable.from_columns(colunas)\n"
+        "alimentos = list(tabela.records())\n"
+        "total = sum(alimento['preco'] for alimento in alimentos)\n"
+    ),
+}
+
+# Executado no processo filho ao fim do cenário: pico de RSS em MB
+_REPORT = (
+    "\nimport json, resource, sys\n"
+    "pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+    "print(json.dumps(pico / (1 << 20) if sys.platform == 'darwin' else pico / 1024))"
+)
+
+
+def peak_rss(codigo):
+    """Executa o código em um interpretador novo e devolve o pico de RSS em MB"""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    saida = subprocess.run([sys.executable, '-c', codigo + _REPORT], cwd=raiz,
+                           capture_output=True, text=True, check=True)
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def run(n, min_ratio):
+    """Mede os cenários para uma base de n alimentos
+
+    Args:
+        n (int): Número de alimentos
+        min_ratio (float): Redução mínima exigida (dicts / compact)
+
+    Returns:
+        dict: Relatório com picos em MB e 'ok' False se a redução for menor que min_ratio
+    """
+    picos = {nome: peak_rss(_SETUP.format(n=n) + codigo) for nome, codigo in SCENARIOS.items()}
+    acima = {nome: max(pico - picos['baseline'], 0.0) for nome, pico in picos.items() if nome != 'baseline'}
+    reducao = acima['dicts'] / max(acima['compact'], 1e-9)
+    return {
+        'commit': git_revision(),
+        'python': sys.version.split()[0],
+        'alimentos': n,
+        'pico_rss_mb': {nome: round(pico, 1) for nome, pico in picos.items()},
+        'acima_da_base_mb': {nome: round(valor, 1) for nome, valor in acima.items()},
+        'reducao': round(reducao, 1),
+        'reducao_minima': min_ratio,
+        'ok': reducao >= min_ratio,
+    }
+
+
+def main(argv=None):
+    """Executa o benchmark de memória pela linha de comando"""
+    parser = argparse.ArgumentParser(description="Benchmark de memória do catálogo de alimentos")
+    parser.add_argument('--foods', type=int, default=100000, help="Alimentos na base sintética")
+    parser.add_argument('--min-ratio', type=float, default=5.0, help="Redução mínima de memória exigida")
+    parser.add_argument('--output', help="Arquivo JSON de saída (padrão: saída padrão)")
+    args = parser.parse_args(argv)
+
+    relatorio = run(args.foods, args.min_ratio)
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(texto)
+    else:
+        print(texto)
+    return 0 if relatorio['ok'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Benchmark da busca incremental da janela de exclusão de alimentos
+
+Para executar:
+    python -m benchmarks.food_search --foods 50000 --budget 16
+
+Simula a digitação de cada consulta letra a letra sobre uma base sintética
+e mede, por tecla, a busca no índice mais a montagem dos textos das linhas
+visíveis (o que a lista virtualizada entrega ao Listbox). O relatório JSON
+traz o tempo de construção do índice e p50/p99/máximo por tecla; o processo
+termina com código 1 se o máximo passar do orçamento.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from benchmarks.run_benchmarks import git_revision, summarize
+from benchmarks.synthetic_data import generate_columns
+from data.food_search import FoodSearchIndex
+
+# Consultas digitadas: prefixos, trechos do meio, números, categorias e sem resultado
+QUERIES = (
+    'Alimento sintético 4999',
+    'sintetico 123',
+    'ntético 77',
+    '49999',
+    'Laticínios',
+    'graos',
+    'vegetal',
+    'xyz',
+)
+
+# Linhas visíveis na janela de seleção
+VISIBLE_ROWS = 25
+
+
+def run(n, budget_ms):
+    """Mede a construção do índice e o tempo por tecla
+
+    Args:
+        n (int): Número de alimentos
+        budget_ms (float): Tempo máximo por tecla (ms)
+
+    Returns:
+        dict: Relatório com 'ok' False se alguma tecla passar do orçamento
+    """
+    colunas = generate_columns(n)
+    nomes, categorias = colunas['nome'], colunas['categoria']
+    inicio = time.perf_counter()
+    indice = FoodSearchIndex(nomes, categorias)
+    construcao = time.perf_counter() - inicio
+
+    tempos = []
+    for consulta in QUERIES:
+        for tamanho in range(len(consulta) + 1):
+            inicio = time.perf_counter()
+            linhas, _ = indice.search(consulta[:tamanho])
+            [f"{nomes[linha]}  ({categorias[linha]})" for linha in linhas[:VISIBLE_ROWS]]
+            tempos.append(time.perf_counter() - inicio)
+
+    resumo = summarize(tempos)
+    maximo = max(tempos) * 1000
+    return {
+        'commit': git_revision(),
+        'python': sys.version.split()[0],
+        'alimentos': n,
+        'construcao_ms': round(construcao * 1000, 1),
+        'tecla': {**resumo, 'max_ms': round(maximo, 3)},
+        'orcamento_ms': budget_ms,
+        'ok': maximo <= budget_ms,
+    }
+
+
+def main(argv=None):
+    """Executa o benchmark de busca pela linha de comando"""
+    parser = argparse.ArgumentParser(description="Benchmark da busca incremental de alimentos")
+    parser.add_argument('--foods', type=int, default=50000, help="Alimentos na base sintética")
+    parser.add_argument('--budget', type=float, default=16.0, help="Tempo máximo por tecla (ms)")
+    parser.add_argument('--output', help="Arquivo JSON de saída (padrão: saída padrão)")
+    args = parser.parse_args(argv)
+
+    relatorio = run(args.foods, args.budget)
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(texto)
+    else:
+        print(texto)
+    return 0 if relatorio['ok'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
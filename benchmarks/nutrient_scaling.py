@@ -0,0 +1,104 @@
+"""
+Benchmark do custo dos nutrientes opcionais na montagem e na extração
+
+Para executar:
+    python -m benchmarks.nutrient_scaling --foods 10000 --max-ratio 5
+
+Mede, para a mesma base sintética com só os quatro nutrientes obrigatórios
+e com todos os de NUTRIENTS, a compilação do DietModel (com a matriz de
+nutrientes da tabela) e a extração do resultado (totais e alimentos
+escolhidos) de soluções fixas. As restrições apontam para a matriz de
+nutrientes e os totais saem de um único produto matriz-vetor, então a razão
+entre os dois cenários fica bem abaixo da razão entre os números de
+nutrientes; o processo termina com código 1 se passar de --max-ratio.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.run_benchmarks import git_revision, summarize
+from benchmarks.synthetic_data import generate_columns
+from data.food_table import FoodTable
+from optimization.diet_model import DietModel
+
+# Soluções extraídas por cenário e alimentos com quantidade em cada uma
+SOLUTIONS = 50
+CHOSEN_FOODS = 15
+
+
+def measure(tabela, repeticoes):
+    """Tempos de compilação do modelo e de extração de soluções fixas"""
+    tempos = {'build': [], 'extract': []}
+    for _ in range(repeticoes):
+        copia = FoodTable.from_columns(dict(tabela._columns))
+        inicio = time.perf_counter()
+        copia.nutrient_matrix()
+        modelo = DietModel(copia, backend='highs')
+        tempos['build'].append(time.perf_counter() - inicio)
+
+    rng = np.random.default_rng(0)
+    for _ in range(SOLUTIONS):
+        x = np.zeros(len(tabela))
+        x[rng.choice(len(tabela), CHOSEN_FOODS, replace=False)] = rng.uniform(0.5, 3, CHOSEN_FOODS)
+        inicio = time.perf_counter()
+        modelo._prepare_result('Optimal', x)
+        tempos['extract'].append(time.perf_counter() - inicio)
+    return {fase: summarize(amostras) for fase, amostras in tempos.items()}
+
+
+def run(n, max_ratio, repeticoes=5):
+    """Compara os cenários com e sem nutrientes opcionais
+
+    Args:
+        n (int): Número de alimentos
+        max_ratio (float): Razão máxima aceita (com / sem nutrientes opcionais) da mediana de cada fase
+        repeticoes (int): Compilações medidas por cenário
+
+    Returns:
+        dict: Relatório com 'ok' False se alguma razão passar de max_ratio
+    """
+    cenarios = {
+        'obrigatorios': FoodTable.from_columns(generate_columns(n)),
+        'todos': FoodTable.from_columns(generate_columns(n, micronutrients=True)),
+    }
+    medidas = {nome: measure(tabela, repeticoes) for nome, tabela in cenarios.items()}
+    razoes = {
+        fase: medidas['todos'][fase]['p50_ms'] / max(medidas['obrigatorios'][fase]['p50_ms'], 1e-9)
+        for fase in ('build', 'extract')
+    }
+    return {
+        'commit': git_revision(),
+        'python': sys.version.split()[0],
+        'alimentos': n,
+        'nutrientes': {nome: len(tabela.nutrients) for nome, tabela in cenarios.items()},
+        'fases': medidas,
+        'razao': {fase: round(razao, 2) for fase, razao in razoes.items()},
+        'razao_maxima': max_ratio,
+        'ok': all(razao <= max_ratio for razao in razoes.values()),
+    }
+
+
+def main(argv=None):
+    """Executa o benchmark de nutrientes pela linha de comando"""
+    parser = argparse.ArgumentParser(description="Custo dos nutrientes opcionais na montagem e na extração")
+    parser.add_argument('--foods', type=int, default=10000, help="Alimentos na base sintética")
+    parser.add_argument('--max-ratio', type=float, default=5.0, help="Razão máxima aceita entre os cenários")
+    parser.add_argument('--output', help="Arquivo JSON de saída (padrão: saída padrão)")
+    args = parser.parse_args(argv)
+
+    relatorio = run(args.foods, args.max_ratio)
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(texto)
+    else:
+        print(texto)
+    return 0 if relatorio['ok'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Benchmark de montagem, solução e extração do otimizador de dieta
+
+Para executar:
+    python -m benchmarks.run_benchmarks --sizes 25 1000 10000 100000 --output bench.json
+
+Para cada tamanho de base sintética, mede separadamente cada fase do caminho
+PuLP (variáveis, objetivo, restrições, solução, extração) e de cada backend em
+processo (compilação do modelo, solução, extração). O relatório JSON traz
+p50/p95/p99 em milissegundos e o pico de memória alocada por backend.
+"""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pulp
+
+from benchmarks.synthetic_data import generate_foods, generate_profiles
+from data.food_table import FoodTable
+from optimization.diet_model import DietModel
+from optimization.diet_optimizer import DietOptimizer
+from optimization.lp_backends import BACKENDS, get_backend, highs_available
+
+
+def summarize(amostras):
+    """Resume tempos (em segundos) como percentis em milissegundos
+
+    Args:
+        amostras (list): Tempos medidos
+
+    Returns:
+        dict: n, média, p50, p95 e p99 em ms
+    """
+    ms = np.array(amostras) * 1000.0
+    return {
+        'n': len(amostras),
+        'mean_ms': float(ms.mean()),
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p95_ms': float(np.percentile(ms, 95)),
+        'p99_ms': float(np.percentile(ms, 99)),
+    }
+
+
+def timed(tempos, fase, func, *args, **kwargs):
+    """Executa func registrando seu tempo na lista da fase"""
+    inicio = time.perf_counter()
+    retorno = func(*args, **kwargs)
+    tempos.setdefault(fase, []).append(time.perf_counter() - inicio)
+    return retorno
+
+
+def run_pulp(foods, profiles, tempos):
+    """Mede cada fase do caminho PuLP do DietOptimizer"""
+    optimizer = DietOptimizer(backend='pulp', cache=False)
+    table = FoodTable(foods)
+    linhas = np.arange(len(table))
+    for profile in profiles:
+        metas = {meta: profile.get(meta) for meta in ('metac', 'metap', 'metag', 'metacarb', 'orcamento')}
+        colunas = optimizer._target_columns(metas)
+        problem = pulp.LpProblem("Otimizacao_Dieta", pulp.LpMinimize)
+        variaveis = timed(tempos, 'create_variables', optimizer._create_decision_variables, table, linhas)
+        matriz = timed(tempos, 'coefficient_matrix', optimizer._coefficient_matrix, table, linhas, colunas)
+        expressoes = timed(tempos, 'expressions', optimizer._build_expressions, variaveis, colunas, matriz)
+        timed(tempos, 'objective', optimizer._set_objective_function, problem, expressoes)
+        timed(tempos, 'nutritional_constraints', optimizer._add_nutritional_constraints, problem, expressoes, metas)
+        timed(tempos, 'budget_constraint', optimizer._add_budget_constraint, problem, expressoes,
+              profile['orcamento'])
+        timed(tempos, 'solve', optimizer._solve_problem, problem)
+        timed(tempos, 'extract', optimizer._prepare_result, problem, variaveis, table, linhas)
+
+
+def run_matrix(foods, profiles, backend_name, tempos):
+    """Mede compilação, solução e extração de um backend em processo"""
+    table = timed(tempos, 'build_table', FoodTable, foods)
+    model = timed(tempos, 'compile_model', DietModel, table, backend=get_backend(backend_name))
+    for profile in profiles:
+        model.update_targets(**profile)
+        linhas, rhs = model._active_rows()
+        solucao = timed(tempos, 'solve', model.backend.solve, model.c, model.constraint_rows(linhas), rhs, model.lb, model.ub)
+        timed(tempos, 'extract', model._prepare_result, solucao['status'], solucao['x'])
+
+
+def peak_memory(func, *args):
+    """Executa func e retorna o pico de memória alocada (bytes) medido pelo tracemalloc"""
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def git_revision():
+    """Retorna o commit atual, se disponível, para comparar execuções"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, n_profiles, backends, pulp_max_size, seed):
+    """Executa o benchmark completo
+
+    Returns:
+        dict: Relatório com metadados e resultados por tamanho e backend
+    """
+    relatorio = {
+        'meta': {
+            'commit': git_revision(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pulp': pulp.__version__ if hasattr(pulp, '__version__') else None,
+            'profiles': n_profiles,
+            'seed': seed,
+        },
+        'results': [],
+    }
+    profiles = generate_profiles(n_profiles, seed)
+    for size in sizes:
+        foods = generate_foods(size, seed)
+        for backend in backends:
+            if backend == 'pulp' and size > pulp_max_size:
+                continue
+            tempos = {}
+            if backend == 'pulp':
+                run_pulp(foods, profiles, tempos)
+                pico = peak_memory(run_pulp, foods, profiles[:1], {})
+            else:
+                run_matrix(foods, profiles, backend, tempos)
+                pico = peak_memory(run_matrix, foods, profiles[:1], backend, {})
+            relatorio['results'].append({
+                'size': size,
+                'backend': backend,
+                'phases': {fase: summarize(amostras) for fase, amostras in tempos.items()},
+                'peak_memory_bytes': pico,
+            })
+            print(f"{backend:>6} | {size:>7} alimentos | concluído", file=sys.stderr)
+    relatorio['meta']['max_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return relatorio
+
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando"""
+    disponiveis = ['pulp'] + (list(BACKENDS) if highs_available() else [])
+    parser = argparse.ArgumentParser(description="Benchmark do otimizador de dieta")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[25, 1000, 10000, 100000],
+                        help="Tamanhos das bases sintéticas")
+    parser.add_argument('--profiles', type=int, default=20, help="Perfis de metas por tamanho")
+    parser.add_argument('--backends', nargs='+', default=disponiveis, choices=disponiveis,
+                        help="Backends medidos")
+    parser.add_argument('--pulp-max-size', type=int, default=10000,
+                        help="Maior base medida no caminho PuLP (subprocesso é lento em bases grandes)")
+    parser.add_argument('--seed', type=int, default=0, help="Semente dos dados sintéticos")
+    parser.add_argument('--output', help="Arquivo JSON de saída (padrão: saída padrão)")
+    args = parser.parse_args(argv)
+
+    relatorio = run(args.sizes, args.profiles, args.backends, args.pulp_max_size, args.seed)
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(texto)
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
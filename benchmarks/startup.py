@@ -0,0 +1,201 @@
+"""
+Benchmark de tempo de partida do caminho sem interface gráfica
+
+Para executar:
+    python -m benchmarks.startup --repeat 5 --output startup.json
+
+Cada cenário roda em um interpretador novo (partida a frio): importação do
+pacote, do otimizador e de main.py, e uma otimização completa com o backend
+padrão e com cada backend. O relatório JSON traz a mediana e o máximo em
+milissegundos e os módulos pesados carregados em cada cenário. O processo
+termina com código 1 se algum orçamento de tempo for excedido ou se um
+cenário sem interface carregar módulos que não deveria (tkinter, PuLP ou
+SciPy).
+
+O orçamento da otimização a frio pelo PuLP é relativo: a mesma otimização
+é medida na revisão de referência (BASELINE_REVISION, anterior aos backends
+em processo, em uma cópia temporária via git worktree) e o cenário falha se
+passar de STARTUP_TOLERANCE vezes essa mediana.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.run_benchmarks import git_revision
+
+# Módulos cuja presença é verificada ao fim de cada cenário
+HEAVY_MODULES = ('numpy', 'scipy', 'pulp', 'tkinter')
+
+# Revisão de referência dos orçamentos relativos e tolerância sobre a sua mediana
+BASELINE_REVISION = 'ee802f2'
+STARTUP_TOLERANCE = 3.0
+
+# Otimização a frio executada na revisão de referência (só havia o PuLP)
+BASELINE_SOLVE = (
+    "from optimization.diet_optimizer import DietOptimizer\n"
+    "DietOptimizer().optimize_diet(2000, 60, 70, 50)"
+)
+
+# Cenário -> (código executado, orçamento padrão em ms, módulos proibidos).
+# Orçamento 'baseline': STARTUP_TOLERANCE vezes BASELINE_SOLVE na revisão de referência
+SCENARIOS = {
+    'interpreter': ("pass", None, ()),
+    'import_package': ("import optimization", 100, ('numpy', 'scipy', 'pulp', 'tkinter')),
+    'import_optimizer': ("import optimization.diet_optimizer", 400, ('scipy', 'pulp', 'tkinter')),
+    'import_main': ("import main", 100, ('tkinter',)),
+    # Backend padrão: com o SciPy instalado é o HiGHS, que paga a importação do
+    # SciPy uma vez em troca de soluções em processo; medido, sem orçamento padrão
+    'cold_solve': (
+        "from optimization.diet_optimizer import DietOptimizer\n"
+        "DietOptimizer(cache=False).optimize_diet(2000, 60, 70, 50)",
+        None, ('tkinter',),
+    ),
+    'cold_solve_pulp': (
+        "from optimization.diet_optimizer import DietOptimizer\n"
+        "DietOptimizer('pulp', cache=False).optimize_diet(2000, 60, 70, 50)",
+        'baseline', ('scipy', 'tkinter'),
+    ),
+    # HiGHS pedido explicitamente: paga a importação do SciPy, sem orçamento padrão
+    'cold_solve_highs': (
+        "from optimization.diet_optimizer import DietOptimizer\n"
+        "DietOptimizer('highs', cache=False).optimize_diet(2000, 60, 70, 50)",
+        None, ('pulp', 'tkinter'),
+    ),
+}
+
+# Executado no processo filho após o cenário: informa os módulos carregados
+_REPORT = "\nimport json, sys\nprint(json.dumps([m for m in {modules!r} if m in sys.modules]))"
+
+
+def run_scenario(codigo, repeticoes, raiz=None):
+    """Executa o cenário em interpretadores novos
+
+    Args:
+        codigo (str): Código do cenário
+        repeticoes (int): Execuções
+        raiz (str, optional): Diretório do projeto (padrão: a árvore atual)
+
+    Returns:
+        dict: Tempos (ms) de cada execução e módulos pesados carregados
+    """
+    raiz = raiz or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = codigo + _REPORT.format(modules=HEAVY_MODULES)
+    tempos = []
+    carregados = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        saida = subprocess.run([sys.executable, '-c', script], cwd=raiz, capture_output=True, text=True, check=True)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        carregados = json.loads(saida.stdout.strip().splitlines()[-1])
+    return {'tempos_ms': tempos, 'modulos': carregados}
+
+
+def measure_baseline(revisao, repeticoes):
+    """Mede BASELINE_SOLVE na revisão de referência, em uma cópia temporária da árvore
+
+    Args:
+        revisao (str): Commit de referência
+        repeticoes (int): Execuções
+
+    Returns:
+        float: Mediana em ms
+    """
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as temporario:
+        copia = os.path.join(temporario, 'baseline')
+        subprocess.run(['git', 'worktree', 'add', '--detach', copia, revisao],
+                       cwd=raiz, capture_output=True, text=True, check=True)
+        try:
+            medido = run_scenario(BASELINE_SOLVE, repeticoes, raiz=copia)
+        finally:
+            subprocess.run(['git', 'worktree', 'remove', '--force', copia], cwd=raiz, capture_output=True)
+    return statistics.median(medido['tempos_ms'])
+
+
+def run(repeticoes, orcamentos, revisao=BASELINE_REVISION, tolerancia=STARTUP_TOLERANCE):
+    """Mede todos os cenários e confere os orçamentos
+
+    Args:
+        repeticoes (int): Execuções por cenário
+        orcamentos (dict): Cenário -> orçamento em ms (sobrepõe os padrões)
+        revisao (str): Revisão de referência dos orçamentos relativos
+        tolerancia (float): Múltiplo da referência aceito nos orçamentos relativos
+
+    Returns:
+        dict: Relatório com 'ok' False se algum orçamento ou restrição de módulos falhar
+    """
+    relatorio = {
+        'commit': git_revision(),
+        'python': sys.version.split()[0],
+        'repeticoes': repeticoes,
+        'referencia': None,
+        'cenarios': {},
+        'ok': True,
+    }
+    relativos = [nome for nome, (_, orcamento, _) in SCENARIOS.items()
+                 if orcamento == 'baseline' and nome not in orcamentos]
+    if relativos:
+        referencia = measure_baseline(revisao, repeticoes)
+        relatorio['referencia'] = {
+            'commit': revisao,
+            'mediana_ms': round(referencia, 1),
+            'tolerancia': tolerancia,
+        }
+    for nome, (codigo, orcamento, proibidos) in SCENARIOS.items():
+        medido = run_scenario(codigo, repeticoes)
+        orcamento = orcamentos.get(nome, orcamento)
+        if orcamento == 'baseline':
+            orcamento = round(tolerancia * referencia, 1)
+        mediana = statistics.median(medido['tempos_ms'])
+        indevidos = [modulo for modulo in medido['modulos'] if modulo in proibidos]
+        ok = not indevidos and (orcamento is None or mediana <= orcamento)
+        relatorio['cenarios'][nome] = {
+            'mediana_ms': round(mediana, 1),
+            'max_ms': round(max(medido['tempos_ms']), 1),
+            'orcamento_ms': orcamento,
+            'modulos': medido['modulos'],
+            'modulos_indevidos': indevidos,
+            'ok': ok,
+        }
+        relatorio['ok'] &= ok
+    return relatorio
+
+
+def main(argv=None):
+    """Executa o benchmark de partida pela linha de comando"""
+    parser = argparse.ArgumentParser(description="Benchmark de tempo de partida sem interface gráfica")
+    parser.add_argument('--repeat', type=int, default=5, help="Execuções por cenário")
+    parser.add_argument('--budget', nargs=2, action='append', default=[], metavar=('CENARIO', 'MS'),
+                        help="Sobrepõe o orçamento de um cenário (ms)")
+    parser.add_argument('--baseline', default=BASELINE_REVISION, metavar='REV',
+                        help="Revisão de referência dos orçamentos relativos (padrão: %(default)s)")
+    parser.add_argument('--tolerance', type=float, default=STARTUP_TOLERANCE,
+                        help="Múltiplo da referência aceito nos orçamentos relativos (padrão: %(default)s)")
+    parser.add_argument('--output', help="Arquivo JSON de saída (padrão: saída padrão)")
+    args = parser.parse_args(argv)
+
+    orcamentos = {nome: float(ms) for nome, ms in args.budget}
+    desconhecidos = set(orcamentos) - set(SCENARIOS)
+    if desconhecidos:
+        parser.error(f"Cenários desconhecidos: {', '.join(sorted(desconhecidos))}")
+    try:
+        relatorio = run(args.repeat, orcamentos, args.baseline, args.tolerance)
+    except subprocess.CalledProcessError as erro:
+        parser.error(f"Não foi possível medir a revisão de referência {args.baseline}: {(erro.stderr or '').strip()}")
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(texto)
+    else:
+        print(texto)
+    return 0 if relatorio['ok'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
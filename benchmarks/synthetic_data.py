@@ -0,0 +1,117 @@
+"""
+Geração de bases de alimentos e perfis sintéticos para benchmarks
+"""
+
+import random
+
+import numpy as np
+
+from config.constants import CATEGORY_PORTION_LIMITS, NUTRIENTS, PORTION_LIMITS
+from data.food_table import FoodTable
+
+
+def generate_foods(n, seed=0):
+    """Gera uma base sintética com o mesmo esquema de get_food_data
+
+    Args:
+        n (int): Número de alimentos
+        seed (int): Semente do gerador aleatório
+
+    Returns:
+        list: Lista de dicionários de alimentos
+    """
+    rng = random.Random(seed)
+    categorias = list(CATEGORY_PORTION_LIMITS)
+    padrao = PORTION_LIMITS['daily']
+    alimentos = []
+    for i in range(n):
+        categoria = rng.choice(categorias)
+        limites = CATEGORY_PORTION_LIMITS.get(categoria, {})
+        proteina = rng.uniform(0, 35)
+        gordura = rng.uniform(0, 15)
+        carboidrato = rng.uniform(0, 70)
+        preco = round(rng.uniform(0.2, 8.0), 2)
+        alimentos.append({
+            'nome': f"Alimento sintético {i}",
+            'calorias': round(4 * proteina + 9 * gordura + 4 * carboidrato, 1),
+            'proteina': round(proteina, 1),
+            'gordura': round(gordura, 1),
+            'carboidrato': round(carboidrato, 1),
+            'preco': preco,
+            'categoria': categoria,
+            'porcao': "100g",
+            'market_price': round(preco * 10, 2),
+            'market_portion': "1 kg",
+            'max_portions_daily': limites.get('max_daily', padrao['default_max']),
+            'min_portions_daily': limites.get('min_daily', padrao['default_min']),
+        })
+    return alimentos
+
+
+def generate_columns(n, seed=0, micronutrients=False):
+    """Gera uma base sintética já em colunas, sem um dicionário por alimento
+
+    Mesmo esquema e distribuições de generate_foods (valores diferentes para a
+    mesma semente), para bases grandes demais para montar alimento a alimento.
+
+    Args:
+        n (int): Número de alimentos
+        seed (int): Semente do gerador aleatório
+        micronutrients (bool): Inclui todos os nutrientes opcionais de NUTRIENTS,
+            com valores por porção de até um quinto do limite diário padrão
+
+    Returns:
+        dict: Coluna -> array (numéricas) ou lista de textos, como em FoodTable.from_columns
+    """
+    rng = np.random.default_rng(seed)
+    categorias = list(CATEGORY_PORTION_LIMITS)
+    padrao = PORTION_LIMITS['daily']
+    escolhidas = rng.integers(len(categorias), size=n)
+    proteina = rng.uniform(0, 35, n).round(1)
+    gordura = rng.uniform(0, 15, n).round(1)
+    carboidrato = rng.uniform(0, 70, n).round(1)
+    preco = rng.uniform(0.2, 8.0, n).round(2)
+    maximos = np.array([CATEGORY_PORTION_LIMITS[c].get('max_daily', padrao['default_max']) for c in categorias])
+    minimos = np.array([CATEGORY_PORTION_LIMITS[c].get('min_daily', padrao['default_min']) for c in categorias])
+    colunas = {
+        'nome': [f"Alimento sintético {i}" for i in range(n)],
+        'categoria': [categorias[i] for i in escolhidas.tolist()],
+        'porcao': ["100g"] * n,
+        'market_portion': ["1 kg"] * n,
+        'calorias': (4 * proteina + 9 * gordura + 4 * carboidrato).round(1),
+        'proteina': proteina,
+        'gordura': gordura,
+        'carboidrato': carboidrato,
+        'preco': preco,
+        'market_price': (preco * 10).round(2),
+        'max_portions_daily': maximos[escolhidas].astype(float),
+        'min_portions_daily': minimos[escolhidas].astype(float),
+    }
+    if micronutrients:
+        for coluna in FoodTable.OPTIONAL_COLUMNS:
+            referencia = NUTRIENTS[coluna]['min'] or NUTRIENTS[coluna]['max'] or 1.0
+            colunas[coluna] = rng.uniform(0, referencia / 5, n).round(3)
+    return colunas
+
+
+def generate_profiles(n, seed=0):
+    """Gera perfis de metas aleatórios no formato de optimize_many
+
+    Args:
+        n (int): Número de perfis
+        seed (int): Semente do gerador aleatório
+
+    Returns:
+        list: Dicionários com metac, metap, metag, orcamento e metacarb
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            'metac': round(rng.uniform(1500, 3500)),
+            'metap': round(rng.uniform(40, 180)),
+            'metag': round(rng.uniform(50, 150)),
+            'orcamento': round(rng.uniform(30, 150), 2),
+            'metacarb': rng.choice([None, round(rng.uniform(250, 450))]),
+        }
+        for _ in range(n)
+    ]
@@ -23,12 +23,34 @@ PORTION_LIMITS = {
         'default_min': 0.0    # mínimo padrão de porções por dia
     },
     'weekly': {
-        'enabled': False,
+        'enabled': True,
         'default_max': 70.0,  # máximo padrão de porções por semana
         'default_min': 0.0    # mínimo padrão de porções por semana
     }
 }
 
+# Planejamento semanal (DietOptimizer.optimize_week)
+WEEKLY_PLAN = {
+    'days': 7,
+    'variety_categories': ('Proteínas',),  # categorias com limite de dias por alimento
+    'max_days_per_food': 3,                # dias da semana em que um mesmo alimento delas pode aparecer
+    'max_rounds': 20                       # rodadas de coordenação entre os dias
+}
+
+# Modos de porção de optimize_diet: passo das quantidades (None = contínuo)
+PORTION_MODES = {
+    'continuous': None,
+    'integer': 1.0,
+    'half': 0.5
+}
+
+# Solução exata do MILP de porções inteiras (time_limit 0 usa só a heurística)
+MILP_OPTIONS = {
+    'time_limit': 2.0,  # segundos
+    'mip_gap': 0.01,    # gap relativo aceito
+    'threads': 1        # threads do CBC (caminho PuLP)
+}
+
 # Limites específicos por categoria de alimento
 CATEGORY_PORTION_LIMITS = {
     'Óleos e Gorduras': {'max_daily': 3.0, 'min_daily': 0.0},
@@ -39,6 +61,40 @@ CATEGORY_PORTION_LIMITS = {
     'Laticínios': {'max_daily': 3.0, 'min_daily': 1.0}
 }
 
+# Nutrientes do modelo: coluna da tabela -> nome, unidade (por porção) e limites
+# diários padrão. Cada nutriente vira uma linha da matriz de nutrientes da
+# FoodTable; os limites de calorias, proteína, gordura e carboidrato vêm dos
+# argumentos de optimize_diet (metac, metap, metag, metacarb), e os demais só
+# valem quando a tabela informa o nutriente (ver resolve_nutrient_targets).
+# Referência: valores diários de adultos (ANVISA, IN 75/2020)
+NUTRIENTS = {
+    'calorias': {'nome': 'Calorias', 'unidade': 'kcal', 'min': None, 'max': None},
+    'proteina': {'nome': 'Proteína', 'unidade': 'g', 'min': None, 'max': None},
+    'gordura': {'nome': 'Gordura', 'unidade': 'g', 'min': None, 'max': None},
+    'carboidrato': {'nome': 'Carboidrato', 'unidade': 'g', 'min': None, 'max': None},
+    'fibra': {'nome': 'Fibra alimentar', 'unidade': 'g', 'min': 25.0, 'max': None},
+    'gordura_saturada': {'nome': 'Gordura saturada', 'unidade': 'g', 'min': None, 'max': 22.0},
+    'acucar_adicionado': {'nome': 'Açúcar adicionado', 'unidade': 'g', 'min': None, 'max': 50.0},
+    'colesterol': {'nome': 'Colesterol', 'unidade': 'mg', 'min': None, 'max': 300.0},
+    'sodio': {'nome': 'Sódio', 'unidade': 'mg', 'min': None, 'max': 2000.0},
+    'potassio': {'nome': 'Potássio', 'unidade': 'mg', 'min': 3500.0, 'max': None},
+    'calcio': {'nome': 'Cálcio', 'unidade': 'mg', 'min': 1000.0, 'max': 2500.0},
+    'ferro': {'nome': 'Ferro', 'unidade': 'mg', 'min': 14.0, 'max': 45.0},
+    'magnesio': {'nome': 'Magnésio', 'unidade': 'mg', 'min': 420.0, 'max': None},
+    'zinco': {'nome': 'Zinco', 'unidade': 'mg', 'min': 11.0, 'max': 40.0},
+    'fosforo': {'nome': 'Fósforo', 'unidade': 'mg', 'min': 700.0, 'max': None},
+    'vitamina_a': {'nome': 'Vitamina A', 'unidade': 'µg', 'min': 800.0, 'max': 3000.0},
+    'vitamina_c': {'nome': 'Vitamina C', 'unidade': 'mg', 'min': 100.0, 'max': 2000.0},
+    'vitamina_d': {'nome': 'Vitamina D', 'unidade': 'µg', 'min': 15.0, 'max': None},
+    'vitamina_e': {'nome': 'Vitamina E', 'unidade': 'mg', 'min': 15.0, 'max': None},
+    'tiamina': {'nome': 'Tiamina (B1)', 'unidade': 'mg', 'min': 1.2, 'max': None},
+    'riboflavina': {'nome': 'Riboflavina (B2)', 'unidade': 'mg', 'min': 1.2, 'max': None},
+    'niacina': {'nome': 'Niacina (B3)', 'unidade': 'mg', 'min': 15.0, 'max': None},
+    'vitamina_b6': {'nome': 'Vitamina B6', 'unidade': 'mg', 'min': 1.3, 'max': None},
+    'folato': {'nome': 'Folato', 'unidade': 'µg', 'min': 400.0, 'max': None},
+    'vitamina_b12': {'nome': 'Vitamina B12', 'unidade': 'µg', 'min': 2.4, 'max': None},
+}
+
 # Labels dos campos de entrada atualizados
 FIELD_LABELS = [
     ("Calorias mínimas (kcal):", "cal_entry", "Ex: 2000"),
@@ -61,3 +117,87 @@ RESULT_DISPLAY = {
 
 # Tolerância para valores numéricos
 NUMERICAL_TOLERANCE = 1e-6
+
+# Backend de solução do LP: 'auto' (HiGHS em processo se o SciPy estiver
+# instalado, senão PuLP), 'highs' ou 'pulp' (GLPK/CBC via subprocesso)
+SOLVER_BACKEND = 'auto'
+
+# Diagnóstico de inviabilidade: quando o LP é inviável, um LP elástico encontra
+# a menor relaxação das metas, do orçamento e dos limites de porção. Cada
+# penalidade vale por variação relativa (reduzir 10% de uma meta custa 0,1 × peso)
+INFEASIBILITY_DIAGNOSIS = True
+RELAXATION_PENALTIES = {
+    'metac': 1.0,
+    'metap': 1.0,
+    'metag': 1.0,
+    'metacarb': 1.0,
+    'orcamento': 1.0,
+    'portion_min': 1.0,
+    'portion_max': 1.0,
+}
+
+# Dietas alternativas (DietOptimizer.alternatives): quantidade de planos e
+# tolerância de custo relativa ao ótimo (0.10 = até 10% mais caro)
+ALTERNATIVES_COUNT = 5
+ALTERNATIVES_COST_SLACK = 0.10
+
+# Preços: o preço por porção é calculado do preço e da embalagem de mercado
+# (data/market_units.py); arquivos de preço são verificados a cada
+# PRICE_RELOAD_SECONDS por PriceFeed.watch
+DERIVE_PORTION_PRICES = True
+PRICE_RELOAD_SECONDS = 5.0
+
+# Cache LRU de resultados de otimização (0 desativa)
+RESULT_CACHE_SIZE = 1024
+RESULT_CACHE_DECIMALS = 2  # casas decimais das metas na chave do cache
+
+# Busca de alimentos na janela de exclusão: máximo de resultados por consulta
+FOOD_SEARCH_LIMIT = 200
+
+# Intervalo (ms) de consulta da otimização em segundo plano pela interface
+OPTIMIZATION_POLL_MS = 16
+
+# Curva de custo mínimo (aba "Curva de Custo")
+FRONTIER_TARGETS = {
+    'Proteína mínima (g)': 'metap',
+    'Calorias mínimas (kcal)': 'metac',
+    'Gordura máxima (g)': 'metag'
+}
+FRONTIER_POINTS = 100
+
+# Incluir resultado['timings'] (segundos por fase) em toda otimização
+COLLECT_TIMINGS = False
+
+# Nomes das fases medidas exibidos no progresso da interface
+TIMING_PHASE_LABELS = {
+    'food_load': "Carga dos alimentos",
+    'cache_lookup': "Consulta ao cache",
+    'exclusion_filter': "Filtro de exclusões",
+    'model': "Modelo compilado",
+    'variables': "Variáveis de decisão",
+    'objective': "Função objetivo",
+    'constraints': "Restrições",
+    'solve': "Solução do LP",
+    'extract': "Extração do resultado",
+    'heuristic': "Arredondamento das porções",
+    'milp': "Solução inteira (MILP)",
+    'diagnosis': "Diagnóstico de inviabilidade",
+    'alternatives': "Dieta alternativa",
+    'frontier_point': "Ponto da curva de custo"
+}
+
+# Serviço HTTP (python -m service.http_service)
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 8000
+SERVICE_WORKERS = None         # processos de solução (None = número de CPUs)
+SERVICE_QUEUE_SIZE = 64        # solicitações aguardando além das em execução; acima disso, 429
+SERVICE_MAX_BODY = 1 << 20     # tamanho máximo do corpo JSON (bytes)
+SERVICE_BATCH_CHUNK = 256      # perfis por tarefa do pool no endpoint /batch
+
+# Cálculo automático das metas (Mifflin-St Jeor)
+ACTIVITY_FACTORS = {'Sedentário': 1.2, 'Leve': 1.375, 'Moderado': 1.55, 'Ativo': 1.725, 'Muito Ativo': 1.9}
+SEX_OPTIONS = ('Masculino', 'Feminino')
+
+# Linha de comando em lote (python -m optimization)
+CLI_WORKERS = 1                # processos de solução (1 = no próprio processo)
+CLI_CHUNK_SIZE = 64            # perfis por tarefa do pool
@@ -2,10 +2,56 @@
 Base de dados de alimentos com informações nutricionais e preços
 """
 
-from config.constants import CATEGORY_PORTION_LIMITS
+import unicodedata
 
-def get_food_data():
-    """Retorna lista de alimentos com informações nutricionais e preço por porção.
+from config.constants import CATEGORY_PORTION_LIMITS, DERIVE_PORTION_PRICES
+from data.food_table import FoodTable
+from data.market_units import portion_prices
+
+# Tabela compartilhada, construída na primeira consulta
+_food_table = None
+
+# Índice de nomes normalizados da tabela atual: (tabela, {nome normalizado: linha})
+_name_index = (None, {})
+
+# Nomes alternativos aceitos nas buscas (alias -> nome na base)
+FOOD_ALIASES = {
+    "Arroz": "Arroz branco cozido",
+    "Feijão": "Feijão cozido",
+    "Macarrão": "Macarrão cozido",
+    "Pão": "Pão francês",
+    "Pãozinho": "Pão francês",
+    "Frango": "Frango grelhado",
+    "Peito de frango": "Frango grelhado",
+    "Carne moída": "Carne moída magra",
+    "Atum": "Atum em água",
+    "Ovo": "Ovo cozido",
+    "Muçarela": "Queijo mussarela",
+    "Mussarela": "Queijo mussarela",
+    "Manteiga de amendoim": "Pasta de Amendoim",
+    "Leite": "Leite integral",
+    "Iogurte": "Iogurte natural",
+    "Banana": "Banana nanica",
+    "Batata": "Batata inglesa",
+    "Azeite de oliva": "Azeite",
+}
+
+def apply_category_limits(food):
+    """Preenche os limites diários de porção do alimento a partir da categoria
+    
+    Args:
+        food (dict): Alimento com a chave 'categoria' (alterado no lugar)
+    """
+    categoria = food['categoria']
+    if categoria in CATEGORY_PORTION_LIMITS:
+        food['max_portions_daily'] = CATEGORY_PORTION_LIMITS[categoria]['max_daily']
+        food['min_portions_daily'] = CATEGORY_PORTION_LIMITS[categoria]['min_daily']
+    else:
+        food['max_portions_daily'] = 10.0  # padrão
+        food['min_portions_daily'] = 0.0   # padrão
+
+def _build_food_list():
+    """Monta a lista de alimentos com informações nutricionais e preço por porção.
     
     Cada alimento possui:
     - nome: identificação do alimento
@@ -13,7 +59,7 @@ def get_food_data():
     - proteina: gramas de proteína por porção
     - gordura: gramas de gordura por porção
     - carboidrato: gramas de carboidrato por porção
-    - preco: custo em R$ por porção
+    - preco: custo em R$ por porção (calculado do preço de mercado, ver DERIVE_PORTION_PRICES)
     - max_portions_daily: máximo de porções por dia
     - min_portions_daily: mínimo de porções por dia
     
@@ -91,15 +137,21 @@ def get_food_data():
             food['market_price'] = food['preco']
             food['market_portion'] = food['porcao']
 
+    # Preço por porção derivado do preço de mercado; o preço fixo acima fica
+    # só para os alimentos cujas unidades não são comparáveis
+    if DERIVE_PORTION_PRICES:
+        precos = portion_prices(
+            [food['market_price'] for food in base_foods],
+            [food['market_portion'] for food in base_foods],
+            [food['porcao'] for food in base_foods],
+            fallback=[food['preco'] for food in base_foods],
+        )
+        for food, preco in zip(base_foods, precos.tolist()):
+            food['preco'] = preco
+
     # Adicionar limites de porção baseados na categoria
     for food in base_foods:
-        categoria = food['categoria']
-        if categoria in CATEGORY_PORTION_LIMITS:
-            food['max_portions_daily'] = CATEGORY_PORTION_LIMITS[categoria]['max_daily']
-            food['min_portions_daily'] = CATEGORY_PORTION_LIMITS[categoria]['min_daily']
-        else:
-            food['max_portions_daily'] = 10.0  # padrão
-            food['min_portions_daily'] = 0.0   # padrão
+        apply_category_limits(food)
     
     # Adicionar observações para tabela nutricional
     food_observations = [
@@ -110,41 +162,115 @@ def get_food_data():
     
     return base_foods
 
+def get_food_table():
+    """Retorna a tabela colunar de alimentos, construída uma única vez
+    
+    Returns:
+        FoodTable: Tabela compartilhada e somente leitura
+    """
+    global _food_table
+    if _food_table is None:
+        _food_table = FoodTable(_build_food_list())
+    return _food_table
+
+def set_food_table(foods):
+    """Substitui a base de alimentos, incrementando a versão da tabela
+    
+    Args:
+        foods (list or FoodTable): Alimentos no formato de get_food_data, ou uma
+            tabela já construída (ex: carregada por data.food_loader)
+        
+    Returns:
+        FoodTable: Nova tabela compartilhada
+    """
+    global _food_table
+    versao = get_food_table().version + 1
+    if isinstance(foods, FoodTable):
+        foods.version = versao
+        _food_table = foods
+    else:
+        _food_table = FoodTable(foods, version=versao)
+    return _food_table
+
+def get_food_data():
+    """Retorna lista de alimentos com informações nutricionais e preço por porção.
+    
+    Os alimentos são mapeamentos somente leitura compartilhados pela tabela
+    em cache (ver _build_food_list para os campos); a lista em si é nova a
+    cada chamada e pode ser filtrada livremente.
+    
+    Returns:
+        list: Lista de mapeamentos com dados dos alimentos
+    """
+    return list(get_food_table().records())
+
 def get_food_categories():
     """Retorna as categorias de alimentos disponíveis
     
     Returns:
         dict: Dicionário com categorias e seus alimentos
     """
-    alimentos = get_food_data()
-    
-    categorias = {
-        'Cereais e Grãos': ['Arroz branco cozido', 'Feijão cozido', 'Macarrão cozido', 'Aveia', 'Pão francês', 'Farinha Láctea', 'Batata inglesa', 'Batata-doce'],
-        'Proteínas': ['Frango grelhado', 'Carne moída magra', 'Atum em água', 'Ovo cozido', 'Queijo mussarela', 'Pasta de Amendoim'],
-        'Laticínios': ['Leite integral', 'Iogurte natural'],
-        'Vegetais': ['Brócolis', 'Cenoura', 'Tomate', 'Alface'],
-        'Frutas': ['Banana nanica', 'Maçã', 'Laranja'],
-        'Óleos e Gorduras': ['Azeite', 'Manteiga']
+    return {
+        categoria: list(nomes)
+        for categoria, nomes in get_food_table().categories().items()
     }
+
+def normalize_food_name(nome):
+    """Normaliza um nome para busca: sem acentos, casefold e espaços simples
     
-    return categorias
+    Args:
+        nome (str): Nome do alimento
+        
+    Returns:
+        str: Nome normalizado (ex: "Pão  Francês" -> "pao frances")
+    """
+    decomposto = unicodedata.normalize('NFKD', nome)
+    sem_acentos = ''.join(ch for ch in decomposto if not unicodedata.combining(ch))
+    return ' '.join(sem_acentos.casefold().split())
+
+def get_name_index():
+    """Retorna o índice de nomes normalizados da tabela atual
+    
+    O índice inclui os nomes da base e os apelidos de FOOD_ALIASES e é
+    reconstruído apenas quando a tabela é substituída.
+    
+    Returns:
+        dict: Nome normalizado -> linha da tabela
+    """
+    global _name_index
+    tabela = get_food_table()
+    if _name_index[0] is not tabela:
+        indice = {}
+        for alias, nome in FOOD_ALIASES.items():
+            if nome in tabela.index:
+                indice[normalize_food_name(alias)] = tabela.index[nome]
+        # Nomes da base têm prioridade sobre apelidos
+        for linha, nome in enumerate(tabela.names):
+            indice[normalize_food_name(nome)] = linha
+        _name_index = (tabela, indice)
+    return _name_index[1]
 
 def get_food_by_name(nome):
     """Busca um alimento específico pelo nome
     
+    A busca ignora maiúsculas, acentos e espaços extras e aceita os apelidos
+    de FOOD_ALIASES, com custo constante por consulta.
+    
     Args:
         nome (str): Nome do alimento
         
     Returns:
         dict or None: Dados do alimento se encontrado, None caso contrário
     """
-    alimentos = get_food_data()
-    
-    for alimento in alimentos:
-        if alimento['nome'].lower() == nome.lower():
-            return alimento
+    tabela = get_food_table()
+    alimento = tabela.record(nome)
+    if alimento is not None:
+        return alimento
     
-    return None
+    linha = get_name_index().get(normalize_food_name(nome))
+    if linha is None:
+        return None
+    return tabela.records()[linha]
 
 def get_food_observations():
     """Retorna observações sobre os dados nutricionais
@@ -0,0 +1,476 @@
+"""
+Importação em lote de tabelas externas de alimentos com cache binário
+
+Lê arquivos CSV (vírgula ou ponto e vírgula, decimais com vírgula ou ponto),
+JSON Lines ou JSON em fluxo, normaliza cada linha para o esquema de
+get_food_data e compila o resultado em colunas .npy mais uma tabela de
+textos. Nas execuções seguintes as colunas são abertas por memory-map, sem
+reprocessar o texto.
+
+Para compilar o cache pela linha de comando:
+    python -m data.food_loader taco.csv fornecedor.csv --cache cache_alimentos
+"""
+
+import argparse
+import csv
+import json
+import os
+from array import array
+
+import numpy as np
+
+from data.food_database import apply_category_limits, set_food_table
+from data.food_table import FoodTable
+from data.market_units import portion_prices
+
+# Versão do formato do cache binário
+CACHE_FORMAT = 2
+MANIFEST_NAME = 'manifest.json'
+STRINGS_NAME = 'strings.json'
+
+# Nomes de colunas usuais nas tabelas TACO/TBCA e em catálogos de fornecedores
+COLUMN_ALIASES = {
+    'alimento': 'nome',
+    'descricao': 'nome',
+    'descrição': 'nome',
+    'descricao_alimento': 'nome',
+    'grupo': 'categoria',
+    'energia_kcal': 'calorias',
+    'energia (kcal)': 'calorias',
+    'kcal': 'calorias',
+    'proteina_g': 'proteina',
+    'proteína': 'proteina',
+    'proteína (g)': 'proteina',
+    'lipideos': 'gordura',
+    'lipídeos': 'gordura',
+    'lipideos_g': 'gordura',
+    'lipídeos (g)': 'gordura',
+    'gordura_g': 'gordura',
+    'carboidrato_g': 'carboidrato',
+    'carboidrato (g)': 'carboidrato',
+    'fibra_alimentar': 'fibra',
+    'fibra alimentar (g)': 'fibra',
+    'fibra_alimentar_g': 'fibra',
+    'sódio': 'sodio',
+    'sódio (mg)': 'sodio',
+    'sodio_mg': 'sodio',
+    'potássio': 'potassio',
+    'potássio (mg)': 'potassio',
+    'cálcio': 'calcio',
+    'cálcio (mg)': 'calcio',
+    'calcio_mg': 'calcio',
+    'ferro (mg)': 'ferro',
+    'ferro_mg': 'ferro',
+    'magnésio': 'magnesio',
+    'magnésio (mg)': 'magnesio',
+    'zinco (mg)': 'zinco',
+    'fósforo': 'fosforo',
+    'fósforo (mg)': 'fosforo',
+    'colesterol (mg)': 'colesterol',
+    'vitamina c (mg)': 'vitamina_c',
+    'vitamina_c_mg': 'vitamina_c',
+    'preco_porcao': 'preco',
+    'preço': 'preco',
+    'preco_mercado': 'market_price',
+    'porcao_mercado': 'market_portion',
+}
+
+# Marcações de "traço" e "não aplicável" das tabelas TACO/TBCA
+_EMPTY_VALUES = {'', 'na', 'nd', 'tr', '*', '-'}
+
+
+def parse_number(valor, coluna, origem):
+    """Converte um campo numérico aceitando vírgula decimal e marcações de traço"""
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    texto = str(valor).strip()
+    if texto.lower() in _EMPTY_VALUES:
+        return None
+    if ',' in texto and '.' not in texto:
+        texto = texto.replace(',', '.')
+    try:
+        return float(texto)
+    except ValueError:
+        raise ValueError(f"{origem}: valor inválido para '{coluna}': {valor!r}")
+
+
+def canonical_columns(row):
+    """Converte os nomes de coluna de uma linha importada para os do esquema (ver COLUMN_ALIASES)
+
+    Args:
+        row (dict): Linha do arquivo
+
+    Returns:
+        dict: Nova linha com as colunas renomeadas
+    """
+    colunas = {}
+    for chave, valor in row.items():
+        if chave is None:
+            continue
+        chave = chave.strip().lower()
+        colunas[COLUMN_ALIASES.get(chave, chave)] = valor
+    return colunas
+
+
+def parse_food_row(row, origem=''):
+    """Converte uma linha importada para o esquema, mantendo só as colunas que ela informa
+
+    Campos vazios ou com marcação de traço ficam de fora, para que uma fonte
+    posterior (ex: catálogo de preços de um fornecedor) não apague os dados
+    de uma anterior.
+
+    Args:
+        row (dict): Linha do arquivo (nomes de coluna livres, ver COLUMN_ALIASES)
+        origem (str): Identificação da linha para mensagens de erro
+
+    Returns:
+        dict or None: Colunas informadas, ou None para linhas sem nome
+    """
+    food = canonical_columns(row)
+    nome = str(food.get('nome') or '').strip()
+    if not nome:
+        return None
+    parcial = {'nome': nome}
+    for coluna in FoodTable.TEXT_COLUMNS[1:]:
+        texto = str(food.get(coluna) or '').strip()
+        if texto:
+            parcial[coluna] = texto
+    for coluna in FoodTable.NUMERIC_COLUMNS + FoodTable.OPTIONAL_COLUMNS:
+        if coluna in food:
+            valor = parse_number(food[coluna], coluna, origem)
+            if valor is not None:
+                parcial[coluna] = valor
+    return parcial
+
+
+def complete_columns(colunas):
+    """Preenche as colunas de alimentos importados que nenhuma fonte informou
+
+    Valores ausentes são NaN nas colunas numéricas e None nas de texto.
+    Nutrientes ausentes valem zero, a porção padrão é '100g', a embalagem de
+    mercado é a própria porção e os limites de porção vêm da categoria. Sem
+    'preco', o preço por porção é calculado de market_price e market_portion
+    (data.market_units); alimentos sem preço calculável são rejeitados.
+
+    Args:
+        colunas (dict): Coluna -> array float (numéricas) ou lista (textos),
+            alterado no lugar
+
+    Raises:
+        ValueError: Se algum alimento ficar sem preço
+    """
+    colunas['categoria'] = [texto or '' for texto in colunas['categoria']]
+    colunas['porcao'] = [texto or '100g' for texto in colunas['porcao']]
+    colunas['market_portion'] = [
+        embalagem or porcao for embalagem, porcao in zip(colunas['market_portion'], colunas['porcao'])
+    ]
+    for coluna in ('calorias', 'proteina', 'gordura', 'carboidrato') + FoodTable.OPTIONAL_COLUMNS:
+        if coluna in colunas:
+            valores = colunas[coluna]
+            valores[np.isnan(valores)] = 0.0
+
+    preco = colunas['preco']
+    market_price = colunas['market_price']
+    faltando = np.flatnonzero(np.isnan(preco))
+    if len(faltando):
+        preco[faltando] = portion_prices(
+            market_price[faltando],
+            [colunas['market_portion'][linha] for linha in faltando],
+            [colunas['porcao'][linha] for linha in faltando],
+        )
+        sem_preco = faltando[~np.isfinite(preco[faltando])]
+        if len(sem_preco):
+            nomes = ', '.join(colunas['nome'][linha] for linha in sem_preco[:5])
+            mais = f" e mais {len(sem_preco) - 5}" if len(sem_preco) > 5 else ''
+            raise ValueError(
+                f"{len(sem_preco)} alimento(s) sem preço: {nomes}{mais}. Informe 'preco', ou "
+                "'market_price' com uma 'market_portion' comparável à porção"
+            )
+    sem_mercado = np.isnan(market_price)
+    market_price[sem_mercado] = preco[sem_mercado]
+
+    # Limites de porção: explícitos nas fontes ou pela categoria
+    limites = {}
+    for coluna in ('min_portions_daily', 'max_portions_daily'):
+        valores = colunas[coluna]
+        for linha in np.flatnonzero(np.isnan(valores)):
+            categoria = colunas['categoria'][linha]
+            if categoria not in limites:
+                limites[categoria] = {'categoria': categoria}
+                apply_category_limits(limites[categoria])
+            valores[linha] = limites[categoria][coluna]
+
+
+def normalize_food_row(row, origem=''):
+    """Converte uma linha importada para o esquema de get_food_data
+
+    Args:
+        row (dict): Linha do arquivo (nomes de coluna livres, ver COLUMN_ALIASES)
+        origem (str): Identificação da linha para mensagens de erro
+
+    Returns:
+        dict or None: Alimento completo (ver complete_columns), ou None para linhas sem nome
+
+    Raises:
+        ValueError: Se a linha não tem preço nem preço de mercado utilizável
+    """
+    food = parse_food_row(row, origem)
+    if food is None:
+        return None
+    colunas = {coluna: [food.get(coluna)] for coluna in FoodTable.TEXT_COLUMNS}
+    for coluna in FoodTable.NUMERIC_COLUMNS + tuple(c for c in FoodTable.OPTIONAL_COLUMNS if c in food):
+        colunas[coluna] = np.array([food.get(coluna, np.nan)], dtype=float)
+    try:
+        complete_columns(colunas)
+    except ValueError as erro:
+        raise ValueError(f"{origem}: {erro}") from None
+    for coluna, valores in colunas.items():
+        food[coluna] = valores[0] if isinstance(valores, list) else float(valores[0])
+    return food
+
+
+def iter_rows(path):
+    """Lê as linhas de um arquivo tabular sem carregá-lo inteiro e sem normalizá-las
+
+    Args:
+        path (str): Arquivo .csv, .jsonl/.ndjson ou .json (lista de objetos)
+
+    Yields:
+        tuple: (origem da linha para mensagens de erro, linha como dicionário)
+    """
+    extensao = os.path.splitext(path)[1].lower()
+    with open(path, encoding='utf-8-sig', newline='') as arquivo:
+        if extensao == '.csv':
+            amostra = arquivo.read(4096)
+            arquivo.seek(0)
+            try:
+                dialeto = csv.Sniffer().sniff(amostra, delimiters=',;\t')
+            except csv.Error:
+                dialeto = csv.excel
+            linhas = csv.DictReader(arquivo, dialect=dialeto)
+            for numero, row in enumerate(linhas, start=2):
+                yield f"{path}:{numero}", row
+        elif extensao in ('.jsonl', '.ndjson'):
+            for numero, linha in enumerate(arquivo, start=1):
+                if linha.strip():
+                    yield f"{path}:{numero}", json.loads(linha)
+        elif extensao == '.json':
+            for numero, row in enumerate(_iter_json_array(arquivo), start=1):
+                yield f"{path}[{numero}]", row
+        else:
+            raise ValueError(f"Formato de arquivo não suportado: {path}")
+
+
+def iter_food_file(path):
+    """Lê um arquivo de alimentos linha a linha, sem carregá-lo inteiro
+
+    Args:
+        path (str): Arquivo .csv, .jsonl/.ndjson ou .json (lista de objetos)
+
+    Yields:
+        dict: Alimentos com só as colunas informadas (ver parse_food_row)
+    """
+    for origem, row in iter_rows(path):
+        food = parse_food_row(row, origem)
+        if food is not None:
+            yield food
+
+
+def _iter_json_array(arquivo, bloco=1 << 16):
+    """Decodifica os objetos de uma lista JSON incrementalmente"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    posicao = 0
+    abriu = False
+    fim_arquivo = False
+    while True:
+        while posicao < len(buffer) and buffer[posicao] in ' \t\r\n,':
+            posicao += 1
+        if posicao < len(buffer):
+            if not abriu:
+                if buffer[posicao] != '[':
+                    raise ValueError("O arquivo JSON deve conter uma lista de alimentos")
+                abriu = True
+                posicao += 1
+                continue
+            if buffer[posicao] == ']':
+                return
+            try:
+                objeto, fim = decoder.raw_decode(buffer, posicao)
+            except json.JSONDecodeError:
+                if fim_arquivo:
+                    raise ValueError("Lista JSON de alimentos inválida ou incompleta")
+            else:
+                yield objeto
+                posicao = fim
+                continue
+        elif fim_arquivo:
+            raise ValueError("Lista JSON de alimentos incompleta")
+
+        # Objeto incompleto no fim do buffer: ler o próximo bloco
+        dados = arquivo.read(bloco)
+        buffer = buffer[posicao:] + dados
+        posicao = 0
+        fim_arquivo = not dados
+
+
+def iter_food_files(paths):
+    """Encadeia a leitura de vários arquivos de alimentos, na ordem dada"""
+    for path in paths:
+        yield from iter_food_file(path)
+
+
+def _source_stamps(paths):
+    """Tamanho e data de modificação das fontes, para detectar cache desatualizado"""
+    return [
+        {'path': os.path.abspath(path), 'size': os.path.getsize(path), 'mtime': os.path.getmtime(path)}
+        for path in paths
+    ]
+
+
+def compile_food_cache(paths, cache_dir):
+    """Importa os arquivos e grava o cache binário colunar
+
+    As colunas numéricas são acumuladas em arrays compactos e os textos são
+    internados em uma única tabela de strings. Nutrientes opcionais
+    (FoodTable.OPTIONAL_COLUMNS) só são gravados se alguma linha os informa.
+    Alimentos repetidos (mesmo nome) são mesclados: cada fonte sobrepõe só as
+    colunas que informa, o que permite aplicar um catálogo de preços de
+    fornecedor a uma tabela nutricional. Uma fonte que traz preço de mercado
+    sem 'preco' faz o preço por porção ser recalculado. As colunas que
+    nenhuma fonte informa são preenchidas por complete_columns.
+
+    Args:
+        paths (list): Arquivos de origem, em ordem de prioridade crescente
+        cache_dir (str): Diretório do cache (criado se não existir)
+
+    Returns:
+        int: Número de alimentos gravados
+
+    Raises:
+        ValueError: Se algum alimento ficar sem preço
+    """
+    numericas = {coluna: array('d') for coluna in FoodTable.NUMERIC_COLUMNS + FoodTable.OPTIONAL_COLUMNS}
+    informados = set()
+    textos = {coluna: array('l') for coluna in FoodTable.TEXT_COLUMNS}
+    strings = {}
+    linhas_por_nome = {}
+
+    for food in iter_food_files(paths):
+        linha = linhas_por_nome.get(food['nome'])
+        if linha is None:
+            linha = len(linhas_por_nome)
+            linhas_por_nome[food['nome']] = linha
+            for valores in numericas.values():
+                valores.append(np.nan)
+            for codigos in textos.values():
+                codigos.append(-1)
+        if 'preco' not in food and ('market_price' in food or 'market_portion' in food):
+            numericas['preco'][linha] = np.nan
+        for coluna, valor in food.items():
+            if coluna in numericas:
+                numericas[coluna][linha] = valor
+                if coluna in FoodTable.OPTIONAL_COLUMNS:
+                    informados.add(coluna)
+            elif coluna in textos:
+                textos[coluna][linha] = strings.setdefault(valor, len(strings))
+
+    opcionais = [coluna for coluna in FoodTable.OPTIONAL_COLUMNS if coluna in informados]
+    tabela_strings = list(strings)
+    colunas = {
+        coluna: np.frombuffer(numericas[coluna], dtype=float)
+        for coluna in FoodTable.NUMERIC_COLUMNS + tuple(opcionais)
+    }
+    for coluna, codigos in textos.items():
+        colunas[coluna] = [tabela_strings[codigo] if codigo >= 0 else None for codigo in codigos]
+    complete_columns(colunas)
+    for coluna in FoodTable.TEXT_COLUMNS:
+        textos[coluna] = array('l', (strings.setdefault(texto, len(strings)) for texto in colunas[coluna]))
+
+    os.makedirs(cache_dir, exist_ok=True)
+    for coluna in FoodTable.NUMERIC_COLUMNS + tuple(opcionais):
+        np.save(os.path.join(cache_dir, f"{coluna}.npy"), colunas[coluna])
+    for coluna, codigos in textos.items():
+        np.save(os.path.join(cache_dir, f"{coluna}.codes.npy"), np.array(codigos, dtype=np.int32))
+    with open(os.path.join(cache_dir, STRINGS_NAME), 'w', encoding='utf-8') as arquivo:
+        json.dump(list(strings), arquivo, ensure_ascii=False)
+
+    # O manifesto é gravado por último: sua presença indica cache completo
+    manifesto = {
+        'format': CACHE_FORMAT,
+        'count': len(linhas_por_nome),
+        'nutrients': opcionais,
+        'sources': _source_stamps(paths),
+    }
+    with open(os.path.join(cache_dir, MANIFEST_NAME), 'w', encoding='utf-8') as arquivo:
+        json.dump(manifesto, arquivo, ensure_ascii=False, indent=2)
+    return len(linhas_por_nome)
+
+
+def cache_is_fresh(paths, cache_dir):
+    """Indica se o cache existe e foi compilado a partir das mesmas fontes
+
+    Returns:
+        bool: True se o cache pode ser usado sem recompilar
+    """
+    caminho = os.path.join(cache_dir, MANIFEST_NAME)
+    if not os.path.exists(caminho):
+        return False
+    with open(caminho, encoding='utf-8') as arquivo:
+        manifesto = json.load(arquivo)
+    return manifesto.get('format') == CACHE_FORMAT and manifesto.get('sources') == _source_stamps(paths)
+
+
+def load_food_cache(cache_dir):
+    """Abre o cache binário como FoodTable, com colunas numéricas em memory-map
+
+    Args:
+        cache_dir (str): Diretório gravado por compile_food_cache
+
+    Returns:
+        FoodTable: Tabela somente leitura
+    """
+    with open(os.path.join(cache_dir, MANIFEST_NAME), encoding='utf-8') as arquivo:
+        manifesto = json.load(arquivo)
+    with open(os.path.join(cache_dir, STRINGS_NAME), encoding='utf-8') as arquivo:
+        strings = json.load(arquivo)
+    colunas = {}
+    for coluna in FoodTable.NUMERIC_COLUMNS + tuple(manifesto.get('nutrients', ())):
+        colunas[coluna] = np.load(os.path.join(cache_dir, f"{coluna}.npy"), mmap_mode='r')
+    for coluna in FoodTable.TEXT_COLUMNS:
+        codigos = np.load(os.path.join(cache_dir, f"{coluna}.codes.npy"))
+        colunas[coluna] = [strings[codigo] for codigo in codigos.tolist()]
+    return FoodTable.from_columns(colunas)
+
+
+def load_foods(paths, cache_dir, install=True):
+    """Carrega as fontes de alimentos usando o cache binário quando atualizado
+
+    Args:
+        paths (list): Arquivos de origem
+        cache_dir (str): Diretório do cache
+        install (bool): Se a tabela deve substituir a base compartilhada (set_food_table)
+
+    Returns:
+        FoodTable: Tabela carregada
+    """
+    if not cache_is_fresh(paths, cache_dir):
+        compile_food_cache(paths, cache_dir)
+    tabela = load_food_cache(cache_dir)
+    if install:
+        tabela = set_food_table(tabela)
+    return tabela
+
+
+def main(argv=None):
+    """Compila o cache binário a partir da linha de comando"""
+    parser = argparse.ArgumentParser(description="Compila tabelas de alimentos em cache binário")
+    parser.add_argument('sources', nargs='+', help="Arquivos CSV, JSON ou JSON Lines")
+    parser.add_argument('--cache', required=True, help="Diretório do cache binário")
+    args = parser.parse_args(argv)
+    total = compile_food_cache(args.sources, args.cache)
+    print(f"{total} alimentos gravados em {args.cache}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Índice de busca incremental de alimentos por nome e categoria
+
+A busca ignora acentos e maiúsculas (normalize_food_name) e combina três
+estruturas montadas uma vez por tabela:
+
+- nomes normalizados em ordem alfabética, para prefixos do nome inteiro (bisect);
+- listas de linhas por n-grama: trigramas de " " + nome e os bigramas de
+  início de palavra (" a"), de modo que consultas de uma ou duas letras
+  encontram palavras que começam com elas;
+- linhas por categoria normalizada.
+
+Cada consulta percorre só a menor lista entre os seus n-gramas, confirma a
+ocorrência no nome e para assim que o limite é atingido. Os resultados vêm em ordem de
+relevância (início do nome, início de palavra, trecho do nome, categoria) e
+limitados a FOOD_SEARCH_LIMIT.
+
+    indice = get_search_index()
+    linhas, truncado = indice.search("feijao")
+"""
+
+import threading
+from bisect import bisect_left
+
+from config.constants import FOOD_SEARCH_LIMIT
+from data.food_database import get_food_table, normalize_food_name
+
+# Índice da tabela atual: (versão da tabela, FoodSearchIndex)
+_search_index = (None, None)
+_search_lock = threading.Lock()
+
+
+def _grams(texto):
+    """n-gramas indexados de um nome normalizado (ver docstring do módulo)"""
+    texto = ' ' + texto
+    grams = {texto[i:i + 3] for i in range(len(texto) - 2)}
+    grams.update(texto[i:i + 2] for i in range(len(texto) - 1) if texto[i] == ' ')
+    return grams
+
+
+class FoodSearchIndex:
+    """Índice de busca por prefixo e trigramas sobre os nomes e categorias"""
+
+    def __init__(self, names, categories):
+        """Monta o índice
+
+        Args:
+            names (sequence): Nome de cada linha da tabela
+            categories (sequence): Categoria de cada linha da tabela
+        """
+        self.names = names
+        self.texts = [normalize_food_name(nome) for nome in names]
+        self._padded = [' ' + texto for texto in self.texts]
+        self._sorted = sorted((texto, linha) for linha, texto in enumerate(self.texts))
+        self._sorted_texts = [texto for texto, _ in self._sorted]
+
+        self._postings = postings = {}
+        for linha, texto in enumerate(self.texts):
+            for gram in _grams(texto):
+                linhas = postings.get(gram)
+                if linhas is None:
+                    postings[gram] = [linha]
+                else:
+                    linhas.append(linha)
+
+        self._categories = {}
+        for linha, categoria in enumerate(categories):
+            self._categories.setdefault(normalize_food_name(categoria), []).append(linha)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def _prefix_rows(self, consulta, limite):
+        """Linhas cujo nome começa com a consulta, em ordem alfabética"""
+        inicio = bisect_left(self._sorted_texts, consulta)
+        linhas = []
+        for texto, linha in self._sorted[inicio:inicio + limite]:
+            if not texto.startswith(consulta):
+                break
+            linhas.append(linha)
+        return linhas
+
+    def _candidates(self, consulta, inicio_de_palavra):
+        """Menor lista de linhas que pode conter a consulta
+
+        Args:
+            consulta (str): Consulta normalizada
+            inicio_de_palavra (bool): Se a consulta deve começar uma palavra; sem
+                isso, os n-gramas que começam com espaço ficam de fora
+        """
+        if len(consulta) < 3:
+            return self._postings.get(' ' + consulta, []) if inicio_de_palavra else []
+        menor = range(len(self.texts))
+        for gram in _grams(consulta):
+            if gram[0] == ' ' and not inicio_de_palavra:
+                continue
+            linhas = self._postings.get(gram)
+            if linhas is None:
+                return []
+            if len(linhas) < len(menor):
+                menor = linhas
+        return menor
+
+    def _matching_rows(self, candidatos, padrao, vistos, limite):
+        """Até limite linhas dos candidatos cujo texto (com espaço inicial) contém o padrão"""
+        linhas = []
+        textos = self._padded
+        for linha in candidatos:
+            if padrao in textos[linha] and linha not in vistos:
+                linhas.append(linha)
+                if len(linhas) >= limite:
+                    break
+        return linhas
+
+    def search(self, query, limit=FOOD_SEARCH_LIMIT):
+        """Busca alimentos pelo nome ou pela categoria
+
+        Consultas de uma ou duas letras só encontram inícios de palavra.
+
+        Args:
+            query (str): Texto digitado (acentos e maiúsculas são ignorados)
+            limit (int): Máximo de resultados
+
+        Returns:
+            tuple: (linhas da tabela em ordem de relevância, True se havia mais
+                resultados que o limite). Uma consulta vazia devolve todas as linhas.
+        """
+        consulta = normalize_food_name(query)
+        if not consulta:
+            return list(range(len(self.texts))), False
+
+        # Cada etapa busca só o que falta para passar do limite (limit + 1)
+        resultado = self._prefix_rows(consulta, limit + 1)
+        vistos = set(resultado)
+        etapas = [(' ' + consulta, True)]
+        if len(consulta) >= 3:
+            etapas.append((consulta, False))
+        for padrao, inicio_de_palavra in etapas:
+            if len(resultado) > limit:
+                break
+            linhas = self._matching_rows(
+                self._candidates(consulta, inicio_de_palavra), padrao, vistos, limit + 1 - len(resultado)
+            )
+            resultado += linhas
+            vistos.update(linhas)
+
+        for categoria, linhas in self._categories.items():
+            if len(resultado) > limit:
+                break
+            if consulta in categoria:
+                resultado += [linha for linha in linhas[:limit + 1] if linha not in vistos]
+        return resultado[:limit], len(resultado) > limit
+
+
+def get_search_index():
+    """Retorna o índice de busca da tabela atual
+
+    O índice é reconstruído só quando a tabela é substituída; mudanças de
+    preço (FoodTable.update_costs) não o afetam. Chamadas simultâneas
+    aguardam uma única construção (a interface o monta em segundo plano).
+
+    Returns:
+        FoodSearchIndex: Índice compartilhado
+    """
+    global _search_index
+    tabela = get_food_table()
+    with _search_lock:
+        if _search_index[0] != tabela.version:
+            _search_index = (tabela.version, FoodSearchIndex(tabela.names, tabela['categoria']))
+        return _search_index[1]
@@ -0,0 +1,283 @@
+"""
+Tabela colunar de alimentos construída uma única vez e compartilhada
+"""
+
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+from config.constants import NUTRIENTS
+
+
+class FoodRecord(Mapping):
+    """Alimento como mapeamento somente leitura sobre uma linha da tabela
+
+    Guarda apenas a tabela e o número da linha (__slots__): os valores são
+    lidos das colunas a cada acesso, então um registro ocupa algumas dezenas
+    de bytes em vez de um dicionário com uma chave por coluna. Aceita tudo o
+    que se faz com os dicionários de get_food_data, exceto alterações;
+    dict(registro) devolve uma cópia comum.
+    """
+
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, coluna):
+        try:
+            valores = self._table._columns[coluna]
+        except KeyError:
+            raise KeyError(coluna) from None
+        valor = valores[self._row]
+        return valor if isinstance(valores, tuple) else float(valor)
+
+    def __iter__(self):
+        return iter(self._table.columns)
+
+    def __len__(self):
+        return len(self._table.columns)
+
+    def __repr__(self):
+        return f"FoodRecord({dict(self)!r})"
+
+    def __reduce__(self):
+        # Serializado (pickle) como dicionário comum, sem levar a tabela junto
+        return (dict, (dict(self),))
+
+
+class FoodRecords(Sequence):
+    """Sequência de FoodRecord de uma tabela, criados só quando acessados"""
+
+    __slots__ = ('_table',)
+
+    def __init__(self, table):
+        self._table = table
+
+    def __len__(self):
+        return len(self._table)
+
+    def __getitem__(self, linha):
+        if isinstance(linha, slice):
+            return [FoodRecord(self._table, i) for i in range(*linha.indices(len(self)))]
+        if linha < 0:
+            linha += len(self)
+        if not 0 <= linha < len(self):
+            raise IndexError(linha)
+        return FoodRecord(self._table, linha)
+
+    def __iter__(self):
+        tabela = self._table
+        return (FoodRecord(tabela, linha) for linha in range(len(tabela)))
+
+
+class FoodTable:
+    """Tabela de alimentos em colunas NumPy contíguas e somente leitura
+
+    Cada coluna numérica é um array float64 com uma linha por alimento; colunas
+    de texto são tuplas, com textos repetidos (categorias, porções) guardados
+    uma única vez. Não há um dicionário por alimento: records() expõe cada
+    linha como um FoodRecord compatível com os dicionários de get_food_data.
+    O índice nome -> linha e a versão permitem que caches
+    detectem quando a tabela foi substituída.
+
+    Os nutrientes de NUTRIENTS além dos quatro obrigatórios (fibra, sódio,
+    vitaminas...) são colunas opcionais: só existem quando a fonte os informa,
+    e nutrients lista os que a tabela tem, na ordem de NUTRIENTS.
+
+    Os preços são a única parte atualizável no lugar (update_costs): a troca
+    incrementa só cost_version, e o índice de nomes, as categorias e a matriz
+    de nutrientes continuam válidos.
+    """
+
+    NUMERIC_COLUMNS = (
+        'calorias', 'proteina', 'gordura', 'carboidrato', 'preco',
+        'market_price', 'min_portions_daily', 'max_portions_daily'
+    )
+    TEXT_COLUMNS = ('nome', 'categoria', 'porcao', 'market_portion')
+    COLUMNS = TEXT_COLUMNS + NUMERIC_COLUMNS
+    # Nutrientes guardados apenas quando algum alimento os informa
+    OPTIONAL_COLUMNS = tuple(sorted(NUTRIENTS.keys() - set(NUMERIC_COLUMNS), key=list(NUTRIENTS).index))
+    # Colunas alteradas por update_costs
+    COST_COLUMNS = ('preco', 'market_price', 'market_portion')
+
+    def __init__(self, foods, version=1):
+        """Constrói a tabela a partir de uma lista de dicionários de alimentos
+
+        Só as colunas do esquema são guardadas; os dicionários não são mantidos.
+        Um nutriente opcional ausente de um alimento vale zero nele.
+
+        Args:
+            foods (list): Alimentos no formato de get_food_data
+            version (int): Versão da tabela
+        """
+        colunas = {}
+        for coluna in self.NUMERIC_COLUMNS:
+            colunas[coluna] = np.fromiter((food.get(coluna, 0) for food in foods), dtype=float, count=len(foods))
+        informadas = set().union(*foods)
+        for coluna in self.OPTIONAL_COLUMNS:
+            if coluna in informadas:
+                colunas[coluna] = np.fromiter((food.get(coluna) or 0 for food in foods), dtype=float, count=len(foods))
+        for coluna in self.TEXT_COLUMNS:
+            colunas[coluna] = tuple(food.get(coluna, '') for food in foods)
+        self._setup(colunas, version)
+
+    @classmethod
+    def from_columns(cls, columns, version=1):
+        """Constrói a tabela diretamente a partir de colunas
+
+        Args:
+            columns (dict): Coluna -> array (numéricas) ou sequência de textos; as
+                colunas de OPTIONAL_COLUMNS podem faltar
+            version (int): Versão da tabela
+
+        Returns:
+            FoodTable: Nova tabela
+        """
+        tabela = cls.__new__(cls)
+        tabela._setup(columns, version)
+        return tabela
+
+    def _setup(self, columns, version):
+        """Guarda as colunas como somente leitura e monta o índice de nomes"""
+        self.version = version
+        self._columns = {}
+        for coluna in self.NUMERIC_COLUMNS:
+            self._columns[coluna] = self._readonly(columns[coluna])
+        opcionais = tuple(coluna for coluna in self.OPTIONAL_COLUMNS if columns.get(coluna) is not None)
+        for coluna in opcionais:
+            self._columns[coluna] = self._readonly(columns[coluna])
+        self._columns['nome'] = tuple(columns['nome'])
+        for coluna in self.TEXT_COLUMNS[1:]:
+            self._columns[coluna] = self._interned(columns[coluna])
+
+        self.columns = self.COLUMNS + opcionais
+        self.nutrients = tuple(coluna for coluna in NUTRIENTS if coluna in self._columns)
+        self.index = {nome: i for i, nome in enumerate(self._columns['nome'])}
+        self._costs = (0, self._columns['preco'])
+        self._categories = None
+        self._nutrient_matrix = None
+
+    @staticmethod
+    def _readonly(valores):
+        """Converte uma coluna numérica em array float64 contíguo e somente leitura"""
+        valores = np.ascontiguousarray(valores, dtype=float)
+        if valores.flags.writeable:
+            valores.flags.writeable = False
+        return valores
+
+    @staticmethod
+    def _interned(textos):
+        """Tupla de textos em que valores iguais compartilham o mesmo objeto"""
+        unicos = {}
+        return tuple(unicos.setdefault(texto, texto) for texto in textos)
+
+    @property
+    def cost_version(self):
+        """Versão dos preços, incrementada a cada update_costs"""
+        return self._costs[0]
+
+    @property
+    def data_version(self):
+        """Versão dos dados para chaves de cache: (versão da tabela, versão dos custos)"""
+        return (self.version, self._costs[0])
+
+    def cost_snapshot(self):
+        """Versão dos custos e preços por porção correspondentes, lidos de uma vez
+
+        Quem resolve e guarda em cache deve usar o mesmo snapshot para os dois:
+        ler cost_version e a coluna 'preco' separadamente pode misturar uma
+        atualização concorrente com os preços antigos.
+
+        Returns:
+            tuple: (cost_version, array de preços)
+        """
+        return self._costs
+
+    def update_costs(self, preco, market_price=None, market_portion=None):
+        """Substitui os preços no lugar, sem reconstruir a tabela
+
+        As colunas novas entram de uma vez (leitores concorrentes veem os
+        preços antigos ou os novos) e cost_version é incrementada; os
+        registros de records() passam a mostrar os novos preços.
+
+        Args:
+            preco (array-like): Preço por porção de cada linha
+            market_price (array-like, optional): Preço de mercado de cada linha
+            market_portion (sequence, optional): Embalagem de mercado de cada linha
+        """
+        colunas = dict(self._columns)
+        for coluna, valores in (('preco', preco), ('market_price', market_price)):
+            if valores is not None:
+                colunas[coluna] = self._readonly(np.array(valores, dtype=float))
+        if market_portion is not None:
+            colunas['market_portion'] = self._interned(market_portion)
+        for coluna in self.COST_COLUMNS:
+            if len(colunas[coluna]) != len(self):
+                raise ValueError(f"A coluna '{coluna}' deve ter {len(self)} valores")
+        self._columns = colunas
+        # Atribuição única: cost_snapshot() vê a versão e os preços antigos ou os novos
+        self._costs = (self._costs[0] + 1, colunas['preco'])
+
+    def __len__(self):
+        return len(self._columns['nome'])
+
+    def __getitem__(self, coluna):
+        """Retorna a coluna (array somente leitura ou tupla de textos)"""
+        return self._columns[coluna]
+
+    @property
+    def names(self):
+        """Nomes dos alimentos na ordem das linhas"""
+        return self._columns['nome']
+
+    def nutrient_matrix(self):
+        """Matriz (nutrientes x alimentos) somente leitura, na ordem de nutrients
+
+        Montada na primeira chamada e reaproveitada: as restrições nutricionais
+        e os totais de uma solução (matriz @ x) saem dela.
+        """
+        if self._nutrient_matrix is None:
+            matriz = np.vstack([self._columns[coluna] for coluna in self.nutrients])
+            matriz.flags.writeable = False
+            self._nutrient_matrix = matriz
+        return self._nutrient_matrix
+
+    def records(self):
+        """Retorna os alimentos como mapeamentos somente leitura
+
+        Returns:
+            FoodRecords: Sequência com um FoodRecord por linha, compatível com os
+                dicionários de get_food_data
+        """
+        return FoodRecords(self)
+
+    def record(self, nome):
+        """Retorna o alimento pelo nome exato, ou None"""
+        linha = self.index.get(nome)
+        return None if linha is None else FoodRecord(self, linha)
+
+    def rows(self, nomes):
+        """Converte nomes em índices de linha
+
+        Args:
+            nomes (iterable): Nomes dos alimentos (nomes desconhecidos são ignorados)
+
+        Returns:
+            numpy.ndarray: Índices das linhas
+        """
+        return np.array([self.index[nome] for nome in nomes if nome in self.index], dtype=np.intp)
+
+    def categories(self):
+        """Agrupa os nomes dos alimentos por categoria, na ordem da tabela
+
+        Returns:
+            dict: Categoria -> tupla de nomes
+        """
+        if self._categories is None:
+            agrupado = {}
+            for nome, categoria in zip(self._columns['nome'], self._columns['categoria']):
+                agrupado.setdefault(categoria, []).append(nome)
+            self._categories = {categoria: tuple(nomes) for categoria, nomes in agrupado.items()}
+        return self._categories
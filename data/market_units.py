@@ -0,0 +1,101 @@
+"""
+Leitura de unidades de mercado e cálculo do preço por porção
+
+Textos como "1 kg", "20 ovos", "1 lata (170 g)" ou "1 unidade (50g)" viram
+uma quantidade em gramas (massa ou volume) e uma contagem de unidades. O
+preço por porção é o preço de mercado vezes a fração da embalagem que uma
+porção representa: pela massa quando os dois textos a informam, senão pela
+contagem ("1 unidade (50g)" de "20 ovos" = 1/20 da embalagem).
+
+    precos = portion_prices(tabela['market_price'], tabela['market_portion'], tabela['porcao'])
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+
+# Unidade -> gramas. Volumes são convertidos com densidade 1 (1 ml = 1 g),
+# aproximação suficiente para leite, azeite e bebidas
+UNIT_GRAMS = {
+    'mg': 0.001,
+    'g': 1.0, 'gr': 1.0, 'grama': 1.0, 'gramas': 1.0,
+    'kg': 1000.0, 'quilo': 1000.0, 'quilos': 1000.0,
+    'ml': 1.0,
+    'l': 1000.0, 'litro': 1000.0, 'litros': 1000.0,
+}
+
+# Número (vírgula ou ponto decimal) seguido de uma palavra: "1,5 kg", "80g", "20 ovos"
+_QUANTITY = re.compile(r'(\d+(?:[.,]\d+)?)\s*([^\W\d_]+)')
+
+
+@lru_cache(maxsize=4096)
+def parse_quantity(texto):
+    """Extrai a quantidade em gramas e a contagem de unidades de um texto
+
+    Vale a primeira ocorrência de cada tipo: em "4 colheres (80g)" a contagem
+    é 4 e a massa 80 g.
+
+    Args:
+        texto (str): Porção ou embalagem (ex: "1 lata (170 g)")
+
+    Returns:
+        tuple: (gramas, contagem), com NaN no que o texto não informa
+    """
+    gramas = contagem = float('nan')
+    for numero, palavra in _QUANTITY.findall(str(texto)):
+        valor = float(numero.replace(',', '.'))
+        fator = UNIT_GRAMS.get(palavra.lower())
+        if fator is not None:
+            if np.isnan(gramas):
+                gramas = valor * fator
+        elif np.isnan(contagem):
+            contagem = valor
+    return gramas, contagem
+
+
+def _quantities(textos):
+    """Gramas e contagens de uma sequência de textos (cada texto distinto é lido uma vez)"""
+    lidos = {texto: parse_quantity(texto) for texto in dict.fromkeys(textos)}
+    pares = np.array([lidos[texto] for texto in textos], dtype=float).reshape(-1, 2)
+    return pares[:, 0], pares[:, 1]
+
+
+def portion_fractions(market_portion, porcao):
+    """Fração da embalagem de mercado que cada porção representa
+
+    Args:
+        market_portion (sequence): Embalagem de mercado de cada alimento
+        porcao (sequence): Porção nutricional de cada alimento
+
+    Returns:
+        numpy.ndarray: Fração por alimento (NaN quando as unidades não são comparáveis)
+    """
+    gramas_mercado, contagem_mercado = _quantities(market_portion)
+    gramas_porcao, contagem_porcao = _quantities(porcao)
+    por_massa = (gramas_mercado > 0) & np.isfinite(gramas_porcao)
+    por_contagem = ~por_massa & (contagem_mercado > 0) & np.isfinite(contagem_porcao)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(
+            por_massa, gramas_porcao / gramas_mercado,
+            np.where(por_contagem, contagem_porcao / contagem_mercado, np.nan)
+        )
+
+
+def portion_prices(market_price, market_portion, porcao, fallback=None):
+    """Calcula o preço por porção a partir do preço de mercado, para todos os alimentos de uma vez
+
+    Args:
+        market_price (array-like): Preço de cada embalagem de mercado (R$)
+        market_portion (sequence): Embalagem de mercado de cada alimento
+        porcao (sequence): Porção nutricional de cada alimento
+        fallback (array-like, optional): Preço usado quando as unidades não são
+            comparáveis (padrão: NaN)
+
+    Returns:
+        numpy.ndarray: Preço por porção (R$)
+    """
+    precos = np.asarray(market_price, dtype=float) * portion_fractions(market_portion, porcao)
+    if fallback is None:
+        return precos
+    return np.where(np.isfinite(precos), precos, np.asarray(fallback, dtype=float))
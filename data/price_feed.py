@@ -0,0 +1,225 @@
+"""
+Arquivos de preços de mercado com recarga automática
+
+Um arquivo de preços (CSV, JSON Lines ou JSON, como em data.food_loader) traz
+por linha o nome do alimento, o preço de mercado e a embalagem:
+
+    nome;preco_mercado;porcao_mercado
+    Arroz branco cozido;7,49;1 kg
+    Ovo cozido;18,00;20 ovos
+
+Um preço por porção explícito ('preco') prevalece sobre o calculado. A
+aplicação recalcula o preço por porção só das linhas informadas e troca as
+colunas de custo da tabela no lugar (FoodTable.update_costs): o catálogo
+não é reconstruído, e apenas os resultados em cache, que dependem dos
+custos, são descartados.
+
+    feed = PriceFeed(['precos.csv'])
+    feed.refresh()   # aplica se os arquivos mudaram
+    feed.watch()     # verifica os arquivos em segundo plano
+
+Para ver os preços por porção calculados:
+    python -m data.price_feed precos.csv
+"""
+
+import argparse
+import os
+import threading
+
+import numpy as np
+
+from config.constants import PRICE_RELOAD_SECONDS
+from data.food_database import get_food_table, get_name_index, normalize_food_name
+from data.food_loader import canonical_columns, iter_rows, parse_number
+from data.market_units import portion_prices
+
+
+def read_price_files(paths):
+    """Lê os arquivos de preços; arquivos posteriores sobrepõem os anteriores
+
+    Args:
+        paths (list): Arquivos .csv, .jsonl/.ndjson ou .json
+
+    Returns:
+        dict: Nome do alimento -> market_price, market_portion e/ou preco
+    """
+    precos = {}
+    for path in paths:
+        for origem, row in iter_rows(path):
+            row = canonical_columns(row)
+            nome = str(row.get('nome') or '').strip()
+            if not nome:
+                continue
+            entrada = {}
+            for coluna in ('market_price', 'preco'):
+                if row.get(coluna) is not None:
+                    valor = parse_number(row[coluna], coluna, origem)
+                    if valor is not None and valor < 0:
+                        raise ValueError(f"{origem}: '{coluna}' não pode ser negativo")
+                    if valor is not None:
+                        entrada[coluna] = valor
+            embalagem = str(row.get('market_portion') or '').strip()
+            if embalagem:
+                entrada['market_portion'] = embalagem
+            if 'market_price' not in entrada and 'preco' not in entrada:
+                raise ValueError(f"{origem}: informe 'market_price' ou 'preco'")
+            precos.setdefault(nome, {}).update(entrada)
+    return precos
+
+
+def apply_prices(precos):
+    """Aplica preços de mercado à tabela compartilhada, sem reconstruí-la
+
+    Os nomes aceitam as mesmas variações de get_food_by_name (acentos,
+    maiúsculas e apelidos). O preço por porção é recalculado de uma vez para
+    as linhas informadas; quando as unidades não são comparáveis, o preço
+    anterior é mantido.
+
+    Args:
+        precos (dict): Nome -> market_price, market_portion e/ou preco (ver read_price_files)
+
+    Returns:
+        dict: 'atualizados' (alimentos encontrados), 'desconhecidos' (nomes não
+            encontrados), 'alterado' (se algum custo mudou) e 'cost_version'
+    """
+    tabela = get_food_table()
+    indice = get_name_index()
+    market_price = np.array(tabela['market_price'])
+    market_portion = list(tabela['market_portion'])
+    explicito = np.full(len(tabela), np.nan)
+    informadas = np.zeros(len(tabela), dtype=bool)
+    desconhecidos = []
+    for nome, dados in precos.items():
+        linha = tabela.index.get(nome)
+        if linha is None:
+            linha = indice.get(normalize_food_name(nome))
+        if linha is None:
+            desconhecidos.append(nome)
+            continue
+        informadas[linha] = True
+        if dados.get('market_price') is not None:
+            market_price[linha] = dados['market_price']
+        if dados.get('market_portion'):
+            market_portion[linha] = dados['market_portion']
+        if dados.get('preco') is not None:
+            explicito[linha] = dados['preco']
+
+    atuais = tabela['preco']
+    calculados = portion_prices(market_price, market_portion, tabela['porcao'], fallback=atuais)
+    preco = np.where(np.isfinite(explicito), explicito, np.where(informadas, calculados, atuais))
+
+    alterado = not (
+        np.array_equal(preco, atuais)
+        and np.array_equal(market_price, tabela['market_price'])
+        and tuple(market_portion) == tabela['market_portion']
+    )
+    if alterado:
+        tabela.update_costs(preco, market_price, market_portion)
+    return {
+        'atualizados': int(informadas.sum()),
+        'desconhecidos': desconhecidos,
+        'alterado': alterado,
+        'cost_version': tabela.cost_version,
+    }
+
+
+class PriceFeed:
+    """Arquivos de preços aplicados à tabela compartilhada sempre que mudam
+
+    refresh compara tamanho e data de modificação dos arquivos com os da
+    última aplicação; watch faz essa verificação periodicamente em uma thread
+    em segundo plano. Um arquivo ilegível (por exemplo, no meio de uma
+    gravação) mantém os preços anteriores e é lido de novo na próxima
+    verificação.
+
+    A tabela atualizada é a do processo em que o feed roda.
+    """
+
+    def __init__(self, paths):
+        """Inicializa o feed
+
+        Args:
+            paths (list): Arquivos de preços, em ordem de prioridade crescente
+        """
+        self.paths = list(paths)
+        self.last_result = None
+        self.last_error = None
+        self._stamps = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _current_stamps(self):
+        """Tamanho e data de modificação de cada arquivo"""
+        stamps = []
+        for path in self.paths:
+            info = os.stat(path)
+            stamps.append((path, info.st_size, info.st_mtime_ns))
+        return stamps
+
+    def refresh(self, force=False):
+        """Aplica os arquivos se mudaram desde a última aplicação
+
+        Args:
+            force (bool): Aplica mesmo sem mudança nos arquivos
+
+        Returns:
+            dict or None: Resultado de apply_prices, ou None se nada mudou
+        """
+        with self._lock:
+            stamps = self._current_stamps()
+            if not force and stamps == self._stamps:
+                return None
+            resultado = apply_prices(read_price_files(self.paths))
+            self._stamps = stamps
+            self.last_result = resultado
+            self.last_error = None
+            return resultado
+
+    def watch(self, interval=PRICE_RELOAD_SECONDS):
+        """Verifica os arquivos periodicamente em uma thread daemon
+
+        Args:
+            interval (float): Segundos entre verificações
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch_loop, args=(interval,), daemon=True)
+        self._thread.start()
+
+    def _watch_loop(self, interval):
+        """Laço da thread de verificação"""
+        while True:
+            try:
+                self.refresh()
+            except (OSError, ValueError) as e:
+                self.last_error = str(e)
+            if self._stop.wait(interval):
+                return
+
+    def stop(self):
+        """Encerra a verificação periódica"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def main(argv=None):
+    """Aplica arquivos de preços e mostra os preços por porção resultantes"""
+    parser = argparse.ArgumentParser(description="Calcula preços por porção a partir de preços de mercado")
+    parser.add_argument('sources', nargs='+', help="Arquivos de preços CSV, JSON ou JSON Lines")
+    args = parser.parse_args(argv)
+    precos = read_price_files(args.sources)
+    resultado = apply_prices(precos)
+    tabela = get_food_table()
+    for linha, nome in enumerate(tabela.names):
+        print(f"{nome}: R$ {tabela['market_price'][linha]:.2f} por {tabela['market_portion'][linha]} "
+              f"-> R$ {tabela['preco'][linha]:.2f} por {tabela['porcao'][linha]}")
+    for nome in resultado['desconhecidos']:
+        print(f"Alimento desconhecido: {nome}")
+
+
+if __name__ == "__main__":
+    main()
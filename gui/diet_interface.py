@@ -1,10 +1,22 @@
+import queue
+import threading
+import time
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk, messagebox, simpledialog
-from optimization.diet_optimizer import optimize_diet
+from optimization.diet_optimizer import DietOptimizer
+from optimization.nutrition_targets import compute_targets, validation_masks
 from config.constants import *
-from data.food_database import get_food_data, get_food_categories, get_food_by_name
+from data.food_database import get_food_by_name, get_food_table
+from data.food_search import get_search_index
+from gui.virtual_list import VirtualList
 from tkinter.ttk import Notebook
 
+
+class OptimizationCancelled(Exception):
+    """Interrompe um trabalho em segundo plano cancelado pelo usuário"""
+
+
 class DietApp:
     """Classe principal da interface gráfica moderna"""
     
@@ -32,11 +44,19 @@ class DietApp:
         self.setup_dark_theme()
           # Dados da aplicação
         self.excluded_foods = []
-        self.all_foods = get_food_data()
+        # Índice de busca da janela de exclusão, montado em segundo plano
+        threading.Thread(target=get_search_index, daemon=True).start()
         self.use_portion_limits = tk.BooleanVar(value=True)
         self.placeholder_status = {}  # Initialize placeholder tracking
         self.auto_entries = {}  # Store widgets for automatic calculation inputs
         
+        # Otimização em thread de trabalho (a interface continua responsiva)
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.current_job = None
+        # Otimizador da sessão, criado na primeira otimização (ver _job_optimizer)
+        self.optimizer = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         # Configurar grid principal
         self.root.grid_columnconfigure(0, weight=1)
         self.root.grid_rowconfigure(0, weight=1)
@@ -101,12 +121,14 @@ class DietApp:
         params_tab = ttk.Frame(self.notebook, style='Modern.TFrame', padding=20)
         exclusion_tab = ttk.Frame(self.notebook, style='Modern.TFrame', padding=20)
         results_tab = ttk.Frame(self.notebook, style='Modern.TFrame', padding=20)
+        frontier_tab = ttk.Frame(self.notebook, style='Modern.TFrame', padding=20)
         # Armazenar aba de resultados para seleção posterior
         self.results_tab = results_tab
         self.notebook.add(auto_tab, text="🧮 Auto Cálculo")
         self.notebook.add(params_tab, text="📊 Parâmetros")
         self.notebook.add(exclusion_tab, text="🚫 Exclusões")
         self.notebook.add(self.results_tab, text="📋 Resultados")
+        self.notebook.add(frontier_tab, text="📈 Curva de Custo")
         # Construir seções em cada aba
         self.create_auto_calc_section(auto_tab)
         # Parâmetros
@@ -118,6 +140,8 @@ class DietApp:
         self.create_food_exclusion_section(exclusion_tab)
         # Resultados
         self.create_results_section(results_tab)
+        # Curva de custo
+        self.create_frontier_section(frontier_tab)
     
     def create_input_section(self, parent):
         """Cria a seção de entrada de parâmetros"""
@@ -219,7 +243,7 @@ class DietApp:
         # Frame para botões
         button_frame = ttk.Frame(parent, style='Modern.TFrame')
         button_frame.pack(fill='x', pady=(0,20))
-        button_frame.grid_columnconfigure((0,1,2), weight=1)
+        button_frame.grid_columnconfigure((0,1,2,3), weight=1)
         # Botão principal de otimização
         optimize_button = self.create_modern_button(
             button_frame,
@@ -247,6 +271,16 @@ class DietApp:
             self.colors['error']
         )
         clear_button.grid(row=0, column=2, padx=5, sticky="ew")
+        
+        # Botão de cancelamento (ativo apenas durante a otimização)
+        self.cancel_button = self.create_modern_button(
+            button_frame,
+            "⛔ Cancelar",
+            self.cancel_optimization,
+            self.colors['error']
+        )
+        self.cancel_button.grid(row=0, column=3, padx=5, sticky="ew")
+        self.cancel_button.configure(state=tk.DISABLED)
     
     def create_auto_calc_section(self, parent):
         """Cria a seção de cálculo automático de parâmetros baseados em dados pessoais"""
@@ -254,12 +288,12 @@ class DietApp:
         frame.pack(fill='x', pady=(0,20))
         frame.grid_columnconfigure((0,1), weight=1)
         fields = [("Peso (kg):","weight"),("Altura (cm):","height"),("Idade (anos):","age"),("Sexo (Masculino/Feminino):","gender"),("Nível de Atividade:","activity")]
-        activity_options = ['Sedentário','Leve','Moderado','Ativo','Muito Ativo']
+        activity_options = list(ACTIVITY_FACTORS)
         for i,(label_text,key) in enumerate(fields):
             label = ttk.Label(frame, text=label_text, style='Modern.TLabel')
             label.grid(row=i, column=0, sticky='w', padx=(0,20), pady=10)
             if key=='gender':
-                combo = ttk.Combobox(frame, values=['Masculino','Feminino'], state='readonly', style='Modern.TEntry')
+                combo = ttk.Combobox(frame, values=list(SEX_OPTIONS), state='readonly', style='Modern.TEntry')
                 combo.grid(row=i, column=1, sticky='ew', pady=10)
                 self.auto_entries[key] = combo
             elif key=='activity':
@@ -287,18 +321,13 @@ class DietApp:
             if not all([weight, height, age, sex, activity]):
                 messagebox.showerror("Campos Incompletos","Preencha todos os campos de cálculo automático.")
                 return
-            # Níveis de atividade
-            activity_levels = {'Sedentário':1.2,'Leve':1.375,'Moderado':1.55,'Ativo':1.725,'Muito Ativo':1.9}
-            if sex not in ('Masculino','Feminino') or activity not in activity_levels:
+            # Validar e calcular BMR e TDEE (Mifflin-St Jeor)
+            masks = validation_masks(weight, height, age, sex, activity)
+            if masks['sex'] or masks['activity']:
                 messagebox.showerror("Erro de Validação","Sexo ou nível de atividade inválido.")
                 return
-            factor = activity_levels[activity]
-            # Cálculo BMR e TDEE
-            bmr = (10*weight + 6.25*height -5*age +5) if sex=='Masculino' else (10*weight + 6.25*height -5*age -161)
-            tdee = bmr * factor
-            calories = round(tdee)
-            protein = round(1.6 * weight)
-            fat = round((0.25 * calories) / 9)
+            targets = compute_targets(weight, height, age, sex, activity)
+            calories, protein, fat = targets['metac'], targets['metap'], targets['metag']
             # Preencher campos de parâmetros
             self.entries['cal_entry'].delete(0, tk.END)
             self.entries['cal_entry'].insert(0, str(calories))
@@ -360,6 +389,23 @@ class DietApp:
         results_frame.grid_columnconfigure(0, weight=1)
         results_frame.grid_rowconfigure(0, weight=1)
         
+        # Navegação entre dietas alternativas (mesmas metas, custo até ALTERNATIVES_COST_SLACK acima)
+        nav_frame = ttk.Frame(results_frame, style='Modern.TFrame')
+        nav_frame.pack(fill='x', pady=(0, 10))
+        self.prev_alternative_button = self.create_modern_button(
+            nav_frame, "◀ Anterior", lambda: self.select_alternative(-1), self.colors['accent'])
+        self.prev_alternative_button.pack(side='left')
+        self.alternative_label = ttk.Label(nav_frame, text="", style='Modern.TLabel')
+        self.alternative_label.pack(side='left', expand=True)
+        self.next_alternative_button = self.create_modern_button(
+            nav_frame, "Próxima ▶", lambda: self.select_alternative(1), self.colors['accent'])
+        self.next_alternative_button.pack(side='right')
+        self.alternatives = []
+        self.alternative_index = 0
+        # Requisição da dieta exibida enquanto as alternativas ainda não foram calculadas
+        self.alternatives_request = None
+        self.update_alternative_navigation()
+        
         # Área de resultados com scroll
         text_frame = ttk.Frame(results_frame, style='Modern.TFrame')
         text_frame.pack(fill='both', expand=True)
@@ -396,6 +442,154 @@ class DietApp:
         
         # Configurar peso para expansão        self.main_frame.grid_rowconfigure(4, weight=1)
     
+    def create_frontier_section(self, parent):
+        """Cria a seção da curva de custo mínimo em função de uma meta"""
+        frame = ttk.LabelFrame(parent, text="📈 Custo Mínimo x Meta", style='Card.TFrame', padding=20)
+        frame.pack(fill='both', expand=True, pady=(0,20))
+        
+        controls = ttk.Frame(frame, style='Modern.TFrame')
+        controls.pack(fill='x', pady=(0, 10))
+        
+        ttk.Label(controls, text="Meta variada:", style='Modern.TLabel').grid(row=0, column=0, sticky='w', padx=(0, 10))
+        self.frontier_target = ttk.Combobox(controls, values=list(FRONTIER_TARGETS), state='readonly', style='Modern.TEntry')
+        self.frontier_target.current(0)
+        self.frontier_target.grid(row=0, column=1, sticky='ew', padx=(0, 20))
+        
+        self.frontier_range = {}
+        for col, (label_text, key, default) in enumerate([("De:", 'start', "50"), ("Até:", 'end', "200")]):
+            ttk.Label(controls, text=label_text, style='Modern.TLabel').grid(row=0, column=2 + 2 * col, sticky='w', padx=(0, 5))
+            entry = ttk.Entry(controls, style='Modern.TEntry', width=10)
+            entry.insert(0, default)
+            entry.grid(row=0, column=3 + 2 * col, padx=(0, 20))
+            self.frontier_range[key] = entry
+        
+        calc_btn = self.create_modern_button(controls, "📈 Calcular Curva", self.run_frontier, self.colors['accent'])
+        calc_btn.grid(row=0, column=6, sticky='ew')
+        
+        ttk.Label(
+            frame,
+            text="As demais metas vêm da aba Parâmetros; a linha tracejada marca o orçamento.",
+            style='Modern.TLabel'
+        ).pack(anchor='w', pady=(0, 10))
+        
+        self.frontier_canvas = tk.Canvas(frame, bg=self.colors['bg_tertiary'], highlightthickness=0, height=400)
+        self.frontier_canvas.pack(fill='both', expand=True)
+        self.frontier_canvas.bind('<Configure>', lambda e: self.draw_frontier())
+        self.frontier_data = None
+    
+    def run_frontier(self):
+        """Calcula a curva de custo em segundo plano a partir dos parâmetros atuais"""
+        inputs = self.validate_inputs()
+        if not inputs:
+            return
+        try:
+            inicio = float(self.frontier_range['start'].get())
+            fim = float(self.frontier_range['end'].get())
+        except ValueError:
+            messagebox.showerror("❌ Formato Inválido", "O intervalo da curva deve conter números válidos.")
+            return
+        if fim <= inicio:
+            messagebox.showerror("❌ Valor Inválido", "O fim do intervalo deve ser maior que o início.")
+            return
+        
+        if self.current_job is not None:
+            messagebox.showinfo("Otimização em Andamento", "Aguarde a otimização atual terminar ou cancele-a.")
+            return
+        
+        metac, metap, metag, orcamento = inputs
+        meta = FRONTIER_TARGETS[self.frontier_target.get()]
+        metas = {'metac': metac, 'metap': metap, 'metag': metag}
+        metas.pop(meta, None)
+        self.start_job(
+            'frontier',
+            self._frontier_worker,
+            meta, inicio, fim, list(self.excluded_foods), self.use_portion_limits.get(), metas
+        )
+        self.current_job['orcamento'] = orcamento
+    
+    def _frontier_worker(self, meta, inicio, fim, excluded_foods, use_portion_limits, metas, progress, cancel_event):
+        """Calcula a curva de custo fora da thread da interface, publicando cada ponto na fila"""
+        hook = DietApp._phase_hook(progress, cancel_event, pontos=FRONTIER_POINTS)
+        progress.put(('current', "📈 Calculando a curva de custo"))
+        return self._job_optimizer(hook).cost_frontier(
+            meta, inicio, fim, FRONTIER_POINTS,
+            excluded_foods=excluded_foods,
+            use_portion_limits=use_portion_limits,
+            **metas
+        )
+    
+    def show_frontier(self, job):
+        """Desenha a curva de um trabalho concluído"""
+        try:
+            curva = job['future'].result()
+        except Exception as e:
+            messagebox.showerror("❌ Erro na Curva de Custo", f"Falha ao calcular a curva:\n\n{str(e)}")
+            return
+        self.frontier_data = (curva, job['orcamento'])
+        self.draw_frontier()
+        self.result_display.configure(state=tk.NORMAL)
+        self.result_display.delete("1.0", tk.END)
+        self.result_display.insert("1.0", "📈 Curva de custo calculada: veja a aba Curva de Custo.")
+        self.result_display.configure(state=tk.DISABLED)
+    
+    def draw_frontier(self):
+        """Desenha a curva de custo mínimo no canvas"""
+        canvas = self.frontier_canvas
+        canvas.delete('all')
+        if self.frontier_data is None:
+            return
+        curva, orcamento = self.frontier_data
+        pontos = [(v, c) for v, c in zip(curva['valores'], curva['custos']) if c is not None]
+        if not pontos:
+            canvas.create_text(20, 20, anchor='nw', fill=self.colors['error'],
+                               text="Nenhum ponto viável no intervalo escolhido.", font=('Segoe UI', 11))
+            return
+        
+        largura = max(canvas.winfo_width(), 200)
+        altura = max(canvas.winfo_height(), 200)
+        margem = 60
+        x_min, x_max = curva['valores'][0], curva['valores'][-1]
+        y_max = max(max(c for _, c in pontos), orcamento) * 1.1
+        
+        def to_canvas(x, y):
+            cx = margem + (x - x_min) / (x_max - x_min) * (largura - 2 * margem)
+            cy = altura - margem - y / y_max * (altura - 2 * margem)
+            return cx, cy
+        
+        # Eixos e rótulos
+        texto = self.colors['text_primary']
+        canvas.create_line(margem, altura - margem, largura - margem, altura - margem, fill=texto)
+        canvas.create_line(margem, margem, margem, altura - margem, fill=texto)
+        for frac in (0, 0.5, 1):
+            x = x_min + frac * (x_max - x_min)
+            cx, _ = to_canvas(x, 0)
+            canvas.create_text(cx, altura - margem + 15, text=f"{x:.0f}", fill=texto)
+            y = frac * y_max
+            _, cy = to_canvas(x_min, y)
+            canvas.create_text(margem - 10, cy, text=f"R$ {y:.0f}", anchor='e', fill=texto)
+        canvas.create_text(largura / 2, altura - 20, text=self.frontier_target.get(), fill=texto)
+        
+        # Orçamento
+        _, cy = to_canvas(x_min, orcamento)
+        canvas.create_line(margem, cy, largura - margem, cy, fill=self.colors['warning'], dash=(4, 4))
+        
+        # Curva, interrompida nos trechos inviáveis
+        trecho = []
+        for valor, custo in zip(curva['valores'], curva['custos']):
+            if custo is None:
+                if len(trecho) > 1:
+                    canvas.create_line(*trecho, fill=self.colors['accent'], width=2)
+                trecho = []
+                continue
+            trecho.extend(to_canvas(valor, custo))
+        if len(trecho) > 1:
+            canvas.create_line(*trecho, fill=self.colors['accent'], width=2)
+        
+        canvas.create_text(
+            largura - margem, margem - 20, anchor='e', fill=self.colors['text_secondary'],
+            text=f"{len(curva['valores'])} pontos · {curva['resolucoes']} resoluções do solver"
+        )
+    
     def clear_placeholder(self, event, placeholder, entry_name):
         """Remove placeholder quando o campo recebe foco"""
         if event.widget.get() == placeholder:
@@ -413,34 +607,55 @@ class DietApp:
             self.placeholder_status[entry_name] = True
     
     def open_food_selector(self):
-        """Abre janela moderna para seleção de alimentos"""
+        """Abre janela moderna para seleção de alimentos, com busca incremental"""
+        tabela = get_food_table()
+        indice = get_search_index()
+        nomes = tabela.names
+        categorias = tabela['categoria']
         # Criar janela de seleção de alimentos para exclusão
         top = tk.Toplevel(self.root)
         top.title("Selecionar Alimentos para Excluir")
         top.geometry("400x500")
-        # Container de lista
+        # Busca por nome ou categoria (sem acentos)
+        search_frame = ttk.Frame(top, style='Modern.TFrame', padding=(10, 10, 10, 0))
+        search_frame.pack(fill='x')
+        ttk.Label(search_frame, text="🔎 Buscar:", style='Modern.TLabel').pack(side='left', padx=(0, 5))
+        search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=search_var, style='Modern.TEntry')
+        search_entry.pack(side='left', fill='x', expand=True)
+        count_label = ttk.Label(top, text="", style='Modern.TLabel', padding=(10, 5, 10, 0))
+        count_label.pack(fill='x')
+        # Lista virtualizada: só as linhas visíveis são criadas
         frame = ttk.Frame(top, style='Modern.TFrame', padding=10)
         frame.pack(fill='both', expand=True)
-        listbox = tk.Listbox(
+        food_list = VirtualList(
             frame,
-            selectmode='multiple',
-            bg=self.colors['bg_tertiary'],
-            fg=self.colors['text_primary'],
-            selectbackground=self.colors['accent'],
-            activestyle='none'
+            self.colors,
+            label=lambda linha: f"{nomes[linha]}  ({categorias[linha]})",
+            key=lambda linha: nomes[linha]
         )
-        listbox.pack(side='left', fill='both', expand=True)
-        scrollbar = ttk.Scrollbar(frame, orient='vertical', command=listbox.yview)
-        scrollbar.pack(side='right', fill='y')
-        listbox.configure(yscrollcommand=scrollbar.set)
-        # Preencher lista com alimentos
-        for idx, food in enumerate(self.all_foods):
-            listbox.insert('end', food['nome'])
-            if food['nome'] in self.excluded_foods:
-                listbox.selection_set(idx)
+        food_list.frame.pack(fill='both', expand=True)
+        food_list.selected = set(self.excluded_foods)
+        
+        busca = {'truncado': False}
+        
+        def update_count():
+            total = f"{len(food_list.items)}+" if busca['truncado'] else str(len(food_list.items))
+            count_label.configure(text=f"{total} alimentos | {len(food_list.selected)} selecionados")
+        
+        def search(*_):
+            linhas, busca['truncado'] = indice.search(search_var.get())
+            food_list.set_items(linhas)
+            update_count()
+        
+        food_list.on_change = update_count
+        search_var.trace_add('write', search)
+        search()
+        search_entry.focus_set()
         # Função de confirmação
         def confirm():
-            selected = [listbox.get(i) for i in listbox.curselection()]
+            # Manter a ordem da tabela
+            selected = sorted((nome for nome in food_list.selected if nome in tabela.index), key=tabela.index.get)
             self.excluded_foods = selected
             # Atualizar display de exclusões
             self.excluded_display.configure(state=tk.NORMAL)
@@ -568,44 +783,282 @@ class DietApp:
             return None
     
     def run_optimization(self):
-        """Executa a otimização e exibe os resultados"""
+        """Inicia a otimização em uma thread de trabalho e acompanha o progresso"""
+        if self.current_job is not None:
+            messagebox.showinfo("Otimização em Andamento", "Aguarde a otimização atual terminar ou cancele-a.")
+            return
         try:
             # Validar e obter entradas
             inputs = self.validate_inputs()
             if not inputs:
                 return
             
-            # Mostrar mensagem de processamento
-            self.result_display.configure(state=tk.NORMAL)
-            self.result_display.delete("1.0", tk.END)
-            
-            loading_text = """🚀 INICIANDO OTIMIZAÇÃO...
-
-🔄 Processando parâmetros nutricionais...
-🧮 Executando algoritmo de programação linear...
-📊 Analisando combinações de alimentos...
-⚖️ Aplicando restrições de porção...
-💰 Calculando custo mínimo...
-
-⏳ Por favor, aguarde alguns segundos..."""
-            
-            self.result_display.insert("1.0", loading_text)
-            self.result_display.configure(state=tk.DISABLED)
-            self.root.update()
-            
-            # Executar otimização
-            resultado = optimize_diet(*inputs, excluded_foods=self.excluded_foods, use_portion_limits=self.use_portion_limits.get())
-            self.show_results(resultado)
-            # Exibir popup de conclusão e redirecionar para guia de resultados
-            messagebox.showinfo("Otimização Concluída", "A otimização foi concluída com sucesso! Você será redirecionado para a guia de resultados.")
-            # Selecionar a guia de resultados
-            self.notebook.select(self.results_tab)
+            self.alternatives = []
+            self.alternative_index = 0
+            self.alternatives_request = None
+            self.update_alternative_navigation()
+            self.start_job(
+                'optimization',
+                self._optimization_worker,
+                inputs,
+                list(self.excluded_foods),
+                self.use_portion_limits.get()
+            )
             
         except Exception as e:
             messagebox.showerror("❌ Erro na Otimização", 
                                f"Ocorreu um erro durante a otimização:\n\n{str(e)}\n\n"
                                f"💡 Verifique se todos os valores estão corretos e tente novamente.")
     
+    def start_job(self, tipo, worker, *args):
+        """Envia um trabalho à thread de trabalho e passa a acompanhá-lo
+        
+        Um trabalho por vez: current_job guarda a fila de progresso e o evento
+        de cancelamento, usados pelo botão Cancelar qualquer que seja o tipo.
+        
+        Args:
+            tipo (str): 'optimization', 'alternatives' ou 'frontier' (define como o
+                resultado é exibido)
+            worker (callable): Função worker(*args, progress, cancel_event)
+            *args: Argumentos do trabalho
+        """
+        progress = queue.Queue()
+        cancel_event = threading.Event()
+        self.current_job = {
+            'type': tipo,
+            'args': args,
+            'future': self.executor.submit(worker, *args, progress, cancel_event),
+            'progress': progress,
+            'cancel': cancel_event,
+            'phases': [],
+            'current': None,
+            'start': time.perf_counter()
+        }
+        self.cancel_button.configure(state=tk.NORMAL)
+        self.render_progress()
+        self.root.after(OPTIMIZATION_POLL_MS, self.poll_optimization, self.current_job)
+    
+    @staticmethod
+    def _phase_hook(progress, cancel_event, pontos=None):
+        """Hook de fase dos trabalhos em segundo plano
+        
+        É chamado ao fim de cada fase medida pelo otimizador, ou seja, entre
+        uma solução e a próxima: se o trabalho foi cancelado, lança
+        OptimizationCancelled e interrompe-o ali, liberando a thread de
+        trabalho; senão publica o progresso. Com pontos, só os pontos da curva
+        de custo são contados, como etapa em andamento.
+        
+        Mensagens: ('current', texto) para a etapa em andamento e ('done', texto)
+        para cada fase concluída.
+        """
+        concluidos = []
+        
+        def on_phase(fase, segundos):
+            if cancel_event.is_set():
+                raise OptimizationCancelled()
+            if pontos is None:
+                label = TIMING_PHASE_LABELS.get(fase, fase)
+                progress.put(('done', f"{label} ({segundos * 1000:.1f} ms)"))
+            elif fase == 'frontier_point':
+                concluidos.append(fase)
+                progress.put(('current', f"📈 Calculando a curva de custo: ponto {len(concluidos)} de {pontos}"))
+        
+        return on_phase
+    
+    def _job_optimizer(self, hook):
+        """Otimizador da sessão, com o hook de fase do trabalho atual
+        
+        Criado na thread de trabalho na primeira chamada e mantido entre os
+        cliques (modelo compilado, base do warm start e cache de resultados);
+        é recriado só se a tabela de alimentos for substituída. Os trabalhos
+        rodam um por vez, então trocar o hook não afeta outro trabalho.
+        """
+        if self.optimizer is None or self.optimizer.table is not get_food_table():
+            self.optimizer = DietOptimizer()
+        self.optimizer.timing_hooks = (hook,)
+        return self.optimizer
+    
+    def _optimization_worker(self, inputs, excluded_foods, use_portion_limits, progress, cancel_event):
+        """Executa a otimização fora da thread da interface, publicando as fases na fila
+        
+        Só a dieta ótima é resolvida; as alternativas ficam para quando o
+        usuário pedir a próxima (ver select_alternative). O cancelamento é
+        verificado antes de começar e ao fim de cada fase (ver _phase_hook).
+        """
+        progress.put(('current', "🔄 Processando parâmetros nutricionais"))
+        if cancel_event.is_set():
+            return None
+        
+        progress.put(('current', "🧮 Executando algoritmo de programação linear"))
+        optimizer = self._job_optimizer(DietApp._phase_hook(progress, cancel_event))
+        return optimizer.optimize_diet(*inputs, excluded_foods=excluded_foods, use_portion_limits=use_portion_limits)
+    
+    def _alternatives_worker(self, inputs, excluded_foods, use_portion_limits, progress, cancel_event):
+        """Calcula as dietas alternativas da dieta exibida fora da thread da interface
+        
+        A dieta ótima vem do cache de resultados do otimizador da sessão; só os
+        LPs das alternativas são resolvidos.
+        """
+        progress.put(('current', "🔀 Buscando dietas alternativas"))
+        optimizer = self._job_optimizer(DietApp._phase_hook(progress, cancel_event))
+        return optimizer.alternatives(*inputs, excluded_foods=excluded_foods, use_portion_limits=use_portion_limits)
+    
+    def poll_optimization(self, job):
+        """Consulta a thread de trabalho via root.after, sem bloquear o loop de eventos"""
+        # Trabalho cancelado ou substituído: encerrar esta consulta
+        if job is not self.current_job:
+            return
+        
+        try:
+            while True:
+                tipo, texto = job['progress'].get_nowait()
+                if tipo == 'done':
+                    job['phases'].append(texto)
+                else:
+                    job['current'] = texto
+        except queue.Empty:
+            pass
+        
+        if not job['future'].done():
+            self.render_progress()
+            self.root.after(OPTIMIZATION_POLL_MS, self.poll_optimization, self.current_job)
+            return
+        
+        self.finish_job()
+        if job['type'] == 'frontier':
+            self.show_frontier(job)
+            return
+        if job['type'] == 'alternatives':
+            self.show_alternatives(job)
+            return
+        try:
+            resultado = job['future'].result()
+        except Exception as e:
+            messagebox.showerror("❌ Erro na Otimização", 
+                               f"Ocorreu um erro durante a otimização:\n\n{str(e)}\n\n"
+                               f"💡 Verifique se todos os valores estão corretos e tente novamente.")
+            return
+        
+        self.alternatives = [resultado]
+        self.alternative_index = 0
+        if resultado['status'] == 'Optimal':
+            self.alternatives_request = job['args']
+        self.update_alternative_navigation()
+        self.show_results(resultado)
+        # Exibir popup de conclusão e redirecionar para guia de resultados
+        messagebox.showinfo("Otimização Concluída", "A otimização foi concluída com sucesso! Você será redirecionado para a guia de resultados.")
+        # Selecionar a guia de resultados
+        self.notebook.select(self.results_tab)
+    
+    def render_progress(self):
+        """Mostra as fases concluídas e o tempo decorrido na área de resultados"""
+        job = self.current_job
+        elapsed = time.perf_counter() - job['start']
+        # Redesenhar só quando muda a fase ou o décimo de segundo exibido
+        estado = (len(job['phases']), job['current'], round(elapsed, 1))
+        if job.get('rendered') == estado:
+            return
+        job['rendered'] = estado
+        titulos = {'frontier': "📈 CALCULANDO A CURVA...", 'alternatives': "🔀 BUSCANDO ALTERNATIVAS..."}
+        text = titulos.get(job['type'], "🚀 OTIMIZANDO...") + "\n\n"
+        if job['current']:
+            text += f"⏳ {job['current']}...\n"
+        for phase in job['phases']:
+            text += f"✅ {phase}\n"
+        text += f"\n⏱️ Tempo decorrido: {elapsed:.1f} s\n"
+        text += "⛔ Use 'Cancelar' para interromper."
+        
+        self.result_display.configure(state=tk.NORMAL)
+        self.result_display.delete("1.0", tk.END)
+        self.result_display.insert("1.0", text)
+        self.result_display.configure(state=tk.DISABLED)
+    
+    def cancel_optimization(self):
+        """Cancela o trabalho em andamento (otimização ou curva) e descarta seu resultado
+        
+        Um trabalho ainda na fila não chega a rodar; um em execução para ao fim
+        da fase atual (ver _phase_hook), liberando a thread de trabalho.
+        """
+        job = self.current_job
+        if job is None:
+            return
+        job['cancel'].set()
+        job['future'].cancel()
+        self.finish_job()
+        if job['type'] == 'alternatives':
+            # A dieta exibida continua válida; as alternativas podem ser pedidas de novo
+            self.show_results(self.alternatives[self.alternative_index])
+            return
+        
+        titulo = "Cálculo da curva cancelado" if job['type'] == 'frontier' else "Otimização cancelada"
+        self.result_display.configure(state=tk.NORMAL)
+        self.result_display.delete("1.0", tk.END)
+        self.result_display.insert("1.0", f"⛔ {titulo}.\n\n💡 Ajuste os parâmetros e tente novamente.")
+        self.result_display.configure(state=tk.DISABLED)
+    
+    def finish_job(self):
+        """Libera a interface para uma nova otimização"""
+        self.current_job = None
+        self.cancel_button.configure(state=tk.DISABLED)
+    
+    def on_close(self):
+        """Cancela trabalhos pendentes e fecha a janela"""
+        if self.current_job is not None:
+            self.current_job['cancel'].set()
+        self.executor.shutdown(wait=False)
+        self.root.destroy()
+    
+    def select_alternative(self, passo):
+        """Exibe a dieta alternativa anterior (-1) ou a próxima (+1)
+        
+        Na primeira vez que se pede a próxima após a dieta ótima, as
+        alternativas são calculadas em segundo plano (ver show_alternatives).
+        """
+        indice = self.alternative_index + passo
+        if indice == len(self.alternatives) and self.alternatives_request is not None:
+            if self.current_job is not None:
+                messagebox.showinfo("Otimização em Andamento", "Aguarde a otimização atual terminar ou cancele-a.")
+                return
+            self.start_job('alternatives', self._alternatives_worker, *self.alternatives_request)
+            return
+        if not 0 <= indice < len(self.alternatives):
+            return
+        self.alternative_index = indice
+        self.update_alternative_navigation()
+        self.show_results(self.alternatives[indice])
+    
+    def show_alternatives(self, job):
+        """Exibe a primeira alternativa de um trabalho de alternativas concluído"""
+        try:
+            planos = job['future'].result()
+        except Exception as e:
+            messagebox.showerror("❌ Erro nas Alternativas", f"Falha ao calcular as alternativas:\n\n{str(e)}")
+            self.show_results(self.alternatives[self.alternative_index])
+            return
+        self.alternatives = planos
+        self.alternatives_request = None
+        if len(planos) > 1:
+            self.alternative_index = 1
+        else:
+            messagebox.showinfo("Dietas Alternativas", "Nenhuma dieta diferente dentro da tolerância de custo.")
+        self.update_alternative_navigation()
+        self.show_results(planos[self.alternative_index])
+    
+    def update_alternative_navigation(self):
+        """Atualiza o rótulo e os botões de navegação entre alternativas"""
+        total = len(self.alternatives)
+        pendentes = self.alternatives_request is not None
+        if total <= 1:
+            self.alternative_label.configure(text="")
+        else:
+            plano = self.alternatives[self.alternative_index]
+            acrescimo = (plano.get('custo_relativo', 1.0) - 1) * 100
+            extra = "ótima" if self.alternative_index == 0 else f"+{acrescimo:.1f}% de custo"
+            self.alternative_label.configure(text=f"Alternativa {self.alternative_index + 1}/{total} ({extra})")
+        self.prev_alternative_button.configure(state=tk.NORMAL if self.alternative_index > 0 else tk.DISABLED)
+        proxima = self.alternative_index < total - 1 or pendentes
+        self.next_alternative_button.configure(state=tk.NORMAL if proxima else tk.DISABLED)
+    
     def show_results(self, resultado):
         """Exibe os resultados da otimização"""
         self.result_display.configure(state=tk.NORMAL)
@@ -632,6 +1085,18 @@ class DietApp:
         text += f"│ 🧈 Gordura total:   {resultado['detalhes']['gordura_total']:>15.1f} g             │\n"
         text += f"│ 💰 Custo total:     R$ {resultado['custo_total']:>12.2f}                 │\n"
         text += "└─────────────────────────────────────────────────────────────────┘\n\n"
+
+        # Demais nutrientes de NUTRIENTS que a tabela de alimentos informa
+        outros = [
+            coluna for coluna in list(NUTRIENTS)[4:]
+            if f'{coluna}_total' in resultado['detalhes']
+        ]
+        if outros:
+            text += "🧪 OUTROS NUTRIENTES:\n"
+            for coluna in outros:
+                nutriente = NUTRIENTS[coluna]
+                text += f"   • {nutriente['nome']}: {resultado['detalhes'][f'{coluna}_total']:.1f} {nutriente['unidade']}\n"
+            text += "\n"
           # Lista de alimentos com preço e porção
         text += "🥘 ALIMENTOS SELECIONADOS:\n\n"
         for alimento in resultado['alimentos']:
@@ -653,11 +1118,20 @@ class DietApp:
         text += f"🔍 Status: {resultado['status']}\n"
         text += f"📝 Detalhes: Não foi possível encontrar uma combinação de alimentos que atenda a todos os critérios.\n\n"
         
-        text += "💡 SUGESTÕES:\n"
-        text += "• 📈 Aumente o orçamento máximo\n"
-        text += "• 📉 Reduza os valores mínimos de calorias ou proteína\n"
-        text += "• 📊 Aumente o limite máximo de gordura\n"
-        text += "• 🔄 Tente diferentes combinações de parâmetros\n"
+        diagnostico = resultado.get('diagnostico')
+        if diagnostico and diagnostico['relaxacoes']:
+            # Menor relaxação encontrada pelo LP elástico
+            text += "💡 MENOR AJUSTE PARA ENCONTRAR UMA SOLUÇÃO:\n"
+            for relaxacao in diagnostico['relaxacoes']:
+                text += f"• {relaxacao['mensagem']}\n"
+            if diagnostico['custo_estimado'] is not None:
+                text += f"\n💰 Custo estimado com os ajustes: R$ {diagnostico['custo_estimado']:.2f}\n"
+        else:
+            text += "💡 SUGESTÕES:\n"
+            text += "• 📈 Aumente o orçamento máximo\n"
+            text += "• 📉 Reduza os valores mínimos de calorias ou proteína\n"
+            text += "• 📊 Aumente o limite máximo de gordura\n"
+            text += "• 🔄 Tente diferentes combinações de parâmetros\n"
         
         self.result_display.insert("1.0", text)
     
@@ -0,0 +1,116 @@
+"""
+Lista virtualizada: só as linhas visíveis de uma sequência grande viram itens do Listbox
+"""
+
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import ttk
+
+
+class VirtualList:
+    """Lista de seleção múltipla sobre uma sequência de qualquer tamanho
+
+    O Listbox contém apenas as linhas que cabem na janela; a barra de rolagem
+    e a roda do mouse mudam o deslocamento e as linhas são redesenhadas. A
+    seleção fica em um conjunto de chaves, então sobrevive a novas buscas e
+    à rolagem.
+    """
+
+    def __init__(self, parent, colors, label, key):
+        """Cria a lista
+
+        Args:
+            parent (tk.Widget): Contêiner
+            colors (dict): Cores da interface (DietApp.colors)
+            label (callable): Item -> texto exibido
+            key (callable): Item -> chave guardada na seleção
+        """
+        self.label = label
+        self.key = key
+        self.items = []
+        self.offset = 0
+        self.selected = set()
+        self.on_change = None
+
+        self.frame = ttk.Frame(parent, style='Modern.TFrame')
+        self.listbox = tk.Listbox(
+            self.frame,
+            selectmode='multiple',
+            bg=colors['bg_tertiary'],
+            fg=colors['text_primary'],
+            selectbackground=colors['accent'],
+            activestyle='none',
+            exportselection=False
+        )
+        self.listbox.pack(side='left', fill='both', expand=True)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient='vertical', command=self.yview)
+        self.scrollbar.pack(side='right', fill='y')
+        self._row_height = tkfont.Font(font=self.listbox.cget('font')).metrics('linespace') + 1
+
+        # O clique alterna a seleção do item; o comportamento padrão do Listbox é suprimido
+        self.listbox.bind('<Button-1>', self._toggle)
+        self.listbox.bind('<B1-Motion>', lambda event: 'break')
+        self.listbox.bind('<Configure>', lambda event: self.render())
+        self.listbox.bind('<MouseWheel>', lambda event: self._scroll(-1 if event.delta > 0 else 1))
+        self.listbox.bind('<Button-4>', lambda event: self._scroll(-1))
+        self.listbox.bind('<Button-5>', lambda event: self._scroll(1))
+
+    def visible_rows(self):
+        """Quantidade de linhas que cabem no Listbox"""
+        return max(1, self.listbox.winfo_height() // self._row_height)
+
+    def set_items(self, items):
+        """Substitui a sequência exibida e volta ao topo"""
+        self.items = items
+        self.offset = 0
+        self.render()
+
+    def _max_offset(self):
+        return max(0, len(self.items) - self.visible_rows())
+
+    def render(self):
+        """Materializa só as linhas visíveis a partir do deslocamento atual"""
+        linhas = self.visible_rows()
+        self.offset = min(self.offset, self._max_offset())
+        visiveis = self.items[self.offset:self.offset + linhas]
+        self.listbox.delete(0, 'end')
+        if visiveis:
+            self.listbox.insert('end', *(self.label(item) for item in visiveis))
+        for posicao, item in enumerate(visiveis):
+            if self.key(item) in self.selected:
+                self.listbox.selection_set(posicao)
+        total = len(self.items)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + linhas) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def yview(self, *args):
+        """Comando da barra de rolagem ('moveto', fração) ou ('scroll', n, 'units'/'pages')"""
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * len(self.items))
+        elif args[0] == 'scroll':
+            passo = self.visible_rows() if args[2] == 'pages' else 1
+            self.offset += int(args[1]) * passo
+        self.offset = max(0, min(self.offset, self._max_offset()))
+        self.render()
+
+    def _scroll(self, linhas):
+        """Rolagem pela roda do mouse"""
+        self.yview('scroll', linhas * 3, 'units')
+        return 'break'
+
+    def _toggle(self, event):
+        """Alterna a seleção do item clicado"""
+        posicao = self.listbox.nearest(event.y)
+        indice = self.offset + posicao
+        if 0 <= posicao and indice < len(self.items):
+            chave = self.key(self.items[indice])
+            if chave in self.selected:
+                self.selected.discard(chave)
+            else:
+                self.selected.add(chave)
+            self.render()
+            if self.on_change is not None:
+                self.on_change()
+        return 'break'
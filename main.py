@@ -2,13 +2,16 @@
 Otimizador de Dieta - Aplicação Principal
 
 Para executar: python main.py
+
+A interface gráfica (tkinter) só é importada ao executar a aplicação, então
+importar este módulo não carrega a GUI.
 """
 
-import tkinter as tk
-from gui.diet_interface import DietApp
 
 def main():
     """Função principal da aplicação"""
+    from gui.diet_interface import DietApp
+
     # Inicializar e executar aplicação
     app = DietApp()
     app.run()
@@ -1,3 +1,30 @@
 """
 Pacote de otimização para o otimizador de dieta
+
+Ponto de entrada sem interface gráfica:
+
+    from optimization import optimize_diet
+
+Os nomes abaixo são carregados sob demanda, então importar o pacote não
+importa o otimizador (nem NumPy, SciPy ou PuLP) até o primeiro uso.
 """
+
+import importlib
+
+# Nome exportado -> módulo que o define
+_EXPORTS = {
+    'DietOptimizer': 'optimization.diet_optimizer',
+    'optimize_diet': 'optimization.diet_optimizer',
+    'optimize_many': 'optimization.diet_optimizer',
+    'get_optimizer': 'optimization.diet_optimizer',
+    'compute_targets': 'optimization.nutrition_targets',
+    'compute_targets_array': 'optimization.nutrition_targets',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name]), name)
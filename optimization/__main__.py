@@ -0,0 +1,8 @@
+"""
+Otimização em lote: python -m optimization perfis.jsonl -o planos.jsonl
+"""
+
+from optimization.batch_cli import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Dietas alternativas quase ótimas por cortes de diversidade
+
+Depois da dieta ótima (custo z*), cada nova alternativa é o LP
+
+    minimizar    Σ_j u_j·w_j·x_j + ε·c·x
+    sujeito a    A·x <= b,  c·x <= (1 + folga)·z*,  lb <= x <= ub
+
+em que u_j conta em quantos planos anteriores o alimento j apareceu acima do
+seu mínimo de porções e w_j é a fração das metas que uma porção de j supre.
+Cada plano evita, tanto quanto o custo permite, os alimentos dos planos
+anteriores. Planos com o mesmo conjunto de alimentos de um anterior são
+descartados.
+"""
+
+import numpy as np
+
+from config.constants import NUMERICAL_TOLERANCE
+from optimization.instrumentation import NULL_TIMER
+from optimization.lp_backends import STATUS_OPTIMAL
+
+# Quantidade a partir da qual o alimento conta como presente no plano
+# (mesmo limiar da lista 'alimentos' do resultado)
+MIN_SERVING = 0.01
+
+# Peso do custo no LP das alternativas: só desempata planos igualmente diversos
+COST_WEIGHT = 1e-6
+
+
+def diverse_plans(c, A, b, lb, ub, x_otimo, k, cost_slack, backend, max_attempts=None, timer=NULL_TIMER):
+    """Gera até k planos distintos com custo até (1 + cost_slack) vezes o ótimo
+
+    Args:
+        c, A, b, lb, ub: Problema na forma matricial
+        x_otimo (numpy.ndarray): Solução ótima (primeiro plano)
+        k (int): Número de planos desejado, incluindo o ótimo
+        cost_slack (float): Tolerância relativa de custo (0.1 = até 10% acima do ótimo)
+        backend (object): Backend com método solve(c, A_ub, b_ub, lb, ub)
+        max_attempts (int, optional): Máximo de soluções do LP (padrão: 3·k)
+        timer (PhaseTimer, optional): Medidor; cada LP é uma fase 'alternatives'
+
+    Returns:
+        tuple: (planos, esgotado), com planos a lista de vetores x (o ótimo primeiro) e
+            esgotado True se as tentativas acabaram antes de k planos distintos
+    """
+    custo_otimo = float(c @ x_otimo)
+    limite = (1 + cost_slack) * custo_otimo + NUMERICAL_TOLERANCE
+    A_alt = np.vstack([A, c])
+    b_alt = np.append(b, limite)
+
+    # Fração das metas suprida por uma porção de cada alimento
+    contribuicao = np.abs(A).T @ (1 / np.maximum(np.abs(b), 1))
+    contribuicao = np.maximum(contribuicao, NUMERICAL_TOLERANCE)
+
+    # Alimentos "escolhidos": acima do mínimo de porções (o mínimo vale para todo plano)
+    usados = x_otimo - lb > MIN_SERVING
+    planos = [x_otimo]
+    suportes = {frozenset(np.flatnonzero(usados).tolist())}
+    usos = usados.astype(float)
+    tentativas = max_attempts or 3 * k
+    while len(planos) < k and tentativas > 0:
+        tentativas -= 1
+        objetivo = usos * contribuicao + COST_WEIGHT * c
+        with timer.phase('alternatives'):
+            solucao = backend.solve(objetivo, A_alt, b_alt, lb, ub)
+        if solucao['status'] != STATUS_OPTIMAL:
+            return planos, True
+        x = solucao['x']
+        usados = x - lb > MIN_SERVING
+        suporte = frozenset(np.flatnonzero(usados).tolist())
+        if suporte not in suportes:
+            suportes.add(suporte)
+            planos.append(x)
+        elif not suporte:
+            # Nenhum alimento acima do mínimo: a penalidade não muda e o LP repetiria o plano
+            break
+        # Repetido ou não, os alimentos usados ficam mais penalizados na próxima tentativa
+        usos += usados
+    return planos, len(planos) < k
@@ -0,0 +1,246 @@
+"""
+Otimização em lote pela linha de comando: perfis em JSON Lines na entrada,
+planos em JSON Lines na saída
+
+Para executar:
+    python -m optimization perfis.jsonl -o planos.jsonl --workers 4
+    python -m optimization perfis.jsonl -o planos.jsonl --resume
+
+Cada linha de entrada é um perfil com metas explícitas (metac, metap, metag,
+metacarb) ou dados pessoais (weight, height, age, sex, activity), mais
+orcamento e, opcionalmente, id, excluded_foods, use_portion_limits,
+portion_mode e nutrient_targets ({"sodio": [null, 1500]}). Metas explícitas prevalecem sobre as calculadas.
+
+Cada linha de saída traz o número da linha de entrada ('linha', a partir de
+0), o id do perfil, as metas usadas e o resultado de optimize_diet, ou 'erro'
+quando a linha é inválida. A entrada é lida e a saída gravada em fluxo, com
+um número limitado de blocos em andamento: a memória não cresce com o
+tamanho do arquivo. As linhas de saída seguem a ordem da entrada, então
+--resume retoma a partir da última linha gravada.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from config.constants import CLI_CHUNK_SIZE, CLI_WORKERS, PORTION_MODES
+from data.food_database import get_food_table
+from optimization.diet_model import resolve_nutrient_targets
+from optimization.diet_optimizer import get_optimizer
+from optimization.nutrition_targets import compute_targets
+
+PERSONAL_FIELDS = ('weight', 'height', 'age', 'sex', 'activity')
+TARGET_FIELDS = ('metac', 'metap', 'metag', 'metacarb')
+OPTION_FIELDS = ('orcamento', 'excluded_foods', 'use_portion_limits', 'portion_mode', 'nutrient_targets')
+
+
+def profile_arguments(dados):
+    """Converte um perfil da entrada nos argumentos de optimize_diet
+
+    Args:
+        dados (dict): Perfil decodificado de uma linha JSON
+
+    Returns:
+        dict: Argumentos de optimize_diet
+    """
+    if not isinstance(dados, dict):
+        raise ValueError("O perfil deve ser um objeto JSON")
+    desconhecidos = set(dados) - {'id'} - set(PERSONAL_FIELDS) - set(TARGET_FIELDS) - set(OPTION_FIELDS)
+    if desconhecidos:
+        raise ValueError(f"Campos desconhecidos: {', '.join(sorted(desconhecidos))}")
+
+    argumentos = {}
+    if any(dados.get(campo) is not None for campo in PERSONAL_FIELDS):
+        faltando = [campo for campo in PERSONAL_FIELDS if dados.get(campo) is None]
+        if faltando:
+            raise ValueError(f"Dados pessoais incompletos: {', '.join(faltando)}")
+        argumentos.update(compute_targets(
+            float(dados['weight']), float(dados['height']), float(dados['age']), dados['sex'], dados['activity']
+        ))
+    for campo in TARGET_FIELDS + ('orcamento',):
+        valor = dados.get(campo)
+        if valor is None:
+            continue
+        if isinstance(valor, bool) or not isinstance(valor, (int, float)) or valor < 0:
+            raise ValueError(f"{campo} deve ser um número não negativo")
+        argumentos[campo] = float(valor)
+    faltando = [campo for campo in ('metac', 'metap', 'metag', 'orcamento') if campo not in argumentos]
+    if faltando:
+        raise ValueError(f"Campos obrigatórios ausentes: {', '.join(faltando)}")
+
+    excluidos = dados.get('excluded_foods')
+    if excluidos is not None:
+        if not isinstance(excluidos, list) or not all(isinstance(nome, str) for nome in excluidos):
+            raise ValueError("excluded_foods deve ser uma lista de nomes")
+        argumentos['excluded_foods'] = excluidos
+    if dados.get('use_portion_limits') is not None:
+        if not isinstance(dados['use_portion_limits'], bool):
+            raise ValueError("use_portion_limits deve ser true ou false")
+        argumentos['use_portion_limits'] = dados['use_portion_limits']
+    if dados.get('portion_mode') is not None:
+        if dados['portion_mode'] not in PORTION_MODES:
+            raise ValueError(f"portion_mode deve ser um de: {', '.join(PORTION_MODES)}")
+        argumentos['portion_mode'] = dados['portion_mode']
+    if dados.get('nutrient_targets') is not None:
+        resolve_nutrient_targets(get_food_table(), dados['nutrient_targets'])
+        argumentos['nutrient_targets'] = dados['nutrient_targets']
+    return argumentos
+
+
+def solve_line(linha, texto):
+    """Resolve uma linha de entrada
+
+    Args:
+        linha (int): Número da linha na entrada (a partir de 0)
+        texto (str): Conteúdo da linha
+
+    Returns:
+        dict: Registro de saída (resultado ou erro)
+    """
+    registro = {'linha': linha}
+    try:
+        dados = json.loads(texto)
+        if isinstance(dados, dict) and 'id' in dados:
+            registro['id'] = dados['id']
+        argumentos = profile_arguments(dados)
+    except (TypeError, ValueError) as e:
+        registro['erro'] = str(e)
+        return registro
+    registro['metas'] = {campo: argumentos[campo] for campo in TARGET_FIELDS + ('orcamento',) if campo in argumentos}
+    registro['resultado'] = get_optimizer().optimize_diet(**argumentos)
+    return registro
+
+
+def _solve_chunk(itens):
+    """Resolve um bloco de linhas e devolve as linhas de saída já serializadas"""
+    return ''.join(json.dumps(solve_line(linha, texto), ensure_ascii=False) + '\n' for linha, texto in itens)
+
+
+def iter_lines(arquivo, offset=0, chunk_size=CLI_CHUNK_SIZE):
+    """Lê a entrada em blocos de linhas não vazias, pulando as primeiras offset linhas
+
+    Yields:
+        list: Pares (número da linha, texto)
+    """
+    bloco = []
+    for linha, texto in islice(enumerate(arquivo), offset, None):
+        if texto.strip():
+            bloco.append((linha, texto))
+            if len(bloco) == chunk_size:
+                yield bloco
+                bloco = []
+    if bloco:
+        yield bloco
+
+
+def run(entrada, saida, workers=CLI_WORKERS, chunk_size=CLI_CHUNK_SIZE, offset=0):
+    """Processa a entrada e grava os resultados em ordem
+
+    Args:
+        entrada (file): Arquivo de texto com um perfil JSON por linha
+        saida (file): Arquivo de texto para os registros de saída
+        workers (int): Processos de solução (1 resolve no próprio processo)
+        chunk_size (int): Linhas enviadas por tarefa a cada processo
+        offset (int): Linhas da entrada a pular (retomada)
+
+    Returns:
+        int: Número de registros gravados
+    """
+    total = 0
+    blocos = iter_lines(entrada, offset, chunk_size)
+    if workers <= 1:
+        for bloco in blocos:
+            saida.write(_solve_chunk(bloco))
+            saida.flush()
+            total += len(bloco)
+        return total
+
+    metodos = multiprocessing.get_all_start_methods()
+    contexto = multiprocessing.get_context('forkserver' if 'forkserver' in metodos else 'spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=contexto) as executor:
+        # Janela limitada de blocos em andamento, gravados na ordem de entrada
+        pendentes = deque()
+        for bloco in blocos:
+            pendentes.append((len(bloco), executor.submit(_solve_chunk, bloco)))
+            if len(pendentes) >= 2 * workers:
+                quantidade, futuro = pendentes.popleft()
+                saida.write(futuro.result())
+                saida.flush()
+                total += quantidade
+        while pendentes:
+            quantidade, futuro = pendentes.popleft()
+            saida.write(futuro.result())
+            saida.flush()
+            total += quantidade
+    return total
+
+
+def resume_offset(path):
+    """Linha da entrada a partir da qual retomar, pela última linha completa da saída
+
+    Uma última linha incompleta (execução interrompida no meio da escrita) é
+    removida do arquivo.
+
+    Args:
+        path (str): Arquivo de saída de uma execução anterior
+
+    Returns:
+        int: Linhas da entrada já processadas (0 se a saída não existe ou está vazia)
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'r+b') as arquivo:
+        fim = arquivo.seek(0, os.SEEK_END)
+        # Ler blocos do fim até encontrar as duas últimas quebras de linha
+        bloco = 1 << 16
+        inicio = fim
+        final = b''
+        while inicio > 0 and final.count(b'\n') < 2:
+            inicio = max(0, inicio - bloco)
+            arquivo.seek(inicio)
+            final = arquivo.read(fim - inicio)
+        if not final.endswith(b'\n'):
+            corte = final.rfind(b'\n') + 1
+            arquivo.truncate(inicio + corte)
+            final = final[:corte]
+        linhas = final.splitlines()
+        if not linhas:
+            return 0
+        return json.loads(linhas[-1])['linha'] + 1
+
+
+def main(argv=None):
+    """Executa a otimização em lote a partir da linha de comando"""
+    parser = argparse.ArgumentParser(description="Otimiza dietas em lote (JSON Lines na entrada e na saída)")
+    parser.add_argument('input', help="Arquivo de perfis em JSON Lines ('-' para a entrada padrão)")
+    parser.add_argument('-o', '--output', default='-', help="Arquivo de saída ('-' para a saída padrão)")
+    parser.add_argument('--workers', type=int, default=CLI_WORKERS, help="Processos de solução")
+    parser.add_argument('--chunk-size', type=int, default=CLI_CHUNK_SIZE, help="Perfis por tarefa do pool")
+    parser.add_argument('--offset', type=int, default=0, help="Linhas da entrada a pular")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continua uma execução interrompida a partir da última linha gravada na saída")
+    args = parser.parse_args(argv)
+
+    offset = args.offset
+    modo = 'w'
+    if args.resume:
+        if args.output == '-':
+            parser.error("--resume exige um arquivo de saída (-o)")
+        offset = max(offset, resume_offset(args.output))
+        modo = 'a'
+
+    entrada = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    saida = sys.stdout if args.output == '-' else open(args.output, modo, encoding='utf-8')
+    try:
+        total = run(entrada, saida, args.workers, args.chunk_size, offset)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if saida is not sys.stdout:
+            saida.close()
+    print(f"{total} perfis processados a partir da linha {offset}", file=sys.stderr)
@@ -0,0 +1,553 @@
+"""
+Modelo de dieta compilado uma vez por conjunto de alimentos, com re-solução paramétrica
+"""
+
+import threading
+
+import numpy as np
+
+from config.constants import NUMERICAL_TOLERANCE, NUTRIENTS, SOLVER_BACKEND
+from data.food_database import get_food_table
+from optimization.instrumentation import NULL_TIMER
+from optimization.lp_backends import resolve_backend
+
+# Limites de nutriente com nome de argumento próprio em optimize_diet
+NAMED_TARGETS = {
+    ('calorias', 'min'): 'metac',
+    ('proteina', 'min'): 'metap',
+    ('gordura', 'max'): 'metag',
+    ('carboidrato', 'max'): 'metacarb',
+}
+
+
+def target_name(coluna, limite):
+    """Nome da meta de um limite de nutriente ('metac', 'fibra_min', 'sodio_max'...)
+
+    Args:
+        coluna (str): Nutriente (chave de NUTRIENTS)
+        limite (str): 'min' ou 'max'
+    """
+    return NAMED_TARGETS.get((coluna, limite), f"{coluna}_{limite}")
+
+
+# Linhas do modelo: (meta, coluna da tabela, sinal), um mínimo e um máximo por
+# nutriente de NUTRIENTS mais o orçamento. Metas mínimas entram com sinal -1
+# para que todas as restrições fiquem na forma A_ub·x <= b_ub.
+TARGET_ROWS = tuple(
+    (target_name(coluna, limite), coluna, -1.0 if limite == 'min' else 1.0)
+    for coluna in NUTRIENTS for limite in ('min', 'max')
+) + (('orcamento', 'preco', 1.0),)
+_TARGET_NAMES = {meta for meta, _, _ in TARGET_ROWS}
+
+
+def resolve_nutrient_targets(table, overrides=None):
+    """Metas dos nutrientes sem argumento próprio em optimize_diet
+
+    Os limites padrão de NUTRIENTS valem só para os nutrientes que a tabela
+    informa (table.nutrients); overrides os substitui, e None desativa um limite.
+
+    Args:
+        table (FoodTable): Tabela de alimentos
+        overrides (dict, optional): Nutriente -> (mínimo, máximo), ex: {'sodio': (None, 1500)}
+
+    Returns:
+        dict: Meta ('fibra_min', 'sodio_max'...) -> valor ou None
+    """
+    metas = {}
+    for coluna in table.nutrients:
+        for limite in ('min', 'max'):
+            meta = target_name(coluna, limite)
+            if meta not in NAMED_TARGETS.values() and NUTRIENTS[coluna][limite] is not None:
+                metas[meta] = float(NUTRIENTS[coluna][limite])
+
+    if overrides is not None and not isinstance(overrides, dict):
+        raise ValueError("Os limites de nutrientes devem ser um dicionário nutriente -> [mínimo, máximo]")
+    for coluna, limites in (overrides or {}).items():
+        if coluna not in NUTRIENTS:
+            raise ValueError(f"Nutriente desconhecido: {coluna}")
+        if not isinstance(limites, (list, tuple)) or len(limites) != 2:
+            raise ValueError(f"Informe [mínimo, máximo] para {coluna}")
+        for limite, valor in zip(('min', 'max'), limites):
+            if valor is not None and (isinstance(valor, bool) or not isinstance(valor, (int, float))):
+                raise ValueError(f"Os limites de {coluna} devem ser números ou null")
+            meta = target_name(coluna, limite)
+            if meta in NAMED_TARGETS.values():
+                if valor is not None:
+                    raise ValueError(f"Use o argumento {meta} para o limite '{limite}' de {coluna}")
+                continue
+            if valor is not None and coluna not in table.nutrients:
+                raise ValueError(f"A tabela de alimentos não informa {coluna}")
+            metas[meta] = None if valor is None else float(valor)
+    return metas
+
+
+def empty_result(status, table):
+    """Resultado sem solução, no formato de DietOptimizer.optimize_diet"""
+    return {
+        'status': status,
+        'quantidades': {},
+        'custo_total': 0,
+        'detalhes': {f'{coluna}_total': 0 for coluna in table.nutrients},
+    }
+
+
+def solution_totals(table, x, costs):
+    """Custo, totais de nutrientes e alimentos escolhidos de uma solução
+
+    Os totais de todos os nutrientes saem de um único produto matriz-vetor
+    com a matriz de nutrientes da tabela, e os valores por alimento de um
+    produto elemento a elemento só nas colunas escolhidas, então o custo
+    cresce pouco com o número de nutrientes.
+
+    Args:
+        table (FoodTable): Tabela de alimentos
+        x (numpy.ndarray): Quantidade de cada linha da tabela
+        costs (numpy.ndarray): Preço por porção de cada linha
+
+    Returns:
+        tuple: (custo total, 'detalhes', 'alimentos') no formato de optimize_diet;
+            'alimentos' traz só quantidades significativas
+    """
+    nutrientes = table.nutrients
+    matriz = table.nutrient_matrix()
+    detalhes = {f'{coluna}_total': total for coluna, total in zip(nutrientes, (matriz @ x).tolist())}
+
+    escolhidas = np.flatnonzero(x > 0.01)
+    quantidades = x[escolhidas]
+    porcoes = (matriz[:, escolhidas] * quantidades).T.tolist()
+    custos = (costs[escolhidas] * quantidades).tolist()
+    nomes = table.names
+    alimentos = []
+    for linha, qtd, valores, custo in zip(escolhidas.tolist(), quantidades.tolist(), porcoes, custos):
+        alimento = {'nome': nomes[linha], 'quantidade': qtd}
+        alimento.update(zip(nutrientes, valores))
+        alimento['custo'] = custo
+        alimentos.append(alimento)
+    return float(costs @ x), detalhes, alimentos
+
+
+class DietModel:
+    """Problema de dieta na forma matricial, compilado uma única vez
+
+    Os custos e os limites de porção são montados na construção. As linhas de
+    TARGET_ROWS dos nutrientes que a tabela informa (rows) apontam para a
+    matriz de nutrientes compartilhada da tabela (ou para os custos, no
+    orçamento) com o sinal da meta; só as linhas ativas de uma requisição são
+    materializadas, então nutrientes sem meta não pesam na compilação.
+    update_targets e update_bounds alteram apenas o lado direito e os limites
+    das variáveis; solve reaproveita a base ótima anterior quando
+    ela continua viável e só chama o backend quando a base muda.
+
+    solve_request não altera metas nem limites do modelo: cada requisição traz
+    os seus, e as exclusões viram uma máscara com limite superior zero. Assim
+    um único modelo pode atender requisições simultâneas de várias threads.
+    """
+
+    def __init__(self, table=None, backend=None):
+        """Compila o modelo para uma tabela de alimentos
+
+        Args:
+            table (FoodTable, optional): Tabela de alimentos (padrão: tabela compartilhada)
+            backend (str or object, optional): Backend em processo (padrão: SOLVER_BACKEND)
+        """
+        self.table = table if table is not None else get_food_table()
+        self.backend = resolve_backend(backend if backend is not None else SOLVER_BACKEND)
+        if self.backend is None:
+            raise ValueError("DietModel requer um backend em processo (ex: 'highs')")
+
+        # (cost_version, preços) da última atualização vista (ver _sync_costs)
+        self._costs = self.table.cost_snapshot()
+        self.rows = tuple(
+            (meta, coluna, sinal) for meta, coluna, sinal in TARGET_ROWS
+            if coluna == 'preco' or coluna in self.table.nutrients
+        )
+        # Linha da matriz de nutrientes de cada item de rows (-1: custos)
+        posicoes = {coluna: i for i, coluna in enumerate(self.table.nutrients)}
+        self._sources = np.array([posicoes.get(coluna, -1) for _, coluna, _ in self.rows], dtype=np.intp)
+        self._signs = np.array([sinal for _, _, sinal in self.rows])
+        # Limites padrão dos nutrientes (NUTRIENTS) valem quando a requisição não os informa
+        self.default_targets = resolve_nutrient_targets(self.table)
+        self.targets = {meta: None for meta, _, _ in self.rows}
+        self.targets.update(self.default_targets)
+
+        n = len(self.table)
+        self._free_bounds = (np.zeros(n), np.full(n, np.inf))
+        maximos = self.table['max_portions_daily']
+        self._portion_bounds = (
+            self.table['min_portions_daily'],
+            np.where(maximos > 0, maximos, np.inf)
+        )
+        self.use_portion_limits = False
+        self.excluded = np.zeros(0, dtype=np.intp)
+        self.overrides = {}
+        self._refresh_bounds()
+
+        self._basis = None
+        self.stats = {'solves': 0, 'warm_starts': 0}
+        self._stats_lock = threading.Lock()
+        self._cost_lock = threading.Lock()
+
+    @property
+    def c(self):
+        """Vetor de custos (preço por porção) da última atualização vista"""
+        return self._costs[1]
+
+    @property
+    def cost_version(self):
+        """Versão dos custos de c (FoodTable.cost_version)"""
+        return self._costs[0]
+
+    def constraint_rows(self, linhas, c=None):
+        """Linhas de A_ub (índices de rows), com metas mínimas já negadas
+
+        Args:
+            linhas (numpy.ndarray): Índices em self.rows
+            c (numpy.ndarray, optional): Custos da linha do orçamento (padrão: self.c)
+
+        Returns:
+            numpy.ndarray: Matriz (linhas x alimentos)
+        """
+        fontes = self._sources[linhas]
+        sinais = self._signs[linhas, None]
+        A = sinais * self.table.nutrient_matrix()[np.maximum(fontes, 0)]
+        custos = fontes < 0
+        if custos.any():
+            A[custos] = sinais[custos] * (self.c if c is None else c)
+        return A
+
+    @property
+    def A(self):
+        """Matriz completa de restrições, uma linha por item de rows"""
+        return self.constraint_rows(np.arange(len(self.rows)))
+
+    def update_targets(self, **metas):
+        """Altera as metas (lado direito) sem recompilar o modelo
+
+        Args:
+            **metas: Qualquer subconjunto das metas de TARGET_ROWS (metac, metap,
+                metag, metacarb, orcamento, fibra_min, sodio_max...); None desativa
+                a restrição correspondente
+        """
+        self.targets.update(self._check_targets(metas))
+
+    def _check_targets(self, metas):
+        """Valida os nomes das metas e converte os valores para float
+
+        Metas de nutrientes que a tabela não informa só são aceitas desativadas (None).
+        """
+        conhecidas = {meta for meta, _, _ in self.rows}
+        normalizadas = {}
+        for meta, valor in metas.items():
+            if meta not in conhecidas:
+                if valor is None and meta in _TARGET_NAMES:
+                    continue
+                raise ValueError(f"Meta desconhecida ou sem dados na tabela: {meta}")
+            normalizadas[meta] = None if valor is None else float(valor)
+        return normalizadas
+
+    def update_bounds(self, use_portion_limits=None, excluded_foods=None, bounds=None):
+        """Altera os limites das variáveis sem recompilar o modelo
+
+        Args:
+            use_portion_limits (bool, optional): Aplica os limites de porção por categoria
+            excluded_foods (iterable, optional): Nomes excluídos (substitui a exclusão atual)
+            bounds (dict, optional): Nome -> (mínimo, máximo) substituindo os limites
+                do alimento (substitui os limites individuais atuais)
+        """
+        if use_portion_limits is not None:
+            self.use_portion_limits = bool(use_portion_limits)
+        if excluded_foods is not None:
+            self.excluded = self.table.rows(excluded_foods)
+        if bounds is not None:
+            self.overrides = self._bound_overrides(bounds)
+        self._refresh_bounds()
+
+    def _bound_overrides(self, bounds):
+        """Converte limites individuais por nome em limites por linha"""
+        return {
+            self.table.index[nome]: limites
+            for nome, limites in bounds.items() if nome in self.table.index
+        }
+
+    def _refresh_bounds(self):
+        """Recalcula lb/ub a partir dos limites base, individuais e exclusões"""
+        self.lb, self.ub = self.bounds_for(self.use_portion_limits, self.excluded, self.overrides)
+
+    def bounds_for(self, use_portion_limits=False, excluded=None, overrides=None):
+        """Calcula os limites das variáveis de uma requisição sem alterar o modelo
+
+        Sem exclusões nem limites individuais, devolve os arrays base
+        compartilhados (somente leitura); caso contrário, cópias.
+
+        Args:
+            use_portion_limits (bool): Aplica os limites de porção por categoria
+            excluded (numpy.ndarray, optional): Linhas excluídas (limites fixados em zero)
+            overrides (dict, optional): Linha -> (mínimo, máximo)
+
+        Returns:
+            tuple: (lb, ub)
+        """
+        lb, ub = self._portion_bounds if use_portion_limits else self._free_bounds
+        if not overrides and (excluded is None or not len(excluded)):
+            return lb, ub
+        lb = np.array(lb)
+        ub = np.array(ub)
+        for linha, (minimo, maximo) in (overrides or {}).items():
+            if minimo is not None:
+                lb[linha] = minimo
+            if maximo is not None:
+                ub[linha] = maximo
+        if excluded is not None:
+            lb[excluded] = 0
+            ub[excluded] = 0
+        return lb, ub
+
+    def _active_rows(self):
+        """Índices das linhas com meta definida e o lado direito correspondente"""
+        return self._rows_for(self.targets)
+
+    def _rows_for(self, targets):
+        """Linhas ativas e lado direito para um dicionário de metas"""
+        linhas = [i for i, (meta, _, _) in enumerate(self.rows) if targets.get(meta) is not None]
+        rhs = np.array([self.rows[i][2] * targets[self.rows[i][0]] for i in linhas], dtype=float)
+        return np.array(linhas, dtype=np.intp), rhs
+
+    def solve(self, warm_start=True, timer=NULL_TIMER):
+        """Resolve o modelo com as metas e limites atuais
+
+        Args:
+            warm_start (bool): Tenta reaproveitar a base ótima da solução anterior
+            timer (PhaseTimer, optional): Medidor das fases solve e extract
+
+        Returns:
+            dict: Resultado no mesmo formato de DietOptimizer.optimize_diet
+        """
+        custos = self._sync_costs()
+        with timer.phase('solve'):
+            status, x = self._solve_current(warm_start, custos)
+        with timer.phase('extract'):
+            return self._prepare_result(status, x, costs=custos[1])
+
+    def solve_request(self, targets, use_portion_limits=False, excluded_foods=None, bounds=None,
+                      warm_start=True, timer=NULL_TIMER, costs=None):
+        """Resolve uma requisição sem alterar as metas e limites do modelo
+
+        Seguro para chamadas simultâneas: metas, limites e máscara de exclusão
+        são locais à chamada. Apenas a base usada no warm start é
+        compartilhada, e ela é substituída por inteiro a cada solução.
+
+        Args:
+            targets (dict): Metas da requisição (metac, metap, metag, metacarb,
+                orcamento e as de nutrientes, ex: fibra_min); metas ausentes ou
+                None ficam desativadas, exceto as de default_targets, que valem
+                quando ausentes
+            use_portion_limits (bool): Aplica os limites de porção por categoria
+            excluded_foods (iterable, optional): Nomes excluídos (limite superior zero)
+            bounds (dict, optional): Nome -> (mínimo, máximo) por alimento
+            warm_start (bool): Tenta reaproveitar a última base ótima do modelo
+            timer (PhaseTimer, optional): Medidor das fases solve e extract
+            costs (tuple, optional): Snapshot (cost_version, preços) de
+                FoodTable.cost_snapshot a usar (padrão: o atual da tabela)
+
+        Returns:
+            dict: Resultado no mesmo formato de DietOptimizer.optimize_diet
+        """
+        custos = self._sync_costs() if costs is None else costs
+        with timer.phase('solve'):
+            status, x = self.solve_vector(targets, use_portion_limits, excluded_foods, bounds, warm_start, custos)
+        with timer.phase('extract'):
+            return self._prepare_result(status, x, self.table.rows(excluded_foods or ()), custos[1])
+
+    def solve_vector(self, targets, use_portion_limits=False, excluded_foods=None, bounds=None, warm_start=True,
+                     costs=None):
+        """Como solve_request, mas devolve a solução como vetor, sem montar o resultado
+
+        Returns:
+            tuple: (status, x), com x None quando não há solução ótima
+        """
+        metas = dict(self.default_targets)
+        metas.update(self._check_targets(targets))
+        excluidos = self.table.rows(excluded_foods or ())
+        overrides = self._bound_overrides(bounds) if bounds else None
+        lb, ub = self.bounds_for(use_portion_limits, excluidos, overrides)
+        linhas, rhs = self._rows_for(metas)
+        return self._solve_arrays(linhas, rhs, lb, ub, warm_start, costs)
+
+    def _solve_current(self, warm_start, costs=None):
+        """Resolve com metas e limites atuais, retornando (status, x)"""
+        linhas, rhs = self._active_rows()
+        return self._solve_arrays(linhas, rhs, self.lb, self.ub, warm_start, costs)
+
+    def _sync_costs(self):
+        """Snapshot dos custos para uma solução, acompanhando FoodTable.update_costs
+
+        Só o vetor de custos e a linha do orçamento mudam com os preços. O
+        snapshot (cost_version, preços) é lido de uma vez e usado em toda a
+        solução: objetivo, linha do orçamento, base do warm start e totais do
+        resultado. Cada base guarda a versão dos custos com que foi obtida e só
+        é reaproveitada com a mesma versão, então uma solução concorrente ainda
+        com os preços antigos não se mistura aos novos.
+
+        Returns:
+            tuple: (cost_version, preços) de FoodTable.cost_snapshot
+        """
+        custos = self.table.cost_snapshot()
+        if custos[0] > self._costs[0]:
+            with self._cost_lock:
+                if custos[0] > self._costs[0]:
+                    self._costs = custos
+        return custos
+
+    def _solve_arrays(self, linhas, rhs, lb, ub, warm_start, costs=None):
+        """Resolve para linhas, lado direito e limites dados, retornando (status, x)
+
+        costs é o snapshot (cost_version, preços) da solução (padrão: _sync_costs).
+        """
+        versao, c = self._sync_costs() if costs is None else costs
+        x = self._warm_solve(self._basis, linhas, rhs, lb, ub, versao, c) if warm_start else None
+        with self._stats_lock:
+            self.stats['solves'] += 1
+            if x is not None:
+                self.stats['warm_starts'] += 1
+        if x is not None:
+            return 'Optimal', x
+
+        solucao = self.backend.solve(c, self.constraint_rows(linhas, c), rhs, lb, ub)
+        base = None
+        if solucao['x'] is not None and solucao['duals'] is not None:
+            base = {
+                'cost_version': versao,
+                'rows': linhas,
+                'duals': solucao['duals'],
+                'reduced_costs': solucao['reduced_costs'],
+            }
+        # Atribuição única: outras threads veem a base antiga ou a nova, nunca uma mistura
+        self._basis = base
+        return solucao['status'], solucao['x']
+
+    def _warm_solve(self, base, linhas, rhs, lb, ub, cost_version, c):
+        """Reaproveita a base anterior se ela continuar primal viável
+
+        Os duais não dependem do lado direito nem dos limites, então a base
+        anterior continua dual viável. Fixando as variáveis com custo reduzido
+        não nulo em seus limites e tornando justas as linhas com dual não nulo,
+        qualquer solução viável desse sistema satisfaz a folga complementar e
+        é ótima.
+
+        Uma base obtida com outros custos (cost_version diferente) não é dual
+        viável e nunca é usada.
+
+        Returns:
+            numpy.ndarray or None: Solução ótima, ou None se for preciso resolver do zero
+        """
+        if base is None or base['cost_version'] != cost_version or not np.array_equal(base['rows'], linhas):
+            return None
+
+        tol = NUMERICAL_TOLERANCE
+        d = base['reduced_costs']
+        fixas = (np.abs(d) > tol) | (lb == ub)
+        no_superior = d < -tol
+        if np.any(no_superior & ~np.isfinite(ub)):
+            return None
+
+        x = np.where(no_superior, ub, lb)
+        livres = np.flatnonzero(~fixas)
+        justas = np.flatnonzero(np.abs(base['duals']) > tol)
+
+        A = self.constraint_rows(linhas, c)
+        if len(justas):
+            A_justas = A[justas]
+            if len(livres):
+                restante = rhs[justas] - A_justas @ x
+                x_livres, _, _, _ = np.linalg.lstsq(A_justas[:, livres], restante, rcond=None)
+                x[livres] = x_livres
+            if np.any(np.abs(A_justas @ x - rhs[justas]) > tol * (1 + np.abs(rhs[justas]))):
+                return None
+
+        # Verificar viabilidade primal
+        if np.any(x < lb - tol) or np.any(x > ub + tol):
+            return None
+        if np.any(A @ x > rhs + tol * (1 + np.abs(rhs))):
+            return None
+        return np.clip(x, lb, ub)
+
+    def marginal_cost(self, meta):
+        """Custo marginal de uma meta na base ótima atual
+
+        Args:
+            meta (str): Nome da meta (ex: 'metap')
+
+        Returns:
+            float or None: Variação do custo por unidade da meta (R$/unidade), ou
+                None se não houver base ótima ou a meta estiver desativada
+        """
+        base = self._basis
+        if base is None:
+            return None
+        nomes = [self.rows[i][0] for i in base['rows']]
+        if meta not in nomes:
+            return None
+        posicao = nomes.index(meta)
+        sinal = self.rows[base['rows'][posicao]][2]
+        return float(base['duals'][posicao] * sinal)
+
+    def sweep(self, meta, valores, timer=NULL_TIMER):
+        """Resolve o modelo para uma sequência de valores de uma meta
+
+        Cada ponto parte da base do ponto anterior; o backend só é chamado
+        quando a base ótima muda, então o custo total cresce com o número de
+        mudanças de base e não com o número de pontos. Em sequências
+        monotônicas, os pontos após a saída da região viável não são resolvidos.
+
+        Args:
+            meta (str): Meta variada (ex: 'metap')
+            valores (iterable): Valores da meta, de preferência em ordem
+            timer (PhaseTimer, optional): Medidor; cada ponto resolvido é uma fase 'frontier_point'
+
+        Returns:
+            list: Tuplas (valor, resultado, custo marginal) na ordem dos valores
+        """
+        valores = list(valores)
+        # Os valores viáveis da meta formam um intervalo: em uma sequência
+        # monotônica, depois de sair da região viável não há volta
+        monotonica = valores == sorted(valores) or valores == sorted(valores, reverse=True)
+        pontos = []
+        saiu_da_regiao_viavel = False
+        viavel_antes = False
+        for valor in valores:
+            if saiu_da_regiao_viavel:
+                pontos.append((valor, self._prepare_result('Infeasible', None), None))
+                continue
+            with timer.phase('frontier_point'):
+                self.update_targets(**{meta: valor})
+                resultado = self.solve()
+                viavel = resultado['status'] == 'Optimal'
+                marginal = self.marginal_cost(meta) if viavel else None
+            pontos.append((valor, resultado, marginal))
+            saiu_da_regiao_viavel = monotonica and viavel_antes and resultado['status'] == 'Infeasible'
+            viavel_antes = viavel_antes or viavel
+        return pontos
+
+    def _prepare_result(self, status, x, excluded=None, costs=None):
+        """Monta o dicionário de resultado a partir da solução
+
+        Args:
+            status (str): Status da solução
+            x (numpy.ndarray or None): Quantidades por alimento
+            excluded (numpy.ndarray, optional): Linhas omitidas de 'quantidades'
+                (padrão: exclusões atuais do modelo)
+            costs (numpy.ndarray, optional): Preços usados na solução (padrão: self.c)
+        """
+        resultado = empty_result(status, self.table)
+        if x is None:
+            return resultado
+
+        nomes = self.table.names
+        resultado['quantidades'] = dict(zip(nomes, x.tolist()))
+        for linha in (self.excluded if excluded is None else excluded).tolist():
+            resultado['quantidades'].pop(nomes[linha], None)
+
+        resultado['custo_total'], resultado['detalhes'], resultado['alimentos'] = solution_totals(
+            self.table, x, self.c if costs is None else costs
+        )
+        return resultado
@@ -1,15 +1,64 @@
-import pulp
-from data.food_database import get_food_data
+import threading
+
+import numpy as np
+from config.constants import (ALTERNATIVES_COST_SLACK, ALTERNATIVES_COUNT, COLLECT_TIMINGS, INFEASIBILITY_DIAGNOSIS,
+                              MILP_OPTIONS, RESULT_CACHE_SIZE, SOLVER_BACKEND)
+from data.food_database import get_food_table
+from optimization.alternatives import diverse_plans
+from optimization.diet_model import (TARGET_ROWS, DietModel, empty_result, resolve_nutrient_targets,
+                                     solution_totals, target_name)
+from optimization.infeasibility import diagnose_infeasibility, food_categories
+from optimization.instrumentation import NULL_TIMER, make_timer
+from optimization.integer_portions import portion_step, round_and_repair, solve_exact
+from optimization.lp_backends import PulpMatrixBackend, resolve_backend
+from optimization.result_cache import get_result_cache
+
+# O PuLP, o pool de processos e o planejador semanal são importados apenas nos
+# caminhos que os usam: o caminho em processo não paga a importação do PuLP.
+
+# Metas com argumento próprio em optimize_diet; as de nutrientes vêm de nutrient_targets
+_REQUEST_TARGETS = ('metac', 'metap', 'metag', 'metacarb', 'orcamento')
+
 
 class DietOptimizer:
-    """Classe responsável pela otimização da dieta"""
+    """Classe responsável pela otimização da dieta
+
+    Uma instância pode ser compartilhada entre threads: cada chamada de
+    optimize_diet monta seu próprio problema (caminho PuLP) ou resolve o modelo
+    compilado compartilhado com metas e máscara de exclusão próprias.
+    """
     
-    def __init__(self):
-        self.alimentos = get_food_data()
-        self.problem = None
-        self.food_vars = {}
+    def __init__(self, backend=None, cache=None, collect_timings=COLLECT_TIMINGS, timing_hooks=()):
+        """Inicializa o otimizador
+        
+        Args:
+            backend (str or object, optional): 'auto', 'highs', 'pulp' ou um objeto
+                com método solve(c, A_ub, b_ub, lb, ub). Padrão: SOLVER_BACKEND
+            cache (ResultCache or bool, optional): Cache de resultados; None usa o cache
+                compartilhado (se RESULT_CACHE_SIZE > 0) e False desativa
+            collect_timings (bool): Se o resultado deve trazer 'timings' (segundos por fase)
+            timing_hooks (iterable): Funções hook(fase, segundos) chamadas ao fim de cada
+                fase, além dos hooks globais de optimization.instrumentation
+        """
+        self.collect_timings = collect_timings
+        self.timing_hooks = tuple(timing_hooks)
+        timer = make_timer(collect_timings, self.timing_hooks)
+        with timer.phase('food_load'):
+            self.table = get_food_table()
+            self.alimentos = self.table.records()
+        # Tempo de carga informado apenas no primeiro resultado
+        self._load_timings = timer.timings
+        self.backend = resolve_backend(backend if backend is not None else SOLVER_BACKEND)
+        self.model = None
+        self._model_lock = threading.Lock()
+        if cache is None:
+            cache = RESULT_CACHE_SIZE > 0
+        if cache is True:
+            cache = get_result_cache()
+        self.cache = cache or None
     
-    def optimize_diet(self, metac, metap, metag, orcamento, excluded_foods=None, use_portion_limits=False, metacarb=None):
+    def optimize_diet(self, metac, metap, metag, orcamento, excluded_foods=None, use_portion_limits=False, metacarb=None,
+                      portion_mode='continuous', milp_options=None, nutrient_targets=None):
         """Resolve o problema de otimização de dieta com restrições nutricionais e orçamentárias.
         
         Args:
@@ -20,151 +69,615 @@ class DietOptimizer:
             excluded_foods (list): Lista de nomes de alimentos a serem excluídos da otimização
             use_portion_limits (bool): Se deve aplicar limites de porção por dia
             metacarb (float, optional): Máximo de carboidratos diários (em gramas)
+            portion_mode (str): 'continuous', 'integer' (porções inteiras) ou 'half'
+                (múltiplos de meia porção); ver PORTION_MODES
+            milp_options (dict, optional): time_limit, mip_gap e threads do MILP,
+                sobrepondo MILP_OPTIONS
+            nutrient_targets (dict, optional): Nutriente -> (mínimo, máximo) sobrepondo os
+                limites padrão de NUTRIENTS (ex: {'sodio': (None, 1500), 'fibra': (30, None)});
+                None desativa o limite
         
         Returns:
-            dict: Resultado da otimização com status, quantidades e custo total
+            dict: Resultado da otimização com status, quantidades e custo total; 'detalhes'
+                traz o total de cada nutriente da tabela (calorias_total, fibra_total...). Nos
+                modos inteiros traz também 'modo_porcao', 'metodo' ('milp' ou
+                'heuristica') e 'gap' (diferença relativa para o custo da relaxação linear)
         """
-        # Filtrar alimentos excluídos
-        if excluded_foods:
-            self.alimentos = [food for food in self.alimentos if food['nome'] not in excluded_foods]
+        timer = make_timer(self.collect_timings, self.timing_hooks)
+        step = portion_step(portion_mode)
+        # Um único snapshot dos preços para a solução e para a chave do cache
+        custos = self.table.cost_snapshot()
         
-        # Criar o problema de minimização
-        self.problem = pulp.LpProblem("Otimizacao_Dieta", pulp.LpMinimize)
+        if self.cache is None:
+            resultado = self._solve_mode(
+                metac, metap, metag, orcamento, excluded_foods, use_portion_limits, metacarb, step, milp_options, timer,
+                nutrient_targets, custos
+            )
+        else:
+            # Requisições iguais após normalização (metas arredondadas, exclusões
+            # ordenadas, mesma versão da tabela) reaproveitam o resultado
+            with timer.phase('cache_lookup'):
+                chave = self.cache.make_key(
+                    (self.table.version, custos[0]), metac, metap, metag, orcamento, excluded_foods, use_portion_limits,
+                    metacarb, portion_mode, milp_options, nutrient_targets
+                )
+                resultado = self.cache.get(chave)
+            
+            if resultado is None:
+                normalize = self.cache.normalize
+                resultado = self._solve_mode(
+                    normalize(metac), normalize(metap), normalize(metag), normalize(orcamento),
+                    excluded_foods, use_portion_limits, normalize(metacarb), step, milp_options, timer,
+                    self.cache.normalize_nutrients(nutrient_targets), custos
+                )
+                self._cache_put(chave, resultado, custos)
         
-        # Criar variáveis de decisão
-        self._create_decision_variables()
+        if self.collect_timings:
+            carga, self._load_timings = self._load_timings, None
+            timings = dict(carga or {})
+            timings.update(timer.timings)
+            resultado['timings'] = timings
+        return resultado
+    
+    def _solve_mode(self, metac, metap, metag, orcamento, excluded_foods, use_portion_limits, metacarb, step,
+                    milp_options, timer, nutrient_targets=None, costs=None):
+        """Resolve no modo de porção pedido: contínuo (step None) ou na grade de step
         
-        # Definir função objetivo
-        self._set_objective_function()
+        Se o problema for inviável, o resultado traz também o 'diagnostico' de
+        diagnose, feito no mesmo modo de porção. costs é o snapshot
+        (cost_version, preços) de FoodTable.cost_snapshot usado pelo modelo compilado.
+        """
+        if step is None:
+            resultado = self._solve(
+                metac, metap, metag, orcamento, excluded_foods, use_portion_limits, metacarb, timer, nutrient_targets,
+                costs
+            )
+        else:
+            resultado = self._solve_integer(
+                metac, metap, metag, orcamento, excluded_foods, use_portion_limits, metacarb, step, milp_options, timer,
+                nutrient_targets, costs
+            )
+        if INFEASIBILITY_DIAGNOSIS and resultado['status'] == 'Infeasible':
+            with timer.phase('diagnosis'):
+                resultado['diagnostico'] = self._diagnose(
+                    metac, metap, metag, orcamento, excluded_foods, use_portion_limits, metacarb, nutrient_targets,
+                    step, milp_options
+                )
+        return resultado
+    
+    def _targets(self, metac, metap, metag, orcamento, metacarb=None, nutrient_targets=None):
+        """Dicionário com todas as metas da requisição (nomes de TARGET_ROWS)"""
+        metas = {'metac': metac, 'metap': metap, 'metag': metag, 'metacarb': metacarb, 'orcamento': orcamento}
+        metas.update(resolve_nutrient_targets(self.table, nutrient_targets))
+        return metas
+    
+    def diagnose(self, metac, metap, metag, orcamento, excluded_foods=None, use_portion_limits=False, metacarb=None,
+                 nutrient_targets=None, portion_mode='continuous', milp_options=None):
+        """Sugere a menor relaxação das metas e limites que torna a dieta viável
         
-        # Adicionar restrições
-        self._add_nutritional_constraints(metac, metap, metag, metacarb)
-        self._add_budget_constraint(orcamento)
+        Resolve um único LP elástico (ver optimization.infeasibility) em vez de
+        várias tentativas com parâmetros diferentes. Nos modos 'integer' e 'half'
+        o problema elástico é resolvido na grade de porções (MILP), já que o LP
+        contínuo pode ser viável quando a grade não é.
+        
+        Args:
+            metac, metap, metag, orcamento, excluded_foods, use_portion_limits, metacarb,
+                nutrient_targets, portion_mode, milp_options: Como em optimize_diet
+        
+        Returns:
+            dict: status, relaxacoes (com 'mensagem'), metas_relaxadas e custo_estimado;
+                nos modos inteiros, também 'modo_porcao'
+        """
+        return self._diagnose(
+            metac, metap, metag, orcamento, excluded_foods, use_portion_limits, metacarb, nutrient_targets,
+            portion_step(portion_mode), milp_options
+        )
+    
+    def _diagnose(self, metac, metap, metag, orcamento, excluded_foods, use_portion_limits, metacarb, nutrient_targets,
+                  step, milp_options):
+        """Diagnóstico no modo de porção de step (None para porções contínuas)"""
+        tabela = self.table
+        linhas = self._remaining_rows(excluded_foods)
+        metas = self._targets(metac, metap, metag, orcamento, metacarb, nutrient_targets)
+        c, A, b, lb, ub = self._integer_arrays(tabela, linhas, metas, use_portion_limits)
+        ativas = [meta for meta, _, _ in TARGET_ROWS if metas.get(meta) is not None]
+        backend = self.backend if self.backend is not None else PulpMatrixBackend()
+        opcoes = dict(MILP_OPTIONS)
+        opcoes.update(milp_options or {})
+        diagnostico = diagnose_infeasibility(
+            c, A, b, lb, ub, ativas, food_categories(tabela, linhas), backend, step, opcoes
+        )
+        if step is not None:
+            diagnostico['modo_porcao'] = 'half' if step == 0.5 else 'integer'
+        return diagnostico
+    
+    def alternatives(self, metac, metap, metag, orcamento, k=ALTERNATIVES_COUNT, cost_slack=ALTERNATIVES_COST_SLACK,
+                     excluded_foods=None, use_portion_limits=False, metacarb=None, nutrient_targets=None):
+        """Gera até k dietas distintas com custo próximo do ótimo
+        
+        A primeira é a dieta ótima de optimize_diet; as demais evitam os
+        alimentos das anteriores dentro da tolerância de custo (ver
+        optimization.alternatives). O conjunto de planos fica no cache de
+        resultados, então pedir de novo (ou pedir menos planos) não resolve
+        nenhum LP. Cada LP das alternativas é uma fase 'alternatives' para os
+        hooks de tempo.
+        
+        Args:
+            metac, metap, metag, orcamento: Como em optimize_diet
+            k (int): Número de planos, incluindo o ótimo
+            cost_slack (float): Tolerância relativa de custo (0.1 = até 10% acima do ótimo)
+            excluded_foods, use_portion_limits, metacarb, nutrient_targets: Como em optimize_diet
+        
+        Returns:
+            list: Resultados no formato de optimize_diet, do ótimo para as alternativas,
+                cada um com 'custo_relativo' (custo / custo ótimo). Se não houver dieta
+                viável, apenas o resultado de optimize_diet
+        """
+        otimo = self.optimize_diet(
+            metac, metap, metag, orcamento, excluded_foods, use_portion_limits, metacarb,
+            nutrient_targets=nutrient_targets
+        )
+        if otimo['status'] != 'Optimal' or k <= 1:
+            return [otimo]
+        
+        chave = None
+        custos = self.table.cost_snapshot()
+        if self.cache is not None:
+            chave = self.cache.make_key(
+                (self.table.version, custos[0]), metac, metap, metag, orcamento, excluded_foods, use_portion_limits,
+                metacarb, nutrient_targets=nutrient_targets
+            ) + ('alternatives', self.cache.normalize(cost_slack))
+            pool = self.cache.get(chave)
+            if pool is not None and (len(pool['planos']) >= k or pool['esgotado']):
+                return pool['planos'][:k]
+        
+        tabela = self.table
+        linhas = self._remaining_rows(excluded_foods)
+        metas = self._targets(metac, metap, metag, orcamento, metacarb, nutrient_targets)
+        c, A, b, lb, ub = self._integer_arrays(tabela, linhas, metas, use_portion_limits)
+        quantidades = otimo['quantidades']
+        x_otimo = np.array([quantidades.get(tabela.names[linha], 0) for linha in linhas.tolist()], dtype=float)
+        backend = self.backend if self.backend is not None else PulpMatrixBackend()
+        timer = make_timer(self.collect_timings, self.timing_hooks)
+        vetores, esgotado = diverse_plans(c, A, b, lb, ub, x_otimo, k, cost_slack, backend, timer=timer)
+        
+        planos = [otimo] + [self._vector_result('Optimal', x, tabela, linhas) for x in vetores[1:]]
+        for plano in planos:
+            plano['custo_relativo'] = plano['custo_total'] / otimo['custo_total'] if otimo['custo_total'] > 0 else 1.0
+        if chave is not None:
+            self._cache_put(chave, {'planos': planos, 'esgotado': esgotado}, custos)
+        return planos
+    
+    def _cache_put(self, chave, valor, custos):
+        """Guarda no cache se os preços não mudaram desde o snapshot da chave
         
-        # Adicionar limites de porção se habilitado
+        O caminho PuLP e os problemas auxiliares (MILP, alternativas) leem os
+        preços da tabela durante a solução; com um update_costs no meio, o
+        resultado pode misturar preços antigos e novos e não é guardado.
+        """
+        if self.table.cost_version == custos[0]:
+            self.cache.put(chave, valor)
+    
+    def _solve_integer(self, metac, metap, metag, orcamento, excluded_foods, use_portion_limits, metacarb, step,
+                       milp_options=None, timer=NULL_TIMER, nutrient_targets=None, costs=None):
+        """Resolve com quantidades múltiplas de step
+        
+        A relaxação linear é resolvida primeiro e arredondada por
+        round_and_repair, o que dá em milissegundos um plano viável. Em seguida
+        o MILP exato roda com limite de tempo; fica o melhor dos dois. Se o MILP
+        não encontrar solução a tempo, o plano da heurística é devolvido, então
+        a latência fica limitada por time_limit.
+        """
+        relaxado = self._solve(
+            metac, metap, metag, orcamento, excluded_foods, use_portion_limits, metacarb, timer, nutrient_targets, costs
+        )
+        if relaxado['status'] != 'Optimal':
+            return relaxado
+        
+        opcoes = dict(MILP_OPTIONS)
+        opcoes.update(milp_options or {})
+        tabela = self.table
+        linhas = self._remaining_rows(excluded_foods)
+        metas = self._targets(metac, metap, metag, orcamento, metacarb, nutrient_targets)
+        c, A, b, lb, ub = self._integer_arrays(tabela, linhas, metas, use_portion_limits)
+        quantidades = relaxado['quantidades']
+        x_lp = np.array([quantidades.get(tabela.names[linha], 0) for linha in linhas.tolist()], dtype=float)
+        
+        candidatos = []
+        with timer.phase('heuristic'):
+            x = round_and_repair(x_lp, c, A, b, lb, ub, step)
+        if x is not None:
+            candidatos.append((float(c @ x), 'heuristica', x))
+        
+        status = 'Not Solved'
+        if opcoes['time_limit'] > 0:
+            with timer.phase('milp'):
+                exato = solve_exact(
+                    self.backend, c, A, b, lb, ub, step,
+                    opcoes['time_limit'], opcoes['mip_gap'], opcoes['threads']
+                )
+            status = exato['status']
+            if exato['x'] is not None:
+                candidatos.append((float(c @ exato['x']), 'milp', exato['x']))
+        
+        if not candidatos:
+            return self._vector_result(status, None, tabela, linhas)
+        
+        # Menor custo; em empate, a solução do MILP
+        custo, metodo, x = min(candidatos, key=lambda candidato: (candidato[0], candidato[1] != 'milp'))
+        resultado = self._vector_result('Optimal', x, tabela, linhas)
+        resultado['modo_porcao'] = 'half' if step == 0.5 else 'integer'
+        resultado['metodo'] = metodo
+        resultado['gap'] = (custo - relaxado['custo_total']) / custo if custo > 0 else 0.0
+        return resultado
+    
+    def _integer_arrays(self, tabela, linhas, metas, use_portion_limits):
+        """Problema das linhas restantes na forma matricial (c, A, b, lb, ub)
+        
+        Mesma formulação do DietModel: metas mínimas entram com sinal -1 e
+        metas None são omitidas.
+        """
+        colunas = self._target_columns(metas)
+        matriz = self._coefficient_matrix(tabela, linhas, colunas)
+        ativas = [(coluna, sinal, metas[meta]) for meta, coluna, sinal in TARGET_ROWS if metas.get(meta) is not None]
+        A = np.array([sinal * matriz[colunas.index(coluna)] for coluna, sinal, _ in ativas])
+        b = np.array([sinal * valor for _, sinal, valor in ativas], dtype=float)
+        n = len(linhas)
         if use_portion_limits:
-            self._add_portion_constraints()
+            maximos = tabela['max_portions_daily'][linhas]
+            lb = np.array(tabela['min_portions_daily'][linhas])
+            ub = np.where(maximos > 0, maximos, np.inf)
+        else:
+            lb, ub = np.zeros(n), np.full(n, np.inf)
+        return matriz[0], A.reshape(len(ativas), n), b, lb, ub
+    
+    def _solve(self, metac, metap, metag, orcamento, excluded_foods=None, use_portion_limits=False, metacarb=None,
+               timer=NULL_TIMER, nutrient_targets=None, costs=None):
+        """Resolve a requisição sem consultar o cache (argumentos de optimize_diet)
+        
+        Fases medidas: no caminho PuLP exclusion_filter, variables, objective,
+        constraints, solve e extract; nos backends em processo model (compilação
+        ou reaproveitamento), solve e extract. Nos backends em processo, costs
+        (snapshot de FoodTable.cost_snapshot) fixa os preços da solução.
+        """
+        metas = self._targets(metac, metap, metag, orcamento, metacarb, nutrient_targets)
+        
+        # Backend em processo: modelo compilado compartilhado, com metas, limites e
+        # exclusões (limite superior zero) locais à requisição
+        if self.backend is not None:
+            with timer.phase('model'):
+                model = self._get_model()
+            return model.solve_request(
+                metas,
+                use_portion_limits=use_portion_limits,
+                excluded_foods=excluded_foods,
+                timer=timer,
+                costs=costs
+            )
+        
+        # Caminho PuLP: linhas restantes da tabela em um array local
+        import pulp
+        tabela = self.table
+        with timer.phase('exclusion_filter'):
+            linhas = self._remaining_rows(excluded_foods)
+        
+        # Criar o problema de minimização
+        with timer.phase('variables'):
+            problem = pulp.LpProblem("Otimizacao_Dieta", pulp.LpMinimize)
+            
+            # Criar variáveis de decisão
+            variaveis = self._create_decision_variables(tabela, linhas)
+        
+        # Definir função objetivo (uma expressão por linha da matriz de coeficientes:
+        # preço e só os nutrientes com meta ativa)
+        with timer.phase('objective'):
+            colunas = self._target_columns(metas)
+            expressoes = self._build_expressions(variaveis, colunas, self._coefficient_matrix(tabela, linhas, colunas))
+            self._set_objective_function(problem, expressoes)
+        
+        # Adicionar restrições
+        with timer.phase('constraints'):
+            self._add_nutritional_constraints(problem, expressoes, metas)
+            self._add_budget_constraint(problem, expressoes, orcamento)
+            
+            # Adicionar limites de porção se habilitado
+            if use_portion_limits:
+                self._add_portion_constraints(variaveis, tabela, linhas)
+        
+        # Resolver o problema
+        with timer.phase('solve'):
+            self._solve_problem(problem)
+        
+        # Retornar resultado
+        with timer.phase('extract'):
+            return self._prepare_result(problem, variaveis, tabela, linhas)
+    
+    def _remaining_rows(self, excluded_foods=None):
+        """Linhas da tabela que participam da otimização (máscara das exclusões)
+        
+        Returns:
+            numpy.ndarray: Índices das linhas não excluídas, em ordem
+        """
+        restantes = np.ones(len(self.table), dtype=bool)
+        if excluded_foods:
+            restantes[self.table.rows(excluded_foods)] = False
+        return np.flatnonzero(restantes)
+    
+    def _get_model(self):
+        """Retorna o modelo compilado compartilhado, compilando-o na primeira chamada"""
+        if self.model is None:
+            with self._model_lock:
+                if self.model is None:
+                    self.model = DietModel(self.table, backend=self.backend)
+        return self.model
+    
+    def optimize_many(self, profiles):
+        """Resolve vários perfis compartilhando a mesma tabela de alimentos
+        
+        A matriz de restrições é montada uma única vez; para cada perfil mudam
+        apenas o lado direito e os limites das variáveis (alimentos excluídos
+        ficam com limite superior zero).
+        
+        Args:
+            profiles (list): Dicionários com as chaves de optimize_diet (metac, metap,
+                metag, orcamento e, opcionalmente, excluded_foods, use_portion_limits, metacarb,
+                nutrient_targets)
+        
+        Returns:
+            list: Resultados na mesma ordem dos perfis
+        """
+        if self.backend is None:
+            return self._optimize_many_pulp(profiles)
+        
+        model = self._get_model()
+        resultados = []
+        for profile in profiles:
+            metas = self._targets(
+                profile.get('metac'), profile.get('metap'), profile.get('metag'), profile.get('orcamento'),
+                profile.get('metacarb'), profile.get('nutrient_targets')
+            )
+            resultados.append(model.solve_request(
+                metas,
+                use_portion_limits=profile.get('use_portion_limits', False),
+                excluded_foods=profile.get('excluded_foods')
+            ))
+        
+        return resultados
+    
+    def optimize_week(self, metac, metap, metag, orcamento, excluded_foods=None, use_portion_limits=False,
+                      metacarb=None, nutrient_targets=None, **opcoes):
+        """Planeja uma semana de dieta com limites semanais e de variedade
+        
+        As metas são diárias (valem para cada dia). Os dias são resolvidos em
+        paralelo sobre o modelo compilado e coordenados pelo teto semanal de
+        porções e pelo limite de dias por alimento (ver WeeklyPlanner).
+        
+        Args:
+            metac, metap, metag, orcamento, excluded_foods, use_portion_limits, metacarb,
+                nutrient_targets: Como em optimize_diet, por dia
+            **opcoes: Opções de WeeklyPlanner (days, weekly_caps, variety_categories,
+                max_days_per_food, max_rounds, max_workers)
+        
+        Returns:
+            dict: Totais da semana no formato de optimize_diet, com 'dias' e 'rodadas'
+        """
+        if self.backend is None:
+            raise ValueError("O planejamento semanal requer um backend em processo (ex: 'highs')")
+        from optimization.weekly_planner import WeeklyPlanner
+        planner = WeeklyPlanner(self._get_model(), **opcoes)
+        metas = self._targets(metac, metap, metag, orcamento, metacarb, nutrient_targets)
+        return planner.plan(metas, use_portion_limits=use_portion_limits, excluded_foods=excluded_foods)
+    
+    def cost_frontier(self, meta, inicio, fim, pontos=100, excluded_foods=None, use_portion_limits=False, **metas):
+        """Calcula a curva de custo mínimo em função de uma meta
         
-        # Resolver o problema com fallback: tentar GLPK e, em caso de falha, usar CBC
+        Com backend em processo, os pontos são resolvidos em sequência sobre o
+        modelo compilado, reaproveitando a base ótima entre pontos (LP
+        paramétrico): o solver só é chamado quando a base muda. Cada ponto
+        resolvido é uma fase 'frontier_point' para os hooks de tempo.
+        
+        Args:
+            meta (str): Meta variada: 'metac', 'metap', 'metag', 'metacarb', 'orcamento' ou
+                uma meta de nutriente de TARGET_ROWS (ex: 'fibra_min')
+            inicio (float): Primeiro valor da meta
+            fim (float): Último valor da meta
+            pontos (int): Número de pontos da curva
+            excluded_foods (list): Alimentos excluídos
+            use_portion_limits (bool): Se deve aplicar limites de porção por dia
+            **metas: Valores fixos das demais metas, incluindo as de nutrientes (ausentes
+                ficam desativadas); uma meta desconhecida gera ValueError nos dois caminhos
+        
+        Returns:
+            dict: meta, valores, custos (None onde inviável), custos_marginais
+                (R$ por unidade da meta) e resolucoes (chamadas ao solver)
+        """
+        valores = np.linspace(inicio, fim, pontos).tolist()
+        curva = {'meta': meta, 'valores': valores, 'custos': [], 'custos_marginais': [], 'resolucoes': 0}
+        
+        timer = make_timer(self.collect_timings, self.timing_hooks)
+        if self.backend is None:
+            # Caminho PuLP: um LP por ponto (o PuLP não aceita lado direito infinito,
+            # então metas máximas ausentes viram um limite folgado). As metas de
+            # nutrientes (fibra_min, sodio_max...) seguem por nutrient_targets
+            fixas = {'metac': 0, 'metap': 0, 'metag': 1e9, 'orcamento': 1e9}
+            fixas.update(metas)
+            for valor in valores:
+                fixas[meta] = valor
+                nutrientes = self._nutrient_overrides(
+                    {nome: alvo for nome, alvo in fixas.items() if nome not in _REQUEST_TARGETS}
+                )
+                with timer.phase('frontier_point'):
+                    resultado = self._solve(
+                        fixas['metac'], fixas['metap'], fixas['metag'], fixas['orcamento'],
+                        excluded_foods=excluded_foods, use_portion_limits=use_portion_limits,
+                        metacarb=fixas.get('metacarb'), nutrient_targets=nutrientes
+                    )
+                curva['custos'].append(resultado['custo_total'] if resultado['status'] == 'Optimal' else None)
+                curva['custos_marginais'].append(None)
+                curva['resolucoes'] += 1
+            return curva
+        
+        model = DietModel(self.table, backend=self.backend)
+        model.update_targets(**metas)
+        model.update_bounds(use_portion_limits=use_portion_limits, excluded_foods=excluded_foods or ())
+        for _, resultado, marginal in model.sweep(meta, valores, timer):
+            curva['custos'].append(resultado['custo_total'] if resultado['status'] == 'Optimal' else None)
+            curva['custos_marginais'].append(marginal)
+        curva['resolucoes'] = model.stats['solves'] - model.stats['warm_starts']
+        return curva
+    
+    def _nutrient_overrides(self, metas):
+        """Converte metas de nutrientes por nome ('fibra_min', 'sodio_max'...) em nutrient_targets
+        
+        O outro limite de cada nutriente fica com o padrão de NUTRIENTS.
+        
+        Args:
+            metas (dict): Meta -> valor (None desativa)
+        
+        Returns:
+            dict: Nutriente -> [mínimo, máximo], no formato de optimize_diet
+        
+        Raises:
+            ValueError: Meta desconhecida
+        """
+        padrao = resolve_nutrient_targets(self.table)
+        linhas = {nome: (coluna, sinal) for nome, coluna, sinal in TARGET_ROWS if nome not in _REQUEST_TARGETS}
+        nutrientes = {}
+        for nome, valor in metas.items():
+            if nome not in linhas:
+                raise ValueError(f"Meta desconhecida: {nome}")
+            coluna, sinal = linhas[nome]
+            limites = nutrientes.setdefault(
+                coluna, [padrao.get(target_name(coluna, 'min')), padrao.get(target_name(coluna, 'max'))]
+            )
+            limites[0 if sinal < 0 else 1] = valor
+        return nutrientes
+    
+    def _optimize_many_pulp(self, profiles):
+        """Resolve os perfis um a um pelo caminho PuLP, reaproveitando a tabela de alimentos"""
+        return [
+            self.optimize_diet(
+                profile['metac'],
+                profile['metap'],
+                profile['metag'],
+                profile['orcamento'],
+                excluded_foods=profile.get('excluded_foods'),
+                use_portion_limits=profile.get('use_portion_limits', False),
+                metacarb=profile.get('metacarb'),
+                nutrient_targets=profile.get('nutrient_targets')
+            )
+            for profile in profiles
+        ]
+    
+    def _solve_problem(self, problem):
+        """Resolve o problema PuLP com fallback: tentar GLPK e, em caso de falha, usar CBC"""
+        import pulp
         try:
-            self.problem.solve(pulp.GLPK_CMD(msg=0))
+            problem.solve(pulp.GLPK_CMD(msg=0))
         except (pulp.PulpSolverError, OSError):
             # GLPK não disponível, usar solver interno CBC
-            self.problem.solve(pulp.PULP_CBC_CMD(msg=0))
+            problem.solve(pulp.PULP_CBC_CMD(msg=0))
+    
+    def _create_decision_variables(self, tabela, linhas):
+        """Cria as variáveis de decisão (quantidade de cada alimento)
         
-        # Retornar resultado
-        return self._prepare_result()
-    
-    def _create_decision_variables(self):
-        """Cria as variáveis de decisão (quantidade de cada alimento)"""
-        self.food_vars = {}
-        for i, food in enumerate(self.alimentos):
-            self.food_vars[food['nome']] = pulp.LpVariable(
-                f"x_{i}_{food['nome']}", 
-                lowBound=0, 
-                cat='Continuous'
-            )
+        Returns:
+            list: Variáveis PuLP na ordem das linhas
+        """
+        import pulp
+        nomes = tabela.names
+        return [
+            pulp.LpVariable(f"x_{i}_{nomes[linha]}", lowBound=0, cat='Continuous')
+            for i, linha in enumerate(linhas.tolist())
+        ]
+    
+    @staticmethod
+    def _target_columns(metas):
+        """Colunas da matriz de coeficientes: preço (objetivo e orçamento) e os nutrientes com meta ativa"""
+        colunas = ['preco']
+        for meta, coluna, _ in TARGET_ROWS:
+            if metas.get(meta) is not None and coluna not in colunas:
+                colunas.append(coluna)
+        return tuple(colunas)
+    
+    def _coefficient_matrix(self, tabela, linhas, colunas):
+        """Matriz (colunas x alimentos) com preços e nutrientes das linhas"""
+        return np.vstack([tabela[coluna][linhas] for coluna in colunas])
+    
+    def _build_expressions(self, variaveis, colunas, matriz):
+        """Monta uma expressão linear por linha da matriz, de uma só vez
+        
+        Returns:
+            dict: Coluna -> LpAffineExpression
+        """
+        import pulp
+        return {
+            coluna: pulp.LpAffineExpression(zip(variaveis, coeficientes))
+            for coluna, coeficientes in zip(colunas, matriz.tolist())
+        }
     
-    def _set_objective_function(self):
+    def _set_objective_function(self, problem, expressoes):
         """Define a função objetivo: minimizar custo total"""
-        self.problem += pulp.lpSum([
-            self.food_vars[food['nome']] * food['preco'] 
-            for food in self.alimentos
-        ])
-    
-    def _add_nutritional_constraints(self, metac, metap, metag, metacarb=None):
-        """Adiciona restrições nutricionais"""
-        # Calorias mínimas
-        self.problem += pulp.lpSum([
-            self.food_vars[food['nome']] * food['calorias'] 
-            for food in self.alimentos
-        ]) >= metac
-        
-        # Proteína mínima
-        self.problem += pulp.lpSum([
-            self.food_vars[food['nome']] * food['proteina'] 
-            for food in self.alimentos
-        ]) >= metap
-        
-        # Gordura máxima
-        self.problem += pulp.lpSum([
-            self.food_vars[food['nome']] * food['gordura'] 
-            for food in self.alimentos
-        ]) <= metag
-        
-        # Carboidrato máximo (opcional)
-        if metacarb is not None:
-            self.problem += pulp.lpSum([
-                self.food_vars[food['nome']] * food.get('carboidrato', 0) 
-                for food in self.alimentos
-            ]) <= metacarb
-    
-    def _add_budget_constraint(self, orcamento):
-        """Adiciona restrição de orçamento"""
-        self.problem += pulp.lpSum([
-            self.food_vars[food['nome']] * food['preco'] 
-            for food in self.alimentos
-        ]) <= orcamento
-    
-    def _add_portion_constraints(self):
-        """Adiciona restrições de limite de porções diárias"""
-        for food in self.alimentos:
-            nome = food['nome']
-            
-            # Limite mínimo de porções
-            if food.get('min_portions_daily', 0) > 0:
-                self.problem += self.food_vars[nome] >= food['min_portions_daily']
-            
-            # Limite máximo de porções
-            if food.get('max_portions_daily'):
-                self.problem += self.food_vars[nome] <= food['max_portions_daily']
+        problem.setObjective(expressoes['preco'])
     
-    def _prepare_result(self):
+    def _add_nutritional_constraints(self, problem, expressoes, metas):
+        """Adiciona uma restrição por limite de nutriente ativo (linhas de TARGET_ROWS)"""
+        import pulp
+        # LpConstraint guarda a própria expressão, sem copiá-la termo a termo
+        for meta, coluna, sinal in TARGET_ROWS:
+            if coluna == 'preco' or metas.get(meta) is None:
+                continue
+            sentido = pulp.LpConstraintGE if sinal < 0 else pulp.LpConstraintLE
+            problem += pulp.LpConstraint(expressoes[coluna], sentido, rhs=metas[meta])
+    
+    def _add_budget_constraint(self, problem, expressoes, orcamento):
+        """Adiciona restrição de orçamento (mesma expressão da função objetivo)"""
+        import pulp
+        problem += pulp.LpConstraint(expressoes['preco'], pulp.LpConstraintLE, rhs=orcamento)
+    
+    def _add_portion_constraints(self, variaveis, tabela, linhas):
+        """Aplica os limites de porções diárias como limites das variáveis"""
+        minimos = tabela['min_portions_daily'][linhas]
+        maximos = tabela['max_portions_daily'][linhas]
+        
+        # Limite mínimo de porções
+        for i in np.flatnonzero(minimos > 0).tolist():
+            variaveis[i].lowBound = float(minimos[i])
+        
+        # Limite máximo de porções
+        for i in np.flatnonzero(maximos > 0).tolist():
+            variaveis[i].upBound = float(maximos[i])
+    
+    def _prepare_result(self, problem, variaveis, tabela, linhas):
         """Prepara o resultado da otimização"""
-        resultado = {
-            'status': pulp.LpStatus[self.problem.status],
-            'quantidades': {},
-            'custo_total': 0,
-            'detalhes': {
-                'calorias_total': 0,
-                'proteina_total': 0,
-                'gordura_total': 0,
-                'carboidrato_total': 0
-            }
-        }
+        import pulp
+        x = None
+        if problem.status == pulp.LpStatusOptimal:
+            x = np.array([variavel.varValue or 0 for variavel in variaveis], dtype=float)
+        return self._vector_result(pulp.LpStatus[problem.status], x, tabela, linhas)
+    
+    def _vector_result(self, status, x, tabela, linhas):
+        """Monta o resultado a partir das quantidades das linhas (x None: sem solução)"""
+        resultado = empty_result(status, tabela)
         
-        if self.problem.status == pulp.LpStatusOptimal:
-            self._extract_optimal_quantities(resultado)
+        if x is not None:
+            self._extract_optimal_quantities(resultado, x, tabela, linhas)
         
         return resultado
     
-    def _extract_optimal_quantities(self, resultado):
+    def _extract_optimal_quantities(self, resultado, x, tabela, linhas):
         """Extrai as quantidades ótimas da solução"""
-        # Lista formatada para interface gráfica
-        resultado['alimentos'] = []
+        nomes = [tabela.names[linha] for linha in linhas.tolist()]
+        resultado['quantidades'] = dict(zip(nomes, x.tolist()))
         
-        for food in self.alimentos:
-            qtd = self.food_vars[food['nome']].varValue or 0
-            resultado['quantidades'][food['nome']] = qtd
-            
-            # Calcular totais
-            resultado['custo_total'] += qtd * food['preco']
-            resultado['detalhes']['calorias_total'] += qtd * food['calorias']
-            resultado['detalhes']['proteina_total'] += qtd * food['proteina']
-            resultado['detalhes']['gordura_total'] += qtd * food['gordura']
-            resultado['detalhes']['carboidrato_total'] += qtd * food.get('carboidrato', 0)
-            
-            # Adicionar formato esperado pela interface
-            if qtd > 0.01:  # Apenas alimentos com quantidade significativa
-                resultado['alimentos'].append({
-                    'nome': food['nome'],
-                    'quantidade': qtd,
-                    'calorias': qtd * food['calorias'],
-                    'proteina': qtd * food['proteina'],
-                    'gordura': qtd * food['gordura'],
-                    'carboidrato': qtd * food.get('carboidrato', 0),
-                    'custo': qtd * food['preco']
-                })
+        # Totais de custo e de todos os nutrientes em um único produto matriz-vetor
+        # com a matriz de nutrientes da tabela; excluídos entram com quantidade zero
+        completo = np.zeros(len(tabela))
+        completo[linhas] = x
+        resultado['custo_total'], resultado['detalhes'], resultado['alimentos'] = solution_totals(
+            tabela, completo, tabela['preco']
+        )
+
 
 def optimize_diet(metac, metap, metag, orcamento, excluded_foods=None, use_portion_limits=False):
     """Função de conveniência para otimização de dieta
@@ -180,8 +693,62 @@ def optimize_diet(metac, metap, metag, orcamento, excluded_foods=None, use_porti
     Returns:
         dict: Resultado da otimização
     """
-    optimizer = DietOptimizer()
-    return optimizer.optimize_diet(metac, metap, metag, orcamento, excluded_foods, use_portion_limits)
+    return get_optimizer().optimize_diet(metac, metap, metag, orcamento, excluded_foods, use_portion_limits)
+
+
+# Otimizador compartilhado pelas funções de conveniência do processo
+_shared_optimizer = None
+_shared_optimizer_lock = threading.Lock()
+
+
+def get_optimizer():
+    """Retorna o otimizador compartilhado do processo (seguro entre threads)
+    
+    É recriado apenas quando a tabela de alimentos é substituída.
+    
+    Returns:
+        DietOptimizer: Otimizador com o backend padrão
+    """
+    global _shared_optimizer
+    with _shared_optimizer_lock:
+        if _shared_optimizer is None or _shared_optimizer.table is not get_food_table():
+            _shared_optimizer = DietOptimizer()
+        return _shared_optimizer
+
+
+def _optimize_chunk(args):
+    """Resolve um bloco de perfis em um processo de trabalho"""
+    profiles, backend = args
+    return DietOptimizer(backend).optimize_many(profiles)
+
+
+def optimize_many(profiles, processes=None, backend=None, chunk_size=256):
+    """Resolve uma lista de perfis de dieta em uma única chamada
+    
+    Args:
+        profiles (list): Dicionários com os argumentos de optimize_diet
+        processes (int, optional): Número de processos; None ou 1 resolve no processo atual
+        backend (str, optional): Nome do backend de solução (padrão: SOLVER_BACKEND)
+        chunk_size (int): Perfis enviados por tarefa a cada processo
+    
+    Returns:
+        list: Resultados na mesma ordem dos perfis
+    """
+    profiles = list(profiles)
+    if not processes or processes <= 1 or len(profiles) <= chunk_size:
+        return DietOptimizer(backend).optimize_many(profiles)
+    
+    chunks = [
+        (profiles[i:i + chunk_size], backend)
+        for i in range(0, len(profiles), chunk_size)
+    ]
+    from concurrent.futures import ProcessPoolExecutor
+    resultados = []
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        # map preserva a ordem de entrada
+        for parcial in executor.map(_optimize_chunk, chunks):
+            resultados.extend(parcial)
+    return resultados
 
 
 def exemplo_otimizacao_dieta():
@@ -0,0 +1,234 @@
+"""
+Diagnóstico de inviabilidade por LP elástico
+
+Quando não existe dieta que atenda a todas as metas, cada meta, o orçamento
+e os limites de porção ganham uma folga penalizada. O LP elástico resultante
+é sempre viável, e sua solução ótima indica a relaxação mais barata (em
+variação relativa, ponderada por RELAXATION_PENALTIES) que torna o problema
+viável, por exemplo "Aumente o orçamento em R$ 3.20".
+
+Na forma matricial (A·x <= b, lb <= x <= ub), as quantidades são escritas como
+x = p + q - r, com lb <= p <= ub, q >= 0 (porções acima do máximo) e
+0 <= r <= lb (porções abaixo do mínimo); cada linha i ganha a folga s_i:
+
+    minimizar    Σ w·s/|b| + Σ w·r/lb + Σ w·q/ub + ε·c·x
+    sujeito a    A·(p + q - r) - s <= b
+
+Nos modos de porção inteira ou meia porção, p, q e r ficam na grade de
+múltiplos de step (MILP elástico): o LP contínuo costuma ser viável mesmo
+quando a grade não é, e não apontaria o que relaxar.
+"""
+
+import math
+
+import numpy as np
+
+from config.constants import CATEGORY_PORTION_LIMITS, NUMERICAL_TOLERANCE, NUTRIENTS, RELAXATION_PENALTIES
+from optimization.diet_model import TARGET_ROWS
+from optimization.integer_portions import grid_bounds, solve_exact
+from optimization.lp_backends import STATUS_OPTIMAL, PulpMatrixBackend
+
+# Peso do custo dos alimentos no LP elástico: só desempata relaxações iguais
+COST_WEIGHT = 1e-6
+
+# Meta -> (texto para reduzir ou aumentar, unidade, casas decimais)
+TARGET_TEXTS = {
+    'metac': ("as calorias mínimas", "kcal", 0),
+    'metap': ("a proteína mínima", "g", 1),
+    'metag': ("a gordura máxima", "g", 1),
+    'metacarb': ("o carboidrato máximo", "g", 1),
+    'orcamento': ("o orçamento", "R$", 2),
+}
+
+
+def target_text(meta):
+    """Texto, unidade e casas decimais de uma meta (as de nutrientes vêm de NUTRIENTS)"""
+    if meta in TARGET_TEXTS:
+        return TARGET_TEXTS[meta]
+    for nome, coluna, sinal in TARGET_ROWS:
+        if nome == meta:
+            nutriente = NUTRIENTS[coluna]
+            limite = "o mínimo" if sinal < 0 else "o máximo"
+            nome = nutriente['nome'][0].lower() + nutriente['nome'][1:]
+            return (f"{limite} de {nome}", nutriente['unidade'], 1)
+    return (meta, "", 2)
+
+
+def _round_towards(valor, casas, para_cima):
+    """Arredonda na direção que preserva a viabilidade (para cima ou para baixo)"""
+    fator = 10 ** casas
+    arredondar = math.ceil if para_cima else math.floor
+    return arredondar(valor * fator - (NUMERICAL_TOLERANCE if para_cima else -NUMERICAL_TOLERANCE)) / fator
+
+
+def describe_relaxation(relaxacao):
+    """Texto da sugestão de uma relaxação
+
+    Args:
+        relaxacao (dict): Item de 'relaxacoes' do diagnóstico
+
+    Returns:
+        str: Sugestão em português
+    """
+    if relaxacao['tipo'] == 'meta':
+        texto, unidade, casas = target_text(relaxacao['meta'])
+        verbo = "Aumente" if relaxacao['sugerido'] > relaxacao['atual'] else "Reduza"
+        variacao = abs(relaxacao['sugerido'] - relaxacao['atual'])
+        if unidade == "R$":
+            return f"{verbo} {texto} em R$ {variacao:.2f} (para R$ {relaxacao['sugerido']:.2f})"
+        return f"{verbo} {texto} em {variacao:.{casas}f} {unidade} (para {relaxacao['sugerido']:.{casas}f} {unidade})"
+    limite = "mínimo" if relaxacao['tipo'] == 'porcao_min' else "máximo"
+    verbo = "Reduza" if relaxacao['tipo'] == 'porcao_min' else "Aumente"
+    return (f"{verbo} o {limite} de porções de {relaxacao['categoria']} "
+            f"de {relaxacao['atual']:g} para {relaxacao['sugerido']:g}")
+
+
+def _solve_elastic_on_grid(backend, c, A, b, lb, ub, colunas, step, milp_options):
+    """Resolve o problema elástico com as colunas de alimento na grade de step
+
+    Args:
+        colunas (int): Número de colunas iniciais (p, r e q) que ficam na grade;
+            as demais (folgas das linhas) são contínuas
+        milp_options (dict): time_limit, mip_gap e threads
+
+    Returns:
+        dict: status e x (nas unidades originais, ou None)
+    """
+    escala = np.ones(len(c))
+    escala[:colunas] = step
+    inteiras = np.zeros(len(c))
+    inteiras[:colunas] = 1
+    if not hasattr(backend, 'solve_integer'):
+        backend = PulpMatrixBackend()
+    solucao = backend.solve_integer(
+        c * escala, A * escala, b, lb / escala, ub / escala,
+        milp_options['time_limit'], milp_options['mip_gap'], milp_options['threads'], integrality=inteiras
+    )
+    if solucao['x'] is not None:
+        x = np.asarray(solucao['x'], dtype=float)
+        x[:colunas] = np.round(x[:colunas])
+        solucao['x'] = x * escala
+    return solucao
+
+
+def diagnose_infeasibility(c, A, b, lb, ub, metas, categorias, backend, step=None, milp_options=None):
+    """Encontra a relaxação mais barata que torna o problema viável
+
+    Args:
+        c, A, b, lb, ub: Problema inviável na forma matricial (linhas de metas
+            mínimas com sinal -1, como em TARGET_ROWS)
+        metas (list): Meta de cada linha de A (ex: ['metac', 'metap', 'orcamento'])
+        categorias (list): Categoria de cada coluna (alimento)
+        backend (object): Backend com método solve(c, A_ub, b_ub, lb, ub)
+        step (float, optional): Passo de porção dos modos inteiros; com ele o
+            diagnóstico e a conferência são feitos na grade (MILP)
+        milp_options (dict, optional): time_limit, mip_gap e threads do MILP
+            (obrigatório com step)
+
+    Returns:
+        dict: status do LP elástico, 'relaxacoes' (tipo, meta ou categoria, atual,
+            sugerido e mensagem, da maior para a menor penalidade), 'metas_relaxadas'
+            (meta -> valor sugerido) e 'custo_estimado' (custo da dieta com todas
+            as relaxações aplicadas, ou None)
+    """
+    tol = NUMERICAL_TOLERANCE
+    m, n = A.shape
+    lb = np.asarray(lb, dtype=float)
+    ub = np.asarray(ub, dtype=float)
+    if step is not None:
+        lb, ub = grid_bounds(lb, ub, step)
+    sinal_da_meta = {meta: sinal for meta, _, sinal in TARGET_ROWS}
+    sinais = np.array([sinal_da_meta[meta] for meta in metas])
+    valores_meta = sinais * b
+
+    # Colunas de folga: r (abaixo do mínimo) e q (acima do máximo) por alimento
+    abaixo = np.flatnonzero(lb > tol)
+    acima = np.flatnonzero(np.isfinite(ub) & (ub > lb))
+    pesos_linha = np.array([RELAXATION_PENALTIES.get(meta, 1.0) for meta in metas]) / np.maximum(np.abs(b), 1)
+
+    A_el = np.hstack([A, -A[:, abaixo], A[:, acima], -np.eye(m)])
+    c_el = np.concatenate([
+        COST_WEIGHT * c,
+        -COST_WEIGHT * c[abaixo] + RELAXATION_PENALTIES['portion_min'] / lb[abaixo],
+        COST_WEIGHT * c[acima] + RELAXATION_PENALTIES['portion_max'] / np.maximum(ub[acima], 1),
+        pesos_linha,
+    ])
+    # Metas mínimas não podem ficar abaixo de zero
+    folga_max = np.where(sinais < 0, valores_meta, np.inf)
+    lb_el = np.concatenate([lb, np.zeros(len(abaixo) + len(acima) + m)])
+    ub_el = np.concatenate([ub, lb[abaixo], np.full(len(acima), np.inf), np.maximum(folga_max, 0)])
+
+    if step is None:
+        solucao = backend.solve(c_el, A_el, b, lb_el, ub_el)
+    else:
+        solucao = _solve_elastic_on_grid(backend, c_el, A_el, b, lb_el, ub_el, n + len(abaixo) + len(acima), step,
+                                         milp_options)
+    diagnostico = {'status': solucao['status'], 'relaxacoes': [], 'metas_relaxadas': {}, 'custo_estimado': None}
+    if solucao['status'] != STATUS_OPTIMAL:
+        return diagnostico
+
+    z = solucao['x']
+    r = z[n:n + len(abaixo)]
+    q = z[n + len(abaixo):n + len(abaixo) + len(acima)]
+    s = z[n + len(abaixo) + len(acima):]
+
+    relaxacoes = []
+    novo_b = b.copy()
+    for i, meta in enumerate(metas):
+        if s[i] <= tol * (1 + abs(b[i])):
+            continue
+        _, _, casas = target_text(meta)
+        sugerido = _round_towards(valores_meta[i] + sinais[i] * s[i], casas, sinais[i] > 0)
+        sugerido = max(sugerido, 0.0)
+        novo_b[i] = sinais[i] * sugerido
+        diagnostico['metas_relaxadas'][meta] = sugerido
+        relaxacoes.append(({'tipo': 'meta', 'meta': meta, 'atual': float(valores_meta[i]), 'sugerido': sugerido},
+                           pesos_linha[i] * s[i]))
+
+    # Limites de porção: um novo limite por categoria, que vale para todos os seus alimentos
+    novo_lb, novo_ub = lb.copy(), ub.copy()
+    for tipo, colunas, folgas in (('porcao_min', abaixo, r), ('porcao_max', acima, q)):
+        por_categoria = {}
+        for coluna, folga in zip(colunas.tolist(), folgas.tolist()):
+            if folga > tol:
+                por_categoria.setdefault(categorias[coluna], []).append((coluna, folga))
+        for categoria, itens in por_categoria.items():
+            membros = np.array([j for j, nome in enumerate(categorias) if nome == categoria])
+            if tipo == 'porcao_min':
+                atual = float(lb[membros].max())
+                sugerido = _round_towards(min(lb[j] - folga for j, folga in itens), 2, False)
+                sugerido = max(sugerido, 0.0)
+                novo_lb[membros] = np.minimum(novo_lb[membros], sugerido)
+                penalidade = RELAXATION_PENALTIES['portion_min'] * sum(folga / lb[j] for j, folga in itens)
+            else:
+                atual = float(ub[membros][np.isfinite(ub[membros])].min())
+                sugerido = _round_towards(max(ub[j] + folga for j, folga in itens), 2, True)
+                novo_ub[membros] = np.maximum(novo_ub[membros], sugerido)
+                penalidade = RELAXATION_PENALTIES['portion_max'] * sum(folga / max(ub[j], 1) for j, folga in itens)
+            relaxacoes.append(({'tipo': tipo, 'categoria': categoria, 'atual': atual, 'sugerido': sugerido},
+                               penalidade))
+
+    relaxacoes.sort(key=lambda item: -item[1])
+    for relaxacao, _ in relaxacoes:
+        relaxacao['mensagem'] = describe_relaxation(relaxacao)
+        diagnostico['relaxacoes'].append(relaxacao)
+
+    # Confere a sugestão: a dieta com todas as relaxações aplicadas
+    if step is None:
+        verificacao = backend.solve(c, A, novo_b, novo_lb, novo_ub)
+    else:
+        verificacao = solve_exact(backend, c, A, novo_b, novo_lb, novo_ub, step, milp_options['time_limit'],
+                                  milp_options['mip_gap'], milp_options['threads'])
+    if verificacao['status'] == STATUS_OPTIMAL and verificacao['x'] is not None:
+        diagnostico['custo_estimado'] = float(c @ verificacao['x'])
+    return diagnostico
+
+
+def food_categories(table, linhas):
+    """Categoria de cada linha, com o nome do alimento quando não há categoria com limites"""
+    categorias = table['categoria']
+    nomes = table.names
+    return [
+        categorias[linha] if categorias[linha] in CATEGORY_PORTION_LIMITS else nomes[linha]
+        for linha in np.asarray(linhas).tolist()
+    ]
@@ -0,0 +1,91 @@
+"""
+Medição de tempo por fase da otimização, com hooks plugáveis
+"""
+
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+# Hooks globais do processo, chamados como hook(fase, segundos)
+_timing_hooks = []
+
+
+def add_timing_hook(hook):
+    """Registra um hook chamado ao fim de cada fase de toda otimização
+
+    Args:
+        hook (callable): Função hook(fase, segundos)
+    """
+    if hook not in _timing_hooks:
+        _timing_hooks.append(hook)
+
+
+def remove_timing_hook(hook):
+    """Remove um hook registrado com add_timing_hook"""
+    if hook in _timing_hooks:
+        _timing_hooks.remove(hook)
+
+
+def get_timing_hooks():
+    """Retorna os hooks globais registrados
+
+    Returns:
+        tuple: Hooks na ordem de registro
+    """
+    return tuple(_timing_hooks)
+
+
+class PhaseTimer:
+    """Acumula a duração de cada fase (em segundos) e repassa aos hooks"""
+
+    enabled = True
+
+    def __init__(self, hooks=()):
+        """Inicializa o medidor
+
+        Args:
+            hooks (iterable): Funções hook(fase, segundos) chamadas ao fim de cada fase
+        """
+        self.timings = {}
+        self.hooks = tuple(hooks)
+
+    @contextmanager
+    def phase(self, nome):
+        """Mede o bloco como a fase informada"""
+        inicio = perf_counter()
+        try:
+            yield
+        finally:
+            duracao = perf_counter() - inicio
+            self.timings[nome] = self.timings.get(nome, 0.0) + duracao
+            for hook in self.hooks:
+                hook(nome, duracao)
+
+
+class NullTimer:
+    """Medidor desativado: phase devolve sempre o mesmo contexto vazio"""
+
+    enabled = False
+    timings = None
+    _context = nullcontext()
+
+    def phase(self, nome):
+        return self._context
+
+
+NULL_TIMER = NullTimer()
+
+
+def make_timer(collect=False, hooks=()):
+    """Cria o medidor adequado à configuração
+
+    Args:
+        collect (bool): Se os tempos devem ser devolvidos no resultado
+        hooks (iterable): Hooks da instância, somados aos hooks globais
+
+    Returns:
+        PhaseTimer or NullTimer: NULL_TIMER quando não há nada a medir
+    """
+    hooks = tuple(hooks) + get_timing_hooks()
+    if not collect and not hooks:
+        return NULL_TIMER
+    return PhaseTimer(hooks)
@@ -0,0 +1,174 @@
+"""
+Porções inteiras (ou meias porções): heurística de arredondamento e reparo da
+relaxação linear e solução exata como MILP com limite de tempo
+
+Todas as funções recebem o problema na forma matricial usada pelos backends:
+
+    minimizar    c · x
+    sujeito a    A · x <= b
+                 lb <= x <= ub,  x múltiplo de step
+"""
+
+import numpy as np
+
+from config.constants import NUMERICAL_TOLERANCE, PORTION_MODES
+from optimization.lp_backends import STATUS_INFEASIBLE, PulpMatrixBackend
+
+
+def portion_step(portion_mode):
+    """Tamanho do passo de porção de um modo
+
+    Args:
+        portion_mode (str): Chave de PORTION_MODES ('continuous', 'integer' ou 'half')
+
+    Returns:
+        float or None: Passo (None para porções contínuas)
+    """
+    if portion_mode not in PORTION_MODES:
+        raise ValueError(f"Modo de porção desconhecido: {portion_mode}")
+    return PORTION_MODES[portion_mode]
+
+
+def grid_bounds(lb, ub, step):
+    """Arredonda os limites para dentro da grade de múltiplos de step"""
+    tol = NUMERICAL_TOLERANCE
+    lb = np.ceil(np.asarray(lb) / step - tol) * step
+    ub = np.where(np.isfinite(ub), np.floor(np.asarray(ub) / step + tol) * step, np.inf)
+    return lb, ub
+
+
+def round_and_repair(x, c, A, b, lb, ub, step, max_moves=1000):
+    """Converte a solução da relaxação linear em um plano na grade de porções
+
+    Arredonda as quantidades para baixo (o que preserva as metas máximas, de
+    coeficientes não negativos) e repara as restrições violadas somando ou
+    tirando um passo por vez, escolhendo o movimento que mais reduz a violação
+    por real gasto. Se o reparo falhar, repete a partir do arredondamento para
+    o múltiplo mais próximo. Por fim remove os passos que sobraram, dos
+    alimentos mais caros para os mais baratos.
+
+    Args:
+        x (numpy.ndarray): Solução ótima da relaxação linear
+        c, A, b, lb, ub: Problema na forma matricial
+        step (float): Passo de porção
+        max_moves (int): Máximo de movimentos de reparo por tentativa
+
+    Returns:
+        numpy.ndarray or None: Plano viável na grade, ou None se o reparo falhar
+    """
+    lb, ub = grid_bounds(lb, ub, step)
+    if np.any(lb > ub):
+        return None
+    # Linhas em escala comparável (kcal e gramas pesam igual na violação)
+    escala = 1 + np.abs(b)
+    A = A / escala[:, None]
+    b = b / escala
+    for arredondar in (np.floor, np.round):
+        inicio = np.clip(arredondar(x / step + NUMERICAL_TOLERANCE) * step, lb, ub)
+        y = _repair(inicio, c, A, b, lb, ub, step, max_moves)
+        if y is not None:
+            return _drop_surplus(y, c, A, b, lb, step)
+    return None
+
+
+def _repair(y, c, A, b, lb, ub, step, max_moves):
+    """Soma ou tira um passo por vez até que A·y <= b (None se travar)"""
+    tol = NUMERICAL_TOLERANCE
+    passo = A * step
+    custo_passo = np.maximum(c * step, tol)
+    for _ in range(max_moves):
+        folga = A @ y - b
+        violacao = np.maximum(folga - tol, 0).sum()
+        if violacao == 0:
+            return y
+        # Violação restante após somar (mais) ou tirar (menos) um passo de cada alimento
+        mais = np.maximum(folga[:, None] + passo - tol, 0).sum(axis=0)
+        menos = np.maximum(folga[:, None] - passo - tol, 0).sum(axis=0)
+        mais[y + step > ub] = np.inf
+        menos[y - step < lb] = np.inf
+        # Tirar um passo nunca aumenta o custo: só pesa a redução da violação
+        ganho_mais = (violacao - mais) / custo_passo
+        ganho_menos = (violacao - menos) / tol
+        j_mais = int(np.argmax(ganho_mais))
+        j_menos = int(np.argmax(ganho_menos))
+        y = y.copy()
+        if max(ganho_mais[j_mais], ganho_menos[j_menos]) > 0:
+            if ganho_menos[j_menos] >= ganho_mais[j_mais]:
+                y[j_menos] -= step
+            else:
+                y[j_mais] += step
+            continue
+
+        # Nenhum passo isolado ajuda: trocar um passo de um alimento usado por um de outro
+        troca = _best_swap(y, folga, violacao, c, passo, lb, ub, step)
+        if troca is None:
+            return None
+        y[troca[0]] -= step
+        y[troca[1]] += step
+    return None
+
+
+def _best_swap(y, folga, violacao, c, passo, lb, ub, step):
+    """Melhor troca (tirar um passo de j, somar um de k) que reduz a violação
+
+    Returns:
+        tuple or None: (j, k), ou None se nenhuma troca reduzir a violação
+    """
+    tol = NUMERICAL_TOLERANCE
+    melhor, melhor_ganho = None, 0.0
+    livres = y + step > ub
+    for j in np.flatnonzero(y - step >= lb).tolist():
+        restante = folga - passo[:, j]
+        apos = np.maximum(restante[:, None] + passo - tol, 0).sum(axis=0)
+        apos[livres] = np.inf
+        apos[j] = np.inf
+        ganho = (violacao - apos) / np.maximum((c - c[j]) * step, tol)
+        k = int(np.argmax(ganho))
+        if ganho[k] > melhor_ganho:
+            melhor, melhor_ganho = (j, k), ganho[k]
+    return melhor
+
+
+def _drop_surplus(y, c, A, b, lb, step):
+    """Remove passos desnecessários, dos alimentos mais caros para os mais baratos"""
+    tol = NUMERICAL_TOLERANCE
+    passo = A * step
+    folga = A @ y - b
+    for j in np.argsort(-c * (y > lb)).tolist():
+        if y[j] <= lb[j] or c[j] <= 0:
+            break
+        while y[j] - step >= lb[j] and np.all(folga - passo[:, j] <= tol):
+            y[j] -= step
+            folga -= passo[:, j]
+    return y
+
+
+def solve_exact(backend, c, A, b, lb, ub, step, time_limit, mip_gap, threads):
+    """Resolve o MILP de porções com limite de tempo
+
+    Com um backend em processo que implemente solve_integer (HiGHS), o MILP é
+    resolvido dentro do processo; caso contrário, pelo CBC via PuLP.
+
+    Args:
+        backend (object or None): Backend em processo, ou None para o CBC
+        c, A, b, lb, ub: Problema na forma matricial
+        step (float): Passo de porção
+        time_limit (float): Limite de tempo em segundos
+        mip_gap (float): Gap relativo aceito
+        threads (int): Threads do solver (quando suportado)
+
+    Returns:
+        dict: status e x (plano na grade, ou None se nenhuma solução inteira foi encontrada)
+    """
+    # Variáveis inteiras y com x = step * y
+    lb, ub = grid_bounds(lb, ub, step)
+    if np.any(lb > ub):
+        return {'status': STATUS_INFEASIBLE, 'x': None}
+    argumentos = (c * step, A * step, b, np.round(lb / step), np.round(ub / step), time_limit, mip_gap, threads)
+    if backend is None or not hasattr(backend, 'solve_integer'):
+        backend = PulpMatrixBackend()
+    solucao = backend.solve_integer(*argumentos)
+    if solucao['x'] is not None:
+        solucao['x'] = np.round(solucao['x']) * step
+    return solucao
+
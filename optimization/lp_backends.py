@@ -0,0 +1,195 @@
+"""
+Backends de solução em processo para o problema de dieta na forma matricial
+
+Todos os backends recebem o problema já convertido em arrays NumPy:
+
+    minimizar    c · x
+    sujeito a    A_ub · x <= b_ub
+                 lb <= x <= ub
+"""
+
+import importlib.util
+
+import numpy as np
+
+# Status no mesmo formato de pulp.LpStatus, para manter o dicionário de resultado
+STATUS_OPTIMAL = 'Optimal'
+STATUS_NOT_SOLVED = 'Not Solved'
+STATUS_INFEASIBLE = 'Infeasible'
+STATUS_UNBOUNDED = 'Unbounded'
+STATUS_UNDEFINED = 'Undefined'
+
+
+class HighsBackend:
+    """Resolve o LP dentro do processo com o HiGHS via scipy.optimize.linprog"""
+
+    name = 'highs'
+
+    # Códigos de retorno do linprog -> status no formato do PuLP
+    _STATUS_MAP = {
+        0: STATUS_OPTIMAL,
+        1: STATUS_NOT_SOLVED,
+        2: STATUS_INFEASIBLE,
+        3: STATUS_UNBOUNDED,
+        4: STATUS_UNDEFINED,
+    }
+
+    def solve(self, c, A_ub, b_ub, lb, ub):
+        """Resolve o LP na forma matricial
+
+        Args:
+            c (numpy.ndarray): Custos por variável
+            A_ub (numpy.ndarray): Matriz das restrições "<="
+            b_ub (numpy.ndarray): Lados direitos das restrições
+            lb (numpy.ndarray): Limites inferiores das variáveis
+            ub (numpy.ndarray): Limites superiores das variáveis (np.inf = sem limite)
+
+        Returns:
+            dict: status, x (solução ou None), duais das linhas e custos reduzidos
+        """
+        # Importado na primeira solução: o SciPy é a maior parte do tempo de partida
+        from scipy.optimize import linprog
+        res = linprog(
+            c,
+            A_ub=A_ub,
+            b_ub=b_ub,
+            bounds=np.column_stack([lb, ub]),
+            method='highs'
+        )
+        status = self._STATUS_MAP.get(res.status, STATUS_UNDEFINED)
+        solucao = {'status': status, 'x': None, 'duals': None, 'reduced_costs': None}
+        if status == STATUS_OPTIMAL:
+            solucao['x'] = res.x
+            solucao['duals'] = res.ineqlin.marginals
+            solucao['reduced_costs'] = res.lower.marginals + res.upper.marginals
+        return solucao
+
+    def solve_integer(self, c, A_ub, b_ub, lb, ub, time_limit, mip_gap, threads=None, integrality=None):
+        """Resolve o problema com variáveis inteiras (scipy.optimize.milp)
+
+        Args:
+            c, A_ub, b_ub, lb, ub: Como em solve
+            time_limit (float): Limite de tempo em segundos
+            mip_gap (float): Gap relativo aceito
+            threads (int, optional): Ignorado: o milp do SciPy não expõe o número de threads
+            integrality (array-like, optional): 1 para variável inteira e 0 para contínua
+                (padrão: todas inteiras)
+
+        Returns:
+            dict: status e x (melhor solução inteira encontrada, ou None)
+        """
+        from scipy.optimize import Bounds, LinearConstraint, milp
+        res = milp(
+            c,
+            integrality=np.ones(len(c)) if integrality is None else integrality,
+            bounds=Bounds(lb, ub),
+            constraints=LinearConstraint(A_ub, -np.inf, b_ub),
+            options={'time_limit': time_limit, 'mip_rel_gap': mip_gap, 'disp': False}
+        )
+        # Com o limite de tempo atingido (status 1) a melhor solução inteira, se houver, é usada
+        if res.x is not None and res.status in (0, 1):
+            return {'status': STATUS_OPTIMAL, 'x': res.x}
+        return {'status': self._STATUS_MAP.get(res.status, STATUS_UNDEFINED), 'x': None}
+
+
+class PulpMatrixBackend:
+    """Resolve a forma matricial pelo CBC via PuLP (subprocesso)
+
+    Usado quando não há backend em processo para problemas auxiliares (MILP
+    de porções, diagnóstico de inviabilidade). Não devolve duais.
+    """
+
+    name = 'pulp_matrix'
+
+    def solve(self, c, A_ub, b_ub, lb, ub):
+        """Resolve o LP na forma matricial (argumentos como em HighsBackend.solve)"""
+        return self._solve(c, A_ub, b_ub, lb, ub, 'Continuous', {})
+
+    def solve_integer(self, c, A_ub, b_ub, lb, ub, time_limit, mip_gap, threads=None, integrality=None):
+        """Resolve o problema com variáveis inteiras (argumentos como em HighsBackend.solve_integer)"""
+        categoria = 'Integer' if integrality is None else [
+            'Integer' if inteira else 'Continuous' for inteira in np.asarray(integrality).tolist()
+        ]
+        return self._solve(c, A_ub, b_ub, lb, ub, categoria,
+                           {'timeLimit': time_limit, 'gapRel': mip_gap, 'threads': threads})
+
+    def _solve(self, c, A_ub, b_ub, lb, ub, categoria, opcoes):
+        """Monta o problema PuLP a partir dos arrays e resolve pelo CBC
+
+        categoria é a mesma para todas as variáveis (str) ou uma por variável (lista).
+        """
+        import pulp
+        problem = pulp.LpProblem("Forma_Matricial", pulp.LpMinimize)
+        if isinstance(categoria, str):
+            categoria = [categoria] * len(c)
+        variaveis = [
+            pulp.LpVariable(f"y_{j}", lowBound=float(minimo), upBound=float(maximo) if np.isfinite(maximo) else None,
+                            cat=categoria[j])
+            for j, (minimo, maximo) in enumerate(zip(np.asarray(lb).tolist(), np.asarray(ub).tolist()))
+        ]
+        problem.setObjective(pulp.LpAffineExpression(zip(variaveis, np.asarray(c).tolist())))
+        for linha, limite in zip(np.asarray(A_ub).tolist(), np.asarray(b_ub).tolist()):
+            problem += pulp.LpConstraint(pulp.LpAffineExpression(zip(variaveis, linha)), pulp.LpConstraintLE, rhs=limite)
+        problem.solve(pulp.PULP_CBC_CMD(msg=0, **opcoes))
+
+        if problem.sol_status in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+            x = np.array([variavel.varValue or 0 for variavel in variaveis], dtype=float)
+            return {'status': STATUS_OPTIMAL, 'x': x, 'duals': None, 'reduced_costs': None}
+        if problem.status == pulp.LpStatusInfeasible:
+            status = STATUS_INFEASIBLE
+        elif problem.status == pulp.LpStatusUnbounded:
+            status = STATUS_UNBOUNDED
+        else:
+            status = STATUS_NOT_SOLVED
+        return {'status': status, 'x': None, 'duals': None, 'reduced_costs': None}
+
+
+# Backends disponíveis por nome
+BACKENDS = {
+    HighsBackend.name: HighsBackend,
+}
+
+
+def highs_available():
+    """Indica se o SciPy (e portanto o HiGHS) está instalado, sem importá-lo
+
+    Returns:
+        bool: True se o backend HiGHS pode ser usado
+    """
+    return importlib.util.find_spec('scipy') is not None
+
+
+def resolve_backend(backend):
+    """Converte a configuração de backend em instância
+
+    Com 'auto', o HiGHS é escolhido sempre que o SciPy está instalado; o PuLP
+    fica só como alternativa quando não está.
+
+    Args:
+        backend (str or object): 'auto', 'pulp', nome em BACKENDS ou objeto com
+            método solve(c, A_ub, b_ub, lb, ub)
+
+    Returns:
+        object or None: Instância do backend; None indica o caminho PuLP (GLPK/CBC)
+    """
+    if not isinstance(backend, str):
+        return backend
+    if backend == 'auto':
+        backend = HighsBackend.name if highs_available() else 'pulp'
+    if backend == 'pulp':
+        return None
+    return get_backend(backend)
+
+
+def get_backend(name):
+    """Instancia um backend de solução pelo nome
+
+    Args:
+        name (str): Nome do backend registrado em BACKENDS
+
+    Returns:
+        object: Instância com método solve(c, A_ub, b_ub, lb, ub)
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Backend de solução desconhecido: {name}")
+    return BACKENDS[name]()
@@ -0,0 +1,127 @@
+"""
+Cálculo das metas diárias a partir dos dados pessoais (Mifflin-St Jeor)
+
+As funções operam sobre arrays: uma população inteira é calculada de uma vez,
+e os dados inválidos são marcados em máscaras em vez de interromper o cálculo.
+
+    metas = compute_targets_array(pesos, alturas, idades, sexos, atividades)
+    perfis = target_profiles(metas, orcamento=50)
+    resultados = optimize_many(perfis, processes=4)
+"""
+
+import numpy as np
+
+from config.constants import ACTIVITY_FACTORS
+
+# Termo constante da TMB por sexo (Mifflin-St Jeor)
+SEX_OFFSETS = {'Masculino': 5.0, 'Feminino': -161.0}
+PROTEIN_PER_KG = 1.6
+FAT_CALORIE_SHARE = 0.25
+FAT_KCAL_PER_G = 9.0
+
+
+def _category_terms(valores, opcoes):
+    """Termo numérico de cada texto (uma comparação vetorizada por opção)
+
+    Returns:
+        tuple: (termos, máscara dos textos que não são opções válidas)
+    """
+    valores = np.asarray(valores)
+    termos = np.zeros(valores.shape)
+    invalidos = np.ones(valores.shape, dtype=bool)
+    for opcao, termo in opcoes.items():
+        iguais = valores == opcao
+        termos[iguais] = termo
+        invalidos &= ~iguais
+    return termos, invalidos
+
+
+def validation_masks(weight, height, age, sex, activity):
+    """Máscaras de dados inválidos por campo
+
+    Args:
+        weight, height, age (array-like): Peso (kg), altura (cm) e idade (anos)
+        sex, activity (array-like): Sexo e nível de atividade (textos)
+
+    Returns:
+        dict: Campo -> numpy.ndarray booleano (True onde o valor é inválido)
+    """
+    weight, height, age = (np.asarray(valores, dtype=float) for valores in (weight, height, age))
+    return {
+        'weight': ~(weight > 0),
+        'height': ~(height > 0),
+        'age': ~(age > 0),
+        'sex': _category_terms(sex, SEX_OFFSETS)[1],
+        'activity': _category_terms(activity, ACTIVITY_FACTORS)[1],
+    }
+
+
+def compute_targets_array(weight, height, age, sex, activity):
+    """Calcula calorias, proteína e gordura diárias para vários perfis de uma vez
+
+    TMB = 10·peso + 6,25·altura - 5·idade + 5 (homens) ou - 161 (mulheres);
+    calorias = TMB × fator de atividade, proteína = 1,6 g/kg e gordura = 25%
+    das calorias. Os valores são arredondados como no cálculo da interface.
+
+    Args:
+        weight, height, age (array-like): Peso (kg), altura (cm) e idade (anos)
+        sex (array-like): 'Masculino' ou 'Feminino'
+        activity (array-like): Nível de atividade (chave de ACTIVITY_FACTORS)
+
+    Returns:
+        dict: metac, metap e metag (numpy.ndarray, NaN nos perfis inválidos)
+            e valid (máscara dos perfis válidos)
+    """
+    weight, height, age = (np.asarray(valores, dtype=float) for valores in (weight, height, age))
+    offset, sexo_invalido = _category_terms(sex, SEX_OFFSETS)
+    fator, atividade_invalida = _category_terms(activity, ACTIVITY_FACTORS)
+    invalidos = ~(weight > 0) | ~(height > 0) | ~(age > 0) | sexo_invalido | atividade_invalida
+
+    calorias = np.round((10 * weight + 6.25 * height - 5 * age + offset) * fator)
+    metas = {
+        'metac': calorias,
+        'metap': np.round(PROTEIN_PER_KG * weight),
+        'metag': np.round(FAT_CALORIE_SHARE * calorias / FAT_KCAL_PER_G),
+    }
+    for meta, valores in metas.items():
+        metas[meta] = np.where(invalidos, np.nan, valores)
+    metas['valid'] = ~invalidos
+    return metas
+
+
+def compute_targets(weight, height, age, sex, activity):
+    """Calcula as metas diárias de um perfil
+
+    Args:
+        weight (float): Peso em kg
+        height (float): Altura em cm
+        age (int): Idade em anos
+        sex (str): 'Masculino' ou 'Feminino'
+        activity (str): Nível de atividade (chave de ACTIVITY_FACTORS)
+
+    Returns:
+        dict: metac (kcal), metap (g) e metag (g)
+    """
+    invalidos = [campo for campo, mascara in validation_masks(weight, height, age, sex, activity).items() if mascara]
+    if invalidos:
+        raise ValueError(f"Dados pessoais inválidos: {', '.join(invalidos)}")
+    metas = compute_targets_array(weight, height, age, sex, activity)
+    return {meta: int(metas[meta]) for meta in ('metac', 'metap', 'metag')}
+
+
+def target_profiles(metas, orcamento, **opcoes):
+    """Perfis de optimize_many a partir das metas calculadas (apenas os válidos)
+
+    Args:
+        metas (dict): Resultado de compute_targets_array
+        orcamento (float or array-like): Orçamento diário, único ou por perfil
+        **opcoes: Demais argumentos de optimize_diet, iguais para todos os perfis
+
+    Yields:
+        dict: Perfil com metac, metap, metag, orcamento e as opções
+    """
+    validos = np.flatnonzero(metas['valid'])
+    orcamentos = np.broadcast_to(np.asarray(orcamento, dtype=float), metas['valid'].shape)
+    colunas = [metas[meta][validos].tolist() for meta in ('metac', 'metap', 'metag')]
+    for metac, metap, metag, limite in zip(*colunas, orcamentos[validos].tolist()):
+        yield {'metac': metac, 'metap': metap, 'metag': metag, 'orcamento': limite, **opcoes}
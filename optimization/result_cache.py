@@ -0,0 +1,150 @@
+"""
+Cache LRU de resultados de otimização indexado por requisições normalizadas
+"""
+
+import threading
+from collections import OrderedDict
+
+from config.constants import RESULT_CACHE_DECIMALS, RESULT_CACHE_SIZE
+
+
+class ResultCache:
+    """Cache LRU limitado de resultados de optimize_diet
+
+    A chave começa pela versão dos dados da tabela de alimentos (versão da
+    tabela e dos preços), então qualquer troca de alimentos ou preços invalida
+    as entradas antigas automaticamente.
+
+    Os resultados não são copiados em profundidade: get e put copiam só o
+    dicionário de topo (e cada plano de um conjunto de alternativas), e os valores
+    aninhados ('quantidades', 'detalhes', ...) são compartilhados com o cache
+    e tratados como somente leitura. Quem chama pode trocar chaves de topo
+    ('timings', 'custo_relativo') sem alterar a entrada guardada.
+    """
+
+    def __init__(self, maxsize=RESULT_CACHE_SIZE, decimals=RESULT_CACHE_DECIMALS):
+        """Inicializa o cache
+
+        Args:
+            maxsize (int): Número máximo de resultados guardados
+            decimals (int): Casas decimais usadas para normalizar as metas
+        """
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def normalize(self, valor):
+        """Arredonda uma meta para compor a chave (None é mantido)"""
+        return None if valor is None else round(float(valor), self.decimals)
+
+    def normalize_nutrients(self, nutrient_targets):
+        """Arredonda os limites de nutrientes (nutriente -> (mínimo, máximo)) como as metas"""
+        if not nutrient_targets:
+            return None
+        return {
+            coluna: tuple(self.normalize(valor) for valor in limites) if isinstance(limites, (list, tuple)) else limites
+            for coluna, limites in nutrient_targets.items()
+        }
+
+    def make_key(self, version, metac, metap, metag, orcamento, excluded_foods=None,
+                 use_portion_limits=False, metacarb=None, portion_mode='continuous', milp_options=None,
+                 nutrient_targets=None):
+        """Monta a chave normalizada de uma requisição
+
+        Returns:
+            tuple: Chave do cache
+        """
+        return (
+            version,
+            self.normalize(metac),
+            self.normalize(metap),
+            self.normalize(metag),
+            self.normalize(orcamento),
+            tuple(sorted(set(excluded_foods or ()))),
+            bool(use_portion_limits),
+            self.normalize(metacarb),
+            portion_mode,
+            tuple(sorted((milp_options or {}).items())),
+            tuple(sorted((self.normalize_nutrients(nutrient_targets) or {}).items())),
+        )
+
+    def get(self, key):
+        """Busca um resultado; retorna uma cópia rasa ou None"""
+        with self._lock:
+            self._check_version(key[0])
+            resultado = self._entries.get(key)
+            if resultado is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return _shallow_copy(resultado)
+
+    def put(self, key, resultado):
+        """Guarda um resultado, descartando o menos usado se o cache estiver cheio"""
+        resultado = _shallow_copy(resultado)
+        with self._lock:
+            self._check_version(key[0])
+            self._entries[key] = resultado
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _check_version(self, version):
+        """Descarta todas as entradas quando a versão da tabela muda"""
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+    def clear(self):
+        """Remove todas as entradas e zera os contadores"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Retorna os contadores do cache
+
+        Returns:
+            dict: hits, misses, tamanho atual e máximo
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+
+def _shallow_copy(resultado):
+    """Copia o dicionário de topo e, em um conjunto de alternativas, cada plano
+
+    O custo é proporcional ao número de chaves de topo e de planos, não ao
+    catálogo: os valores aninhados são compartilhados.
+    """
+    copia = dict(resultado)
+    if 'planos' in copia:
+        copia['planos'] = [dict(plano) for plano in copia['planos']]
+    return copia
+
+
+# Cache compartilhado pelos otimizadores do processo
+_shared_cache = None
+
+
+def get_result_cache():
+    """Retorna o cache de resultados compartilhado do processo
+
+    Returns:
+        ResultCache: Cache criado na primeira chamada
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ResultCache()
+    return _shared_cache
@@ -0,0 +1,195 @@
+"""
+Planejamento semanal: um LP por dia, resolvidos em paralelo e coordenados
+pelas restrições que ligam os dias da semana
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from config.constants import NUMERICAL_TOLERANCE, PORTION_LIMITS, WEEKLY_PLAN
+
+# Quantidade a partir da qual o alimento conta como presente no dia
+# (mesmo limiar da lista 'alimentos' do resultado)
+MIN_SERVING = 0.01
+
+
+class WeeklyPlanner:
+    """Decomposição do plano semanal em subproblemas diários
+
+    Cada dia é o LP diário (metas mínimas e máximas por dia) sobre o modelo
+    compilado compartilhado. As restrições semanais, teto de porções por
+    alimento na semana e limite de dias por alimento nas categorias de
+    variedade, são coordenadas por alocação: a cada rodada os dias pendentes
+    são resolvidos em paralelo, os alimentos que violam alguma restrição
+    semanal recebem limites por dia e só os dias afetados voltam a ser
+    resolvidos. Como os limites só apertam, o processo termina; o plano é
+    viável, mas não necessariamente o ótimo do problema semanal completo.
+
+    A coordenação nunca baixa um limite abaixo do mínimo diário do alimento
+    (limites de porção por categoria): alimentos com mínimo diário aparecem
+    todos os dias, então o limite de dias da variedade não vale para eles, e
+    o teto semanal é dividido acima dos mínimos. Se a soma dos mínimos
+    diários passa do teto semanal, os dias que não podem cumpri-los ficam
+    inviáveis, e a semana também.
+    """
+
+    def __init__(self, model, days=None, weekly_caps=None, variety_categories=None,
+                 max_days_per_food=None, max_rounds=None, max_workers=None):
+        """Inicializa o planejador
+
+        Args:
+            model (DietModel): Modelo diário compilado (compartilhado entre os dias)
+            days (int, optional): Dias do plano (padrão: WEEKLY_PLAN['days'])
+            weekly_caps (dict, optional): Nome -> máximo de porções na semana,
+                além do máximo padrão de PORTION_LIMITS['weekly']
+            variety_categories (iterable, optional): Categorias com limite de dias por alimento
+            max_days_per_food (int, optional): Dias em que um alimento dessas categorias pode aparecer
+            max_rounds (int, optional): Máximo de rodadas de coordenação
+            max_workers (int, optional): Threads usadas (padrão: uma por dia)
+        """
+        self.model = model
+        self.days = days or WEEKLY_PLAN['days']
+        self.max_days_per_food = max_days_per_food or WEEKLY_PLAN['max_days_per_food']
+        self.max_rounds = max_rounds or WEEKLY_PLAN['max_rounds']
+        self.max_workers = max_workers or self.days
+
+        tabela = model.table
+        semanal = PORTION_LIMITS['weekly']
+        teto = semanal['default_max'] if semanal['enabled'] else np.inf
+        self.caps = np.full(len(tabela), teto, dtype=float)
+        for nome, maximo in (weekly_caps or {}).items():
+            if nome in tabela.index:
+                self.caps[tabela.index[nome]] = maximo
+
+        categorias = set(WEEKLY_PLAN['variety_categories'] if variety_categories is None else variety_categories)
+        self.variety_mask = np.array([categoria in categorias for categoria in tabela['categoria']], dtype=bool)
+
+    def plan(self, targets, use_portion_limits=False, excluded_foods=None):
+        """Monta o plano da semana
+
+        Args:
+            targets (dict): Metas diárias (metac, metap, metag, metacarb, orcamento)
+            use_portion_limits (bool): Aplica os limites diários de porção por categoria
+            excluded_foods (iterable, optional): Alimentos excluídos em todos os dias
+
+        Returns:
+            dict: Totais da semana no formato de optimize_diet, mais 'dias' (um
+                resultado por dia), 'rodadas' (rodadas de coordenação usadas) e,
+                se houver, 'conflitos' (alimentos cujos mínimos diários passam do
+                teto semanal)
+        """
+        model = self.model
+        nomes = model.table.names
+        lb_base, _ = model.bounds_for(use_portion_limits)
+        excluidos = model.table.rows(excluded_foods or ())
+        # Os mesmos preços em todos os dias e rodadas, mesmo com update_costs no meio
+        custos = model._sync_costs()
+        dias_viaveis, conflitos = self._required_days(lb_base, excluidos)
+
+        # Limites por dia impostos pela coordenação: linha -> (mínimo, máximo)
+        limites = [{} for _ in range(self.days)]
+        X = np.zeros((self.days, len(nomes)))
+        status = ['Not Solved'] * dias_viaveis + ['Infeasible'] * (self.days - dias_viaveis)
+
+        def resolver_dia(dia):
+            bounds = {nomes[linha]: valores for linha, valores in limites[dia].items()}
+            return model.solve_vector(targets, use_portion_limits, excluded_foods, bounds, costs=custos)
+
+        pendentes = list(range(dias_viaveis))
+        rodadas = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pendentes and rodadas < self.max_rounds:
+                rodadas += 1
+                for dia, (status_dia, x) in zip(pendentes, executor.map(resolver_dia, pendentes)):
+                    status[dia] = status_dia
+                    X[dia] = 0 if x is None else x
+                if any(status_dia != 'Optimal' for status_dia in status):
+                    break
+                pendentes = self._coordinate(X, limites, lb_base)
+
+        falhas = [status_dia for status_dia in status if status_dia != 'Optimal']
+        if falhas:
+            status_semana = falhas[0]
+        elif pendentes:
+            # Rodadas esgotadas com restrições semanais ainda violadas
+            status_semana = 'Not Solved'
+        else:
+            status_semana = 'Optimal'
+
+        semanal = X.sum(axis=0) if status_semana == 'Optimal' else None
+        resultado = model._prepare_result(status_semana, semanal, excluidos, custos[1])
+        resultado['dias'] = [
+            model._prepare_result(status[dia], X[dia] if status[dia] == 'Optimal' else None, excluidos, custos[1])
+            for dia in range(self.days)
+        ]
+        resultado['rodadas'] = rodadas
+        if conflitos:
+            resultado['conflitos'] = conflitos
+        return resultado
+
+    def _required_days(self, lb_base, excluidos):
+        """Dias em que os mínimos diários cabem no teto semanal
+
+        Um alimento com mínimo diário aparece todos os dias, e o teto semanal
+        comporta no máximo teto / mínimo dias. O limite de dias das categorias
+        de variedade não se aplica a ele (o mínimo por categoria tem
+        prioridade), então não gera conflito.
+
+        Returns:
+            tuple: (número de dias viáveis, nomes dos alimentos em conflito)
+        """
+        tol = NUMERICAL_TOLERANCE
+        obrigatorios = lb_base > tol
+        obrigatorios[excluidos] = False
+        with np.errstate(divide='ignore'):
+            pelo_teto = np.floor(self.caps / np.where(obrigatorios, lb_base, np.inf) * (1 + tol) + tol)
+        permitidos = np.where(obrigatorios, np.minimum(pelo_teto, self.days), self.days).astype(int)
+        conflitos = np.flatnonzero(permitidos < self.days)
+        nomes = self.model.table.names
+        return int(permitidos.min(initial=self.days)), [nomes[linha] for linha in conflitos.tolist()]
+
+    def _coordinate(self, X, limites, lb_base):
+        """Impõe limites por dia aos alimentos que violam restrições semanais
+
+        Args:
+            X (numpy.ndarray): Quantidades (dias x alimentos) da última rodada
+            limites (list): Limites por dia, atualizados no lugar
+            lb_base (numpy.ndarray): Mínimos diários sem coordenação
+
+        Returns:
+            list: Dias cujos limites mudaram e precisam ser resolvidos de novo
+        """
+        alterados = set()
+        usados = X > MIN_SERVING
+
+        # Variedade: cada alimento das categorias limitadas fica só nos dias em
+        # que aparece em maior quantidade; em empates (dias idênticos) a
+        # escolha gira com o alimento, para espalhar as opções pela semana.
+        # Alimentos com mínimo diário não entram no rodízio: aparecem todos os dias
+        tol = NUMERICAL_TOLERANCE
+        dias_por_alimento = usados.sum(axis=0)
+        rodizio = self.variety_mask & (lb_base <= tol)
+        repetidos = np.flatnonzero(rodizio & (dias_por_alimento > self.max_days_per_food))
+        for linha in repetidos.tolist():
+            dias = np.flatnonzero(usados[:, linha]).tolist()
+            dias.sort(key=lambda dia: (-round(X[dia, linha], 6), (dia - linha) % self.days))
+            for dia in dias[self.max_days_per_food:]:
+                limites[dia][linha] = (0.0, 0.0)
+                alterados.add(dia)
+
+        # Teto semanal: divide o que excede os mínimos diários entre os dias na
+        # proporção do uso atual (_required_days garante teto >= soma dos mínimos)
+        totais = X.sum(axis=0)
+        excedidos = np.flatnonzero(totais > self.caps * (1 + tol) + tol)
+        for linha in excedidos.tolist():
+            dias = np.flatnonzero(X[:, linha] > 0)
+            minimo = lb_base[linha]
+            folga = X[dias, linha] - minimo
+            fator = max(self.caps[linha] - minimo * len(dias), 0.0) / folga.sum() if folga.sum() > 0 else 0.0
+            for dia, excesso in zip(dias.tolist(), folga.tolist()):
+                _, maximo = limites[dia].get(linha, (minimo, np.inf))
+                limites[dia][linha] = (minimo, max(minimo, min(maximo, minimo + excesso * fator)))
+                alterados.add(dia)
+
+        return sorted(alterados)
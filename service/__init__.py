@@ -0,0 +1,3 @@
+"""
+Pacote do serviço HTTP do otimizador de dieta
+"""
@@ -0,0 +1,411 @@
+"""
+Serviço HTTP assíncrono (asyncio, apenas biblioteca padrão) do otimizador de dieta
+
+Para executar:
+    python -m service.http_service --port 8000 --workers 4
+
+Endpoints (JSON):
+    POST /optimize   argumentos de optimize_diet -> resultado
+    POST /batch      {"profiles": [...]} -> {"results": [...]}
+    GET  /foods      catálogo de alimentos e versão da tabela
+    GET  /health     contadores do serviço
+
+As soluções rodam em um pool de processos limitado. Solicitações idênticas
+simultâneas compartilham a mesma solução, e quando a fila está cheia o
+serviço responde 429 com Retry-After. Preços aplicados no processo principal
+(--prices, PriceFeed) chegam aos processos de trabalho: quando os custos da
+tabela mudam, o pool é recriado com os novos preços.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from config.constants import (PORTION_MODES, SERVICE_BATCH_CHUNK, SERVICE_HOST, SERVICE_MAX_BODY,
+                              SERVICE_PORT, SERVICE_QUEUE_SIZE, SERVICE_WORKERS)
+from data.food_database import get_food_table
+from optimization.diet_model import resolve_nutrient_targets
+from optimization.diet_optimizer import get_optimizer
+
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    429: 'Too Many Requests',
+    500: 'Internal Server Error',
+}
+
+# Campos aceitos em cada perfil: nome -> obrigatório
+PROFILE_FIELDS = {
+    'metac': True,
+    'metap': True,
+    'metag': True,
+    'orcamento': True,
+    'metacarb': False,
+    'excluded_foods': False,
+    'use_portion_limits': False,
+    'portion_mode': False,
+    'nutrient_targets': False,
+}
+
+
+class HTTPError(Exception):
+    """Erro com status HTTP e mensagem devolvida ao cliente"""
+
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+        self.mensagem = mensagem
+
+
+def _init_worker(costs):
+    """Aplica no processo de trabalho os preços da tabela do processo principal
+
+    Args:
+        costs (tuple or None): (preco, market_price, market_portion), ou None
+            se o processo principal não atualizou os preços
+    """
+    if costs is not None:
+        get_food_table().update_costs(*costs)
+
+
+def _warm_up():
+    """Carrega a tabela e compila o modelo no processo de trabalho"""
+    optimizer = get_optimizer()
+    if optimizer.backend is not None:
+        optimizer._get_model()
+
+
+def _optimize_request(profile):
+    """Resolve uma solicitação no processo de trabalho"""
+    return get_optimizer().optimize_diet(**profile)
+
+
+def _optimize_batch(profiles):
+    """Resolve um bloco de perfis no processo de trabalho"""
+    return get_optimizer().optimize_many(profiles)
+
+
+def parse_profile(dados, permitir_portion_mode=True):
+    """Valida um perfil recebido em JSON
+
+    Args:
+        dados (dict): Perfil decodificado
+        permitir_portion_mode (bool): Se o campo portion_mode é aceito
+
+    Returns:
+        dict: Argumentos de optimize_diet
+    """
+    if not isinstance(dados, dict):
+        raise HTTPError(400, "O perfil deve ser um objeto JSON")
+    desconhecidos = set(dados) - set(PROFILE_FIELDS)
+    if not permitir_portion_mode:
+        desconhecidos |= {'portion_mode'} & set(dados)
+    if desconhecidos:
+        raise HTTPError(400, f"Campos desconhecidos: {', '.join(sorted(desconhecidos))}")
+
+    profile = {}
+    for campo, obrigatorio in PROFILE_FIELDS.items():
+        if campo not in dados or dados[campo] is None:
+            if obrigatorio:
+                raise HTTPError(400, f"Campo obrigatório ausente: {campo}")
+            continue
+        valor = dados[campo]
+        if campo == 'excluded_foods':
+            if not isinstance(valor, list) or not all(isinstance(nome, str) for nome in valor):
+                raise HTTPError(400, "excluded_foods deve ser uma lista de nomes")
+            valor = sorted(set(valor))
+        elif campo == 'use_portion_limits':
+            if not isinstance(valor, bool):
+                raise HTTPError(400, "use_portion_limits deve ser true ou false")
+        elif campo == 'portion_mode':
+            if valor not in PORTION_MODES:
+                raise HTTPError(400, f"portion_mode deve ser um de: {', '.join(PORTION_MODES)}")
+        elif campo == 'nutrient_targets':
+            try:
+                resolve_nutrient_targets(get_food_table(), valor)
+            except ValueError as e:
+                raise HTTPError(400, str(e))
+            # O json aceita NaN e Infinity, que não servem como limite
+            for nutriente, limites in valor.items():
+                if any(limite is not None and not math.isfinite(limite) for limite in limites):
+                    raise HTTPError(400, f"Os limites de {nutriente} devem ser números finitos ou null")
+        else:
+            if (isinstance(valor, bool) or not isinstance(valor, (int, float)) or not math.isfinite(valor)
+                    or valor < 0):
+                raise HTTPError(400, f"{campo} deve ser um número finito e não negativo")
+            valor = float(valor)
+        profile[campo] = valor
+    return profile
+
+
+class DietService:
+    """Serviço de otimização: roteamento, fila limitada e agrupamento de solicitações"""
+
+    def __init__(self, workers=SERVICE_WORKERS, queue_size=SERVICE_QUEUE_SIZE):
+        """Inicializa o serviço (o pool de processos é criado em start)
+
+        Args:
+            workers (int, optional): Processos de solução (padrão: número de CPUs)
+            queue_size (int): Tarefas aguardando além das em execução antes de responder 429
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.capacity = self.workers + queue_size
+        self.pending = 0
+        self.executor = None
+        self._pool_version = None
+        self.server = None
+        self._inflight = {}
+        self._connections = {}
+        self._catalog = None
+        self.stats = {'requests': 0, 'solves': 0, 'coalesced': 0, 'rejected': 0, 'price_reloads': 0}
+
+    async def start(self, host=SERVICE_HOST, port=SERVICE_PORT):
+        """Cria o pool de processos e começa a aceitar conexões
+
+        Returns:
+            asyncio.AbstractServer: Servidor em execução
+        """
+        self._create_pool()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _warm_up) for _ in range(self.workers)))
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server
+
+    def _create_pool(self):
+        """Cria o pool de processos com os preços atuais da tabela do processo principal"""
+        # Processos criados sem fork não herdam os sockets das conexões abertas
+        metodos = multiprocessing.get_all_start_methods()
+        contexto = multiprocessing.get_context('forkserver' if 'forkserver' in metodos else 'spawn')
+        tabela = get_food_table()
+        versao, preco = tabela.cost_snapshot()
+        custos = (preco, tabela['market_price'], tabela['market_portion']) if versao else None
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=contexto, initializer=_init_worker, initargs=(custos,)
+        )
+        self._pool_version = (tabela.version, versao)
+
+    def _sync_prices(self):
+        """Recria o pool se os preços do processo principal mudaram desde a sua criação
+
+        As tarefas já enviadas terminam no pool antigo; as novas vão para
+        processos que partem com os preços atuais.
+        """
+        if get_food_table().data_version == self._pool_version:
+            return
+        antigo = self.executor
+        self._create_pool()
+        antigo.shutdown(wait=False)
+        self.stats['price_reloads'] += 1
+
+    async def close(self):
+        """Para de aceitar conexões e encerra o pool"""
+        if self.server is not None:
+            self.server.close()
+            # Conexões keep-alive ociosas terminam ao perder o socket
+            for writer in list(self._connections):
+                writer.close()
+            await asyncio.gather(*self._connections.values(), return_exceptions=True)
+            await self.server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+
+    async def _submit(self, func, *args, slots=1):
+        """Executa func no pool, ou recusa com 429 se a fila estiver cheia"""
+        if self.pending + slots > self.capacity:
+            self.stats['rejected'] += 1
+            raise HTTPError(429, "Fila de otimização cheia, tente novamente")
+        self._sync_prices()
+        self.pending += slots
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= slots
+
+    async def optimize(self, profile):
+        """Resolve um perfil; solicitações idênticas em andamento compartilham o resultado"""
+        # Com preços novos, uma solução em andamento com os antigos não é compartilhada
+        chave = (get_food_table().data_version, json.dumps(profile, sort_keys=True))
+        tarefa = self._inflight.get(chave)
+        if tarefa is not None:
+            self.stats['coalesced'] += 1
+        else:
+            self.stats['solves'] += 1
+            tarefa = asyncio.ensure_future(self._submit(_optimize_request, profile))
+            self._inflight[chave] = tarefa
+            tarefa.add_done_callback(lambda _: self._inflight.pop(chave, None))
+        # shield: o cancelamento de um cliente não cancela a solução dos demais
+        return await asyncio.shield(tarefa)
+
+    async def batch(self, profiles):
+        """Resolve vários perfis em blocos distribuídos pelo pool"""
+        blocos = [profiles[i:i + SERVICE_BATCH_CHUNK] for i in range(0, len(profiles), SERVICE_BATCH_CHUNK)]
+        if self.pending + len(blocos) > self.capacity:
+            self.stats['rejected'] += 1
+            raise HTTPError(429, "Fila de otimização cheia, tente novamente")
+        self.stats['solves'] += len(profiles)
+        parciais = await asyncio.gather(*(self._submit(_optimize_batch, bloco) for bloco in blocos))
+        return [resultado for parcial in parciais for resultado in parcial]
+
+    def catalog(self):
+        """Catálogo de alimentos, montado uma vez por versão da tabela e dos preços"""
+        tabela = get_food_table()
+        if self._catalog is None or (self._catalog['version'], self._catalog['cost_version']) != tabela.data_version:
+            self._catalog = {
+                'version': tabela.version,
+                'cost_version': tabela.cost_version,
+                'foods': [dict(food) for food in tabela.records()],
+            }
+        return self._catalog
+
+    async def dispatch(self, method, path, body):
+        """Roteia uma solicitação
+
+        Args:
+            method (str): Método HTTP
+            path (str): Caminho (sem query string)
+            body (bytes): Corpo da solicitação
+
+        Returns:
+            tuple: (status HTTP, objeto JSON de resposta)
+        """
+        self.stats['requests'] += 1
+        rotas = {
+            '/optimize': 'POST',
+            '/batch': 'POST',
+            '/foods': 'GET',
+            '/health': 'GET',
+        }
+        if path not in rotas:
+            raise HTTPError(404, f"Caminho desconhecido: {path}")
+        if method != rotas[path]:
+            raise HTTPError(405, f"Use {rotas[path]} em {path}")
+
+        if path == '/foods':
+            return 200, self.catalog()
+        if path == '/health':
+            return 200, dict(self.stats, pending=self.pending, capacity=self.capacity)
+
+        try:
+            dados = json.loads(body or b'null')
+        except ValueError:
+            raise HTTPError(400, "Corpo JSON inválido")
+        if path == '/optimize':
+            return 200, await self.optimize(parse_profile(dados))
+
+        if not isinstance(dados, dict) or not isinstance(dados.get('profiles'), list):
+            raise HTTPError(400, "Envie {\"profiles\": [...]}")
+        profiles = [parse_profile(profile, permitir_portion_mode=False) for profile in dados['profiles']]
+        return 200, {'results': await self.batch(profiles)}
+
+    async def _handle_connection(self, reader, writer):
+        """Atende uma conexão HTTP/1.1 (com keep-alive)"""
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    cabecalho = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                linhas = cabecalho.decode('latin-1').split('\r\n')
+                try:
+                    method, alvo, versao = linhas[0].split(' ', 2)
+                except ValueError:
+                    await self._respond(writer, 400, {'erro': "Linha de solicitação inválida"}, False)
+                    break
+                headers = {}
+                for linha in linhas[1:]:
+                    if ':' in linha:
+                        nome, valor = linha.split(':', 1)
+                        headers[nome.strip().lower()] = valor.strip()
+                manter = versao == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+
+                try:
+                    tamanho = int(headers.get('content-length') or 0)
+                except ValueError:
+                    await self._respond(writer, 400, {'erro': "Content-Length inválido"}, False)
+                    break
+                if not 0 <= tamanho <= SERVICE_MAX_BODY:
+                    mensagem = f"Content-Length deve estar entre 0 e {SERVICE_MAX_BODY} bytes"
+                    await self._respond(writer, 413, {'erro': mensagem}, False)
+                    break
+                body = await reader.readexactly(tamanho) if tamanho else b''
+
+                try:
+                    status, resposta = await self.dispatch(method, alvo.split('?', 1)[0], body)
+                except HTTPError as erro:
+                    status, resposta = erro.status, {'erro': erro.mensagem}
+                except Exception as erro:
+                    status, resposta = 500, {'erro': f"Erro interno: {erro}"}
+                await self._respond(writer, status, resposta, manter)
+                if not manter:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def _respond(self, writer, status, resposta, manter):
+        """Escreve a resposta JSON"""
+        corpo = json.dumps(resposta, ensure_ascii=False).encode('utf-8')
+        linhas = [
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(corpo)}",
+            f"Connection: {'keep-alive' if manter else 'close'}",
+        ]
+        if status == 429:
+            linhas.append("Retry-After: 1")
+        writer.write(('\r\n'.join(linhas) + '\r\n\r\n').encode('latin-1') + corpo)
+        await writer.drain()
+
+
+async def serve(host=SERVICE_HOST, port=SERVICE_PORT, workers=SERVICE_WORKERS, queue_size=SERVICE_QUEUE_SIZE,
+                prices=None):
+    """Executa o serviço até ser interrompido
+
+    Args:
+        prices (list, optional): Arquivos de preços aplicados e verificados
+            periodicamente no processo principal (ver data.price_feed)
+    """
+    if prices:
+        from data.price_feed import PriceFeed
+        feed = PriceFeed(prices)
+        feed.refresh()
+        feed.watch()
+    service = DietService(workers=workers, queue_size=queue_size)
+    server = await service.start(host, port)
+    enderecos = ', '.join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Serviço de otimização em {enderecos} ({service.workers} processos)")
+    try:
+        await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando"""
+    parser = argparse.ArgumentParser(description="Serviço HTTP do otimizador de dieta")
+    parser.add_argument('--host', default=SERVICE_HOST, help="Endereço de escuta")
+    parser.add_argument('--port', type=int, default=SERVICE_PORT, help="Porta de escuta")
+    parser.add_argument('--workers', type=int, default=SERVICE_WORKERS, help="Processos de solução")
+    parser.add_argument('--queue-size', type=int, default=SERVICE_QUEUE_SIZE,
+                        help="Solicitações em espera antes de responder 429")
+    parser.add_argument('--prices', nargs='+', metavar='ARQUIVO',
+                        help="Arquivos de preços de mercado, recarregados quando mudam")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.queue_size, args.prices))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
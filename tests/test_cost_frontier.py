@@ -0,0 +1,52 @@
+"""
+Testes da curva de custo (DietOptimizer.cost_frontier) nos dois caminhos de solução
+"""
+
+import unittest
+
+from optimization.diet_optimizer import DietOptimizer
+from optimization.lp_backends import highs_available
+
+METAS = {'metac': 2000, 'metap': 60, 'metag': 70}
+
+
+def _custos(curva):
+    return [None if custo is None else round(custo, 4) for custo in curva['custos']]
+
+
+class PulpFrontierNutrientTargetsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.optimizer = DietOptimizer('pulp', cache=False)
+
+    def test_nutrient_target_as_swept_target(self):
+        curva = self.optimizer.cost_frontier('carboidrato_min', 300, 900, pontos=4, **METAS)
+        custos = _custos(curva)
+        self.assertEqual(custos, sorted(custos))
+        self.assertLess(custos[0], custos[-1])
+
+    def test_nutrient_target_as_fixed_target(self):
+        livre = _custos(self.optimizer.cost_frontier('metap', 40, 120, pontos=5, metac=2000, metag=70))
+        limitada = _custos(self.optimizer.cost_frontier('metap', 40, 120, pontos=5, metac=2000, metag=70,
+                                                        proteina_max=80))
+        # Acima de proteina_max não há dieta
+        self.assertEqual(limitada[3:], [None, None])
+        self.assertNotEqual(livre, limitada)
+
+    def test_unknown_target_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, 'foo_min'):
+            self.optimizer.cost_frontier('metap', 40, 120, pontos=3, foo_min=3, **METAS)
+
+    @unittest.skipUnless(highs_available(), "requer SciPy (HiGHS)")
+    def test_matches_in_process_backend(self):
+        highs = DietOptimizer('highs', cache=False)
+        for meta, inicio, fim, fixas in (('carboidrato_min', 300, 900, METAS),
+                                         ('metap', 40, 120, {'metac': 2000, 'metag': 70, 'proteina_max': 80})):
+            self.assertEqual(
+                _custos(self.optimizer.cost_frontier(meta, inicio, fim, pontos=4, **fixas)),
+                _custos(highs.cost_frontier(meta, inicio, fim, pontos=4, **fixas)),
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
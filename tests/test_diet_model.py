@@ -0,0 +1,105 @@
+"""
+Testes do modelo compilado (optimization.diet_model) com atualização de preços
+"""
+
+import unittest
+
+import numpy as np
+
+from data.food_database import get_food_table
+from data.food_table import FoodTable
+from optimization.diet_model import DietModel
+from optimization.diet_optimizer import DietOptimizer
+from optimization.lp_backends import highs_available
+
+METAS = {'metac': 2000, 'metap': 60, 'metag': 70, 'orcamento': 100}
+
+
+@unittest.skipUnless(highs_available(), "requer SciPy (HiGHS)")
+class CostSnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        tabela = get_food_table()
+        self.table = FoodTable.from_columns({coluna: tabela[coluna] for coluna in tabela.columns})
+
+    def test_solve_uses_one_cost_snapshot(self):
+        model = DietModel(self.table, backend='highs')
+        custo = model.solve_request(METAS)['custo_total']
+        antigo = self.table.cost_snapshot()
+        self.table.update_costs(self.table['preco'] * 2)
+
+        # Uma solução que começou antes da atualização fica com os preços antigos
+        self.assertAlmostEqual(model.solve_request(METAS, costs=antigo)['custo_total'], custo)
+        # A seguinte usa os novos e não reaproveita a base obtida com os antigos
+        resolucoes = model.stats['solves'] - model.stats['warm_starts']
+        self.assertAlmostEqual(model.solve_request(METAS)['custo_total'], 2 * custo)
+        self.assertEqual(model.stats['solves'] - model.stats['warm_starts'], resolucoes + 1)
+        self.assertEqual(model.cost_version, self.table.cost_version)
+
+    def test_cache_key_follows_cost_snapshot(self):
+        optimizer = DietOptimizer(backend='highs')
+        optimizer.table = self.table
+        custo = optimizer.optimize_diet(**METAS)['custo_total']
+        self.table.update_costs(self.table['preco'] * 2)
+        self.assertAlmostEqual(optimizer.optimize_diet(**METAS)['custo_total'], 2 * custo)
+
+
+@unittest.skipUnless(highs_available(), "requer SciPy (HiGHS)")
+class WarmStartParityTest(unittest.TestCase):
+    """Soluções com warm start (DietModel._warm_solve) iguais às resolvidas do zero"""
+
+    def setUp(self):
+        tabela = get_food_table()
+        self.table = FoodTable.from_columns({coluna: tabela[coluna] for coluna in tabela.columns})
+        self.model = DietModel(self.table, backend='highs')
+        self.model.update_targets(**dict(METAS, metap=70))
+        self.model.solve()
+
+    def _cold(self, **metas):
+        model = DietModel(self.table, backend='highs')
+        model.update_targets(**METAS)
+        model.update_targets(**metas)
+        return model.solve(warm_start=False)
+
+    def assertSameSolution(self, resultado, esperado):
+        self.assertEqual(resultado['status'], esperado['status'])
+        self.assertAlmostEqual(resultado['custo_total'], esperado['custo_total'], places=9)
+        self.assertEqual(resultado['quantidades'].keys(), esperado['quantidades'].keys())
+        for nome, quantidade in esperado['quantidades'].items():
+            self.assertAlmostEqual(resultado['quantidades'][nome], quantidade, places=6, msg=nome)
+
+    def _solve_warm(self):
+        quentes = self.model.stats['warm_starts']
+        resultado = self.model.solve()
+        self.assertEqual(self.model.stats['warm_starts'], quentes + 1)
+        return resultado
+
+    def test_after_target_change(self):
+        self.model.update_targets(metap=80)
+        self.assertSameSolution(self._solve_warm(), self._cold(metap=80))
+
+    def test_after_cost_change(self):
+        self.table.update_costs(self.table['preco'] * np.linspace(0.9, 1.1, len(self.table)))
+        # A base obtida com os preços antigos é descartada
+        self.assertSameSolution(self.model.solve(), self._cold(metap=70))
+        self.model.update_targets(metap=80)
+        self.assertSameSolution(self._solve_warm(), self._cold(metap=80))
+
+    def test_sweep_matches_independent_solves(self):
+        # Com orçamento de R$ 6 a proteína deixa de caber antes do fim da sequência
+        self.model.update_targets(orcamento=6)
+        valores = [40, 60, 70, 80, 90, 100, 120, 150]
+        pontos = self.model.sweep('metap', valores)
+
+        self.assertEqual([valor for valor, _, _ in pontos], valores)
+        self.assertGreater(self.model.stats['warm_starts'], 0)
+        self.assertIn('Infeasible', [resultado['status'] for _, resultado, _ in pontos])
+        for valor, resultado, _ in pontos:
+            esperado = self._cold(metap=valor, orcamento=6)
+            self.assertEqual(resultado['status'], esperado['status'], valor)
+            if esperado['status'] == 'Optimal':
+                self.assertAlmostEqual(resultado['custo_total'], esperado['custo_total'], places=9, msg=valor)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Testes da importação de tabelas externas de alimentos (data.food_loader)
+"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from data.food_loader import _iter_json_array, load_foods, normalize_food_row, parse_food_row, parse_number
+
+TACO = """Descrição;Grupo;Energia (kcal);Proteína (g);Lipídeos (g);Carboidrato (g);Fibra alimentar (g);porcao
+Arroz branco cozido;Cereais e Grãos;128;2,5;0,2;28,1;1,6;100g
+Frango grelhado;Proteínas;159;32;2,5;0;Tr;100g
+"""
+
+FORNECEDOR = """nome;preco_mercado;porcao_mercado
+Arroz branco cozido;7,00;1 kg
+Frango grelhado;15,00;1 kg
+"""
+
+
+class FoodLoaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+
+    def _file(self, nome, conteudo):
+        caminho = os.path.join(self._dir.name, nome)
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(conteudo)
+        return caminho
+
+    def _load(self, *arquivos):
+        paths = [self._file(nome, conteudo) for nome, conteudo in arquivos]
+        return load_foods(paths, os.path.join(self._dir.name, 'cache'), install=False)
+
+    def test_price_file_overlays_only_its_columns(self):
+        tabela = self._load(('taco.csv', TACO), ('fornecedor.csv', FORNECEDOR))
+
+        arroz = tabela.record('Arroz branco cozido')
+        self.assertEqual(arroz['calorias'], 128.0)
+        self.assertEqual(arroz['proteina'], 2.5)
+        self.assertEqual(arroz['fibra'], 1.6)
+        self.assertEqual(arroz['categoria'], 'Cereais e Grãos')
+        self.assertEqual(arroz['porcao'], '100g')
+        self.assertEqual(arroz['market_price'], 7.0)
+        self.assertEqual(arroz['market_portion'], '1 kg')
+        self.assertAlmostEqual(arroz['preco'], 0.70)
+        self.assertEqual(arroz['min_portions_daily'], 2.0)
+
+        frango = tabela.record('Frango grelhado')
+        self.assertEqual(frango['calorias'], 159.0)
+        self.assertEqual(frango['categoria'], 'Proteínas')
+        self.assertAlmostEqual(frango['preco'], 1.50)
+
+    def test_food_without_price_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, 'sem preço: Frango grelhado'):
+            self._load(('taco.csv', TACO), ('fornecedor.csv', "nome;preco_mercado;porcao_mercado\n"
+                                                              "Arroz branco cozido;7,00;1 kg\n"))
+
+    def test_row_without_price_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, 'linha 2: 1 alimento'):
+            normalize_food_row({'nome': 'Alface', 'calorias': '11'}, 'linha 2')
+
+    def test_price_catalog_in_another_format_and_order(self):
+        catalogo = json.dumps([
+            {'nome': 'Frango grelhado', 'preço': '1,80'},
+            {'nome': 'Arroz branco cozido', 'preco_mercado': '7,00', 'porcao_mercado': '1 kg'},
+        ])
+        tabela = self._load(('taco.csv', TACO), ('precos.json', catalogo))
+
+        self.assertEqual(list(tabela.names), ['Arroz branco cozido', 'Frango grelhado'])
+        self.assertAlmostEqual(tabela.record('Arroz branco cozido')['preco'], 0.70)
+        frango = tabela.record('Frango grelhado')
+        self.assertEqual(frango['preco'], 1.80)
+        self.assertEqual(frango['proteina'], 32.0)
+        self.assertEqual(frango['categoria'], 'Proteínas')
+
+    def test_later_price_catalog_wins(self):
+        promocao = "nome;preco_mercado;porcao_mercado\nArroz branco cozido;5,00;1 kg\n"
+        tabela = self._load(('taco.csv', TACO), ('fornecedor.csv', FORNECEDOR), ('promocao.csv', promocao))
+
+        self.assertAlmostEqual(tabela.record('Arroz branco cozido')['preco'], 0.50)
+        self.assertAlmostEqual(tabela.record('Frango grelhado')['preco'], 1.50)
+
+    def test_trace_markers_in_csv(self):
+        tabela = self._load(('taco.csv', TACO), ('fornecedor.csv', FORNECEDOR))
+
+        # "Tr" não é informado: a fibra do frango fica zerada, a do arroz é mantida
+        self.assertEqual(tabela.record('Frango grelhado')['fibra'], 0.0)
+        self.assertEqual(tabela.record('Arroz branco cozido')['fibra'], 1.6)
+
+
+class ParseNumberTest(unittest.TestCase):
+
+    def test_comma_decimal(self):
+        self.assertEqual(parse_number('2,5', 'proteina', 'linha 2'), 2.5)
+        self.assertEqual(parse_number(' 28,1 ', 'carboidrato', 'linha 2'), 28.1)
+        self.assertEqual(parse_number('1.5', 'gordura', 'linha 2'), 1.5)
+        self.assertEqual(parse_number(3, 'calorias', 'linha 2'), 3.0)
+
+    def test_trace_and_missing_markers(self):
+        for marcacao in ('Tr', 'tr', 'NA', 'nd', '', ' ', '*', '-'):
+            self.assertIsNone(parse_number(marcacao, 'fibra', 'linha 2'), marcacao)
+
+    def test_invalid_number(self):
+        with self.assertRaisesRegex(ValueError, "linha 3: valor inválido para 'calorias'"):
+            parse_number('1,234.5', 'calorias', 'linha 3')
+
+    def test_markers_leave_columns_out(self):
+        food = parse_food_row({'Descrição': 'Ovo', 'Energia (kcal)': '146', 'Carboidrato (g)': 'NA',
+                               'Fibra alimentar (g)': 'Tr', 'Grupo': ''})
+        self.assertEqual(food, {'nome': 'Ovo', 'calorias': 146.0})
+
+
+class IncrementalJsonTest(unittest.TestCase):
+
+    ALIMENTOS = [
+        {'nome': 'Arroz, branco [cozido]', 'calorias': 128},
+        {'nome': 'Feijão "preto"', 'porcao': '1 concha', 'proteina': 4.5},
+        {'nome': 'Ovo', 'detalhes': {'tipos': [1, 2, {'a': ']'}]}},
+    ]
+
+    def _parse(self, texto, bloco):
+        return list(_iter_json_array(io.StringIO(texto), bloco=bloco))
+
+    def test_objects_split_across_blocks(self):
+        for texto in (json.dumps(self.ALIMENTOS), json.dumps(self.ALIMENTOS, indent=2)):
+            for bloco in (1, 2, 7, 64, 1 << 16):
+                self.assertEqual(self._parse(texto, bloco), self.ALIMENTOS, bloco)
+
+    def test_empty_list(self):
+        self.assertEqual(self._parse(' [ ] ', 1), [])
+
+    def test_invalid_documents(self):
+        for texto in ('{"nome": "Ovo"}', '[{"nome": "Ovo"}', '[{"nome": "Ovo"', '[{"nome": Ovo}]', ''):
+            with self.assertRaises(ValueError, msg=texto):
+                self._parse(texto, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
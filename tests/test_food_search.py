@@ -0,0 +1,97 @@
+"""
+Testes do índice de busca de alimentos (data.food_search)
+"""
+
+import unittest
+
+from config.constants import FOOD_SEARCH_LIMIT
+from data.food_database import normalize_food_name
+from data.food_search import FoodSearchIndex
+
+NOMES = [
+    'Feijão Preto', 'Arroz Integral', 'Pão Francês', 'Maçã', 'Leite de Coco',
+    'Frango Grelhado', 'Açaí', 'Feijoada', 'Banana Prata', 'Café com Leite',
+]
+CATEGORIAS = [
+    'Leguminosas', 'Cereais', 'Cereais', 'Frutas', 'Laticínios',
+    'Proteínas', 'Frutas', 'Leguminosas', 'Frutas', 'Bebidas',
+]
+
+
+class FoodSearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = FoodSearchIndex(NOMES, CATEGORIAS)
+
+    def _names(self, consulta, **opcoes):
+        linhas, _ = self.index.search(consulta, **opcoes)
+        return [NOMES[linha] for linha in linhas]
+
+    def test_prefix_matches_come_first(self):
+        self.assertEqual(self._names('fei'), ['Feijão Preto', 'Feijoada'])
+        self.assertEqual(self._names('leite')[:1], ['Leite de Coco'])
+
+    def test_short_queries_match_word_starts(self):
+        # Frango Grelhado vem pela categoria (Proteínas)
+        self.assertEqual(self._names('p'), ['Pão Francês', 'Feijão Preto', 'Banana Prata', 'Frango Grelhado'])
+        self.assertEqual(self._names('co'), ['Leite de Coco', 'Café com Leite'])
+
+    def test_trigram_matches_inside_words(self):
+        # Início de palavra antes de trecho no meio de uma palavra
+        self.assertEqual(self._names('rat'), ['Banana Prata'])
+        self.assertEqual(self._names('ana'), ['Banana Prata'])
+        self.assertEqual(self._names('grelh'), ['Frango Grelhado'])
+        self.assertEqual(self._names('xyz'), [])
+
+    def test_accents_and_case_are_ignored(self):
+        for consulta in ('acai', 'AÇAÍ', 'Açai'):
+            self.assertEqual(self._names(consulta), ['Açaí'])
+        self.assertEqual(self._names('frances'), ['Pão Francês'])
+        self.assertEqual(self._names('MACA'), ['Maçã'])
+
+    def test_category_matches_come_last(self):
+        self.assertEqual(self._names('frut'), ['Maçã', 'Açaí', 'Banana Prata'])
+        self.assertEqual(self._names('leite'), ['Leite de Coco', 'Café com Leite'])
+        self.assertEqual(self._names('laticinios'), ['Leite de Coco'])
+
+    def test_matches_brute_force(self):
+        for consulta in ('a', 'ei', 'ao', 'ana', 'eij', 'leite', 'cereais', 'com', 'ta'):
+            normalizada = normalize_food_name(consulta)
+            esperadas = set()
+            for linha, (nome, categoria) in enumerate(zip(NOMES, CATEGORIAS)):
+                texto = ' ' + normalize_food_name(nome)
+                trecho = ' ' + normalizada if len(normalizada) < 3 else normalizada
+                if trecho in texto or normalizada in normalize_food_name(categoria):
+                    esperadas.add(linha)
+            linhas, truncado = self.index.search(consulta)
+            self.assertEqual(len(linhas), len(set(linhas)), consulta)
+            self.assertEqual(set(linhas), esperadas, consulta)
+            self.assertFalse(truncado)
+
+    def test_empty_query_returns_everything(self):
+        self.assertEqual(self.index.search('  '), (list(range(len(NOMES))), False))
+
+
+class FoodSearchLimitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.total = FOOD_SEARCH_LIMIT * 3
+        nomes = [f'Arroz {i:04d}' for i in range(self.total)]
+        self.index = FoodSearchIndex(nomes, ['Cereais'] * self.total)
+
+    def test_default_limit(self):
+        for consulta in ('arr', 'a', 'rroz', 'cereais'):
+            linhas, truncado = self.index.search(consulta)
+            self.assertEqual(len(linhas), FOOD_SEARCH_LIMIT, consulta)
+            self.assertTrue(truncado)
+
+    def test_explicit_limit(self):
+        self.assertEqual(self.index.search('arroz 00', limit=5), ([0, 1, 2, 3, 4], True))
+        linhas, truncado = self.index.search('arroz 001', limit=10)
+        self.assertEqual(linhas, list(range(10, 20)))
+        self.assertFalse(truncado)
+        self.assertEqual(self.index.search('arroz 0012', limit=1), ([12], False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Testes do serviço HTTP (service.http_service)
+"""
+
+import asyncio
+import json
+import unittest
+
+from config.constants import SERVICE_MAX_BODY
+from data.food_database import get_food_table
+from service.http_service import DietService, HTTPError, parse_profile
+
+PERFIL = {'metac': 2000, 'metap': 60, 'metag': 70, 'orcamento': 50}
+
+
+class ContentLengthTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.service = DietService(workers=1, queue_size=1)
+        servidor = await self.service.start('127.0.0.1', 0)
+        self.porta = servidor.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        await self.service.close()
+
+    async def _request(self, content_length):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.porta)
+        writer.write(
+            f"POST /optimize HTTP/1.1\r\nHost: teste\r\nContent-Length: {content_length}\r\n\r\n".encode('latin-1')
+        )
+        await writer.drain()
+        resposta = await asyncio.wait_for(reader.read(), timeout=10)
+        writer.close()
+        cabecalho, _, corpo = resposta.partition(b'\r\n\r\n')
+        status = int(cabecalho.split(b' ', 2)[1])
+        return status, json.loads(corpo)
+
+    async def test_malformed_content_length_returns_400(self):
+        status, resposta = await self._request('abc')
+        self.assertEqual(status, 400)
+        self.assertIn('Content-Length', resposta['erro'])
+
+    async def test_negative_content_length_returns_413(self):
+        status, _ = await self._request('-5')
+        self.assertEqual(status, 413)
+
+    async def test_oversized_content_length_returns_413(self):
+        status, _ = await self._request(SERVICE_MAX_BODY + 1)
+        self.assertEqual(status, 413)
+
+
+class ParseProfileTest(unittest.TestCase):
+
+    def test_non_finite_numbers_are_rejected(self):
+        for corpo in ('{"metac": NaN, "metap": 60, "metag": 70, "orcamento": 50}',
+                      '{"metac": 2000, "metap": 60, "metag": 70, "orcamento": Infinity}'):
+            with self.assertRaises(HTTPError) as contexto:
+                parse_profile(json.loads(corpo))
+            self.assertEqual(contexto.exception.status, 400)
+
+    def test_non_finite_nutrient_limits_are_rejected(self):
+        dados = dict(PERFIL, nutrient_targets={'calorias': [None, float('inf')]})
+        with self.assertRaises(HTTPError) as contexto:
+            parse_profile(dados)
+        self.assertEqual(contexto.exception.status, 400)
+
+
+class PriceReloadTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.table = get_food_table()
+        self.precos = (self.table['preco'], self.table['market_price'], self.table['market_portion'])
+        self.service = DietService(workers=1, queue_size=1)
+        await self.service.start('127.0.0.1', 0)
+
+    async def asyncTearDown(self):
+        await self.service.close()
+        self.table.update_costs(*self.precos)
+
+    async def test_workers_follow_parent_prices(self):
+        custo = (await self.service.optimize(parse_profile(PERFIL)))['custo_total']
+        self.table.update_costs(self.table['preco'] * 2)
+        perfil = parse_profile(dict(PERFIL, orcamento=100))
+        resultado = await self.service.optimize(perfil)
+        self.assertAlmostEqual(resultado['custo_total'], 2 * custo)
+        self.assertEqual(self.service.stats['price_reloads'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+"""
+Testes do diagnóstico de inviabilidade (optimization.infeasibility)
+"""
+
+import unittest
+
+from optimization.diet_optimizer import DietOptimizer
+
+# Orçamento entre o custo ótimo contínuo (R$ 4.27) e o inteiro (R$ 4.48)
+# para metac=2000, metap=60, metag=70
+METAS = {'metac': 2000, 'metap': 60, 'metag': 70, 'orcamento': 4.40}
+
+
+class IntegerDiagnosisTest(unittest.TestCase):
+
+    def setUp(self):
+        self.optimizer = DietOptimizer()
+
+    def test_integer_infeasibility_is_diagnosed_on_the_grid(self):
+        self.assertEqual(self.optimizer.optimize_diet(**METAS)['status'], 'Optimal')
+
+        resultado = self.optimizer.optimize_diet(**METAS, portion_mode='integer')
+        self.assertEqual(resultado['status'], 'Infeasible')
+
+        diagnostico = resultado['diagnostico']
+        self.assertEqual(diagnostico['modo_porcao'], 'integer')
+        self.assertTrue(diagnostico['relaxacoes'])
+        self.assertIsNotNone(diagnostico['custo_estimado'])
+
+        relaxado = dict(METAS)
+        relaxado.update(diagnostico['metas_relaxadas'])
+        self.assertEqual(self.optimizer.optimize_diet(**relaxado, portion_mode='integer')['status'], 'Optimal')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+Testes das metas diárias (optimization.nutrition_targets) contra o cálculo original da interface
+"""
+
+import itertools
+import unittest
+
+import numpy as np
+
+from config.constants import ACTIVITY_FACTORS
+from optimization.nutrition_targets import compute_targets, compute_targets_array
+
+# Perfis com pesos e alturas fracionários, que exercitam o arredondamento
+PESOS = (45.0, 62.5, 70.0, 83.3, 120.0)
+ALTURAS = (150.0, 165.5, 180.0, 201.0)
+IDADES = (18, 35, 64, 90)
+SEXOS = ('Masculino', 'Feminino')
+
+
+def _baseline(weight, height, age, sex, activity):
+    """Cálculo de DietApp.calculate_parameters antes da extração para nutrition_targets"""
+    activity_levels = {'Sedentário': 1.2, 'Leve': 1.375, 'Moderado': 1.55, 'Ativo': 1.725, 'Muito Ativo': 1.9}
+    factor = activity_levels[activity]
+    bmr = (10*weight + 6.25*height - 5*age + 5) if sex == 'Masculino' else (10*weight + 6.25*height - 5*age - 161)
+    tdee = bmr * factor
+    calories = round(tdee)
+    protein = round(1.6 * weight)
+    fat = round((0.25 * calories) / 9)
+    return {'metac': calories, 'metap': protein, 'metag': fat}
+
+
+class BaselineParityTest(unittest.TestCase):
+
+    def test_activity_levels_match_baseline(self):
+        self.assertEqual(list(ACTIVITY_FACTORS), ['Sedentário', 'Leve', 'Moderado', 'Ativo', 'Muito Ativo'])
+
+    def test_scalar_matches_baseline(self):
+        for sexo, atividade in itertools.product(SEXOS, ACTIVITY_FACTORS):
+            for perfil in itertools.product(PESOS, ALTURAS, IDADES):
+                with self.subTest(sexo=sexo, atividade=atividade, perfil=perfil):
+                    self.assertEqual(
+                        compute_targets(*perfil, sexo, atividade),
+                        _baseline(*perfil, sexo, atividade),
+                    )
+
+    def test_array_matches_baseline(self):
+        perfis = list(itertools.product(PESOS, ALTURAS, IDADES, SEXOS, ACTIVITY_FACTORS))
+        metas = compute_targets_array(*(list(coluna) for coluna in zip(*perfis)))
+
+        self.assertTrue(metas['valid'].all())
+        for meta in ('metac', 'metap', 'metag'):
+            np.testing.assert_array_equal(metas[meta], [_baseline(*perfil)[meta] for perfil in perfis])
+
+
+if __name__ == '__main__':
+    unittest.main()
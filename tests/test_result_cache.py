@@ -0,0 +1,50 @@
+"""
+Testes do cache de resultados (optimization.result_cache)
+"""
+
+import unittest
+
+from optimization.result_cache import ResultCache
+
+
+class ShallowCopyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ResultCache(maxsize=4)
+        self.chave = self.cache.make_key(1, 2000, 60, 70, 100)
+
+    def test_nested_values_are_shared(self):
+        resultado = {'status': 'Optimal', 'quantidades': {'Arroz': 1.0}, 'detalhes': {'calorias': 2000}}
+        self.cache.put(self.chave, resultado)
+
+        primeiro = self.cache.get(self.chave)
+        segundo = self.cache.get(self.chave)
+        self.assertIsNot(primeiro, segundo)
+        self.assertIs(primeiro['quantidades'], resultado['quantidades'])
+        self.assertIs(segundo['detalhes'], resultado['detalhes'])
+
+    def test_top_level_changes_do_not_reach_the_cache(self):
+        resultado = {'status': 'Optimal', 'quantidades': {'Arroz': 1.0}}
+        self.cache.put(self.chave, resultado)
+        resultado['timings'] = {'solve': 1.0}
+
+        copia = self.cache.get(self.chave)
+        self.assertNotIn('timings', copia)
+        copia['timings'] = {'solve': 2.0}
+        self.assertNotIn('timings', self.cache.get(self.chave))
+
+    def test_alternative_plans_are_copied(self):
+        planos = [{'custo_total': 1.0, 'quantidades': {'Arroz': 1.0}}, {'custo_total': 1.1, 'quantidades': {}}]
+        self.cache.put(self.chave, {'planos': planos, 'esgotado': False})
+
+        pool = self.cache.get(self.chave)
+        pool['planos'][0]['custo_relativo'] = 2.0
+        pool['planos'].pop()
+        guardado = self.cache.get(self.chave)
+        self.assertEqual(len(guardado['planos']), 2)
+        self.assertNotIn('custo_relativo', guardado['planos'][0])
+        self.assertIs(guardado['planos'][0]['quantidades'], planos[0]['quantidades'])
+
+
+if __name__ == '__main__':
+    unittest.main()
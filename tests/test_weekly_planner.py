@@ -0,0 +1,66 @@
+"""
+Testes do planejamento semanal (optimization.weekly_planner) com a configuração padrão
+"""
+
+import unittest
+
+from config.constants import PORTION_LIMITS, WEEKLY_PLAN
+from optimization.diet_optimizer import DietOptimizer
+from optimization.lp_backends import highs_available
+
+# Metas diárias viáveis com os limites de porção por categoria
+METAS = {'metac': 2000, 'metap': 60, 'metag': 200, 'orcamento': 200}
+
+
+@unittest.skipUnless(highs_available(), "requer SciPy (HiGHS)")
+class WeeklyPlanDefaultsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.optimizer = DietOptimizer(backend='highs')
+
+    def _check_weekly_rules(self, plano, minimos=None):
+        dias = plano['dias']
+        self.assertEqual(len(dias), WEEKLY_PLAN['days'])
+        por_alimento = {}
+        for dia in dias:
+            for nome, quantidade in dia['quantidades'].items():
+                por_alimento.setdefault(nome, []).append(quantidade)
+        tabela = self.optimizer.table
+        for nome, quantidades in por_alimento.items():
+            self.assertLessEqual(sum(quantidades), PORTION_LIMITS['weekly']['default_max'] + 1e-6)
+            obrigatorio = minimos is not None and minimos[tabela.index[nome]] > 0
+            if tabela.record(nome)['categoria'] in WEEKLY_PLAN['variety_categories'] and not obrigatorio:
+                self.assertLessEqual(sum(q > 0.01 for q in quantidades), WEEKLY_PLAN['max_days_per_food'])
+
+    def test_default_config_with_portion_limits_is_feasible(self):
+        plano = self.optimizer.optimize_week(**METAS, use_portion_limits=True)
+
+        self.assertEqual(plano['status'], 'Optimal')
+        self.assertNotIn('conflitos', plano)
+        self.assertTrue(all(dia['status'] == 'Optimal' for dia in plano['dias']))
+        minimos = self.optimizer.table['min_portions_daily']
+        for dia in plano['dias']:
+            for nome, quantidade in dia['quantidades'].items():
+                self.assertGreaterEqual(quantidade, minimos[self.optimizer.table.index[nome]] - 1e-6)
+        self._check_weekly_rules(plano, minimos)
+
+    def test_default_config_without_portion_limits(self):
+        plano = self.optimizer.optimize_week(**METAS)
+
+        self.assertEqual(plano['status'], 'Optimal')
+        self._check_weekly_rules(plano)
+
+    def test_daily_minimums_above_weekly_cap_are_reported(self):
+        nome = next(
+            nome for nome, categoria in zip(self.optimizer.table.names, self.optimizer.table['categoria'])
+            if categoria == 'Proteínas'
+        )
+        plano = self.optimizer.optimize_week(**METAS, use_portion_limits=True, weekly_caps={nome: 3})
+
+        self.assertEqual(plano['status'], 'Infeasible')
+        self.assertEqual(plano['conflitos'], [nome])
+        self.assertEqual([dia['status'] for dia in plano['dias']].count('Optimal'), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()